@@ -1,7 +1,8 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import inspect, text
 from sqlalchemy.exc import IntegrityError
 from werkzeug.security import generate_password_hash, check_password_hash
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 import jwt
 from functools import wraps
 from datetime import datetime, timedelta
@@ -9,11 +10,17 @@ from flask_cors import CORS
 from dotenv import load_dotenv
 import os
 import logging
+import queue
+import threading
 from langchain_openai import AzureChatOpenAI
-from langchain.memory import ConversationBufferWindowMemory
 from langchain.prompts import ChatPromptTemplate
 from langchain.agents import create_tool_calling_agent, AgentExecutor
-from ireno_tools import create_ireno_tools
+from ireno_tools import IrenoAPITools, create_ireno_tools, extract_query_entities
+from ireno_resilience import turn_budget
+from ireno_cache import turn_memo
+from ireno_logging import configure_logging
+from conversation_memory import ConversationSessionStore
+from chat_streaming import SSECallbackHandler, close_stream, iter_sse, publish
 
 # Load environment variables
 load_dotenv()
@@ -88,6 +95,9 @@ class User(db.Model):
     def to_dict(self):
         return {'id': self.id, 'username': self.username, 'email': self.email, 'role': self.role}
 
+# Longest conversation_id a chat request may send
+CONVERSATION_ID_MAX_LENGTH = 100
+
 # Chat message model
 class ChatMessage(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -95,6 +105,15 @@ class ChatMessage(db.Model):
     message = db.Column(db.Text, nullable=False)
     sender = db.Column(db.String(20), nullable=False)  # 'user' or 'assistant'
     timestamp = db.Column(db.DateTime, server_default=db.func.now())
+    # Conversation the message belongs to; '' is the user's default conversation
+    conversation_id = db.Column(db.String(CONVERSATION_ID_MAX_LENGTH), nullable=False, default='', server_default='')
+
+# Memory reset model: one row per admin reset. Chat messages at or below the latest
+# history_floor_id are kept but no longer rehydrated into conversation memory.
+class MemoryReset(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    history_floor_id = db.Column(db.Integer, nullable=False)
+    timestamp = db.Column(db.DateTime, server_default=db.func.now())
 
 # Log entry model
 class LogEntry(db.Model):
@@ -106,6 +125,12 @@ class LogEntry(db.Model):
 # Create tables if not exist (run once at startup)
 with app.app_context():
     db.create_all()
+    # create_all() does not alter existing tables: add the conversation column to older databases
+    if 'conversation_id' not in {column['name'] for column in inspect(db.engine).get_columns('chat_message')}:
+        with db.engine.begin() as connection:
+            connection.execute(text(
+                f"ALTER TABLE chat_message ADD COLUMN conversation_id "
+                f"VARCHAR({CONVERSATION_ID_MAX_LENGTH}) NOT NULL DEFAULT ''"))
 
 # User registration endpoint
 
@@ -155,15 +180,10 @@ def login():
     else:
         return jsonify({'message': 'Invalid username or password.'}), 401
 
-# Enhanced logging configuration
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),  # Console output
-        logging.FileHandler('ireno_assistant.log', mode='a', encoding='utf-8')  # File output
-    ]
-)
+# Enhanced logging configuration: console and file output are written by a background
+# listener thread, so request threads never block on log I/O. IRENO_LOG_LEVEL=DEBUG
+# enables the detailed IRENO tool logs (sampled payloads, per-zone values).
+configure_logging(level=os.getenv('IRENO_LOG_LEVEL', 'INFO'), log_file='ireno_assistant.log')
 
 # Set specific log levels for different components
 logging.getLogger('werkzeug').setLevel(logging.INFO)  # Flask server logs
@@ -180,7 +200,40 @@ logger.info("=" * 80)
 
 # Global variables for agent components
 agent_executor = None
-memory = None
+conversation_sessions = None
+ireno_api = None
+
+# Maximum total time IRENO API calls may take within one chat turn (seconds)
+IRENO_TURN_BUDGET = float(os.getenv('IRENO_TURN_BUDGET', '30'))
+
+# Per-user conversation memory: exchanges kept per conversation, conversations held in
+# memory at once (least recently used dropped first) and idle seconds before one is dropped
+MEMORY_WINDOW = int(os.getenv('IRENO_MEMORY_WINDOW', '10'))
+MEMORY_MAX_SESSIONS = int(os.getenv('IRENO_MEMORY_MAX_SESSIONS', '500'))
+MEMORY_IDLE_TTL = float(os.getenv('IRENO_MEMORY_IDLE_TTL', '1800'))
+# Latest MemoryReset this worker's conversation memories reflect
+applied_memory_reset_id = 0
+
+def load_chat_history(session_key):
+    """Persisted (sender, message) pairs of a conversation, oldest first, for rehydrating its memory"""
+    user_id, conversation_id = session_key
+    history_floor_id = db.session.query(db.func.max(MemoryReset.history_floor_id)).scalar_subquery()
+    rows = (ChatMessage.query
+            .filter(ChatMessage.user_id == user_id, ChatMessage.conversation_id == conversation_id,
+                    ChatMessage.id > db.func.coalesce(history_floor_id, 0))
+            .order_by(ChatMessage.id.desc())
+            .limit(2 * MEMORY_WINDOW)
+            .all())
+    return [(row.sender, row.message) for row in reversed(rows)]
+
+def apply_memory_reset():
+    """Drop this worker's conversation memories if an admin reset memory (in any worker) since they were loaded"""
+    global applied_memory_reset_id
+    latest_reset_id = db.session.query(db.func.max(MemoryReset.id)).scalar() or 0
+    if latest_reset_id > applied_memory_reset_id:
+        dropped = conversation_sessions.clear()
+        applied_memory_reset_id = latest_reset_id
+        logger.info(f"Conversation memory reset applied: {dropped} sessions dropped")
 
 def initialize_azure_openai():
     """Initialize Azure OpenAI with the exact configuration from the demo notebook"""
@@ -215,20 +268,24 @@ def create_chat_prompt():
 
 MISSION: Provide real-time insights, performance analytics, and operational support for electric utility systems.
 
-**🔧 AVAILABLE WORKING TOOLS (9 TOTAL):**
+**🔧 AVAILABLE WORKING TOOLS (15 TOTAL):**
 
-**COLLECTOR MANAGEMENT (3 tools):**
+**COLLECTOR MANAGEMENT (5 tools):**
 - get_offline_collectors: Monitor offline/disconnected devices (supports zone filtering: "Brooklyn", "Queens", etc.)
 - get_online_collectors: Track active/operational devices  
 - get_collectors_count: Get comprehensive statistics with ACCURATE zone breakdown and offline percentages
+- get_collector_status_changes: Collectors that went offline or came back online recently ("since this morning", "last 2 hours", "today")
+- get_collector_downtime: How long a collector has been offline, longest outages, most flapping collectors and uptime % by zone
 
 **� HISTORICAL KPI DATA (2 tools) - Aug 4-11, 2025 ONLY:**
 - get_last_7_days_interval_read_success: Daily interval read data (Aug 4-11, 2025)
   • Supports specific date queries: "August 10th, 2025" → returns exact percentage for that date
+  • Supports ranges and comparisons in ONE call: "Aug 5 to Aug 9", "Aug 9 vs Aug 10", "last 3 days"
   • Example data: 2025-08-10 = 94.77%, 2025-08-09 = 94.89%
   
 - get_last_7_days_register_read_success: Daily register read data (Aug 4-11, 2025)  
   • Supports specific date queries: "August 5th, 2025" → returns exact percentage for that date
+  • Supports ranges and comparisons in ONE call: "Aug 5 to Aug 9", "Aug 9 vs Aug 10", "last 3 days"
   • Example data: All dates show 100% performance
 
 **🌍 ZONE-BASED PERFORMANCE (4 tools):**
@@ -237,6 +294,13 @@ MISSION: Provide real-time insights, performance analytics, and operational supp
 - get_register_read_success_by_zone_weekly: Weekly register performance by zone  
 - get_register_read_success_by_zone_monthly: Monthly register performance by zone (supports zone ID queries)
 
+**🏆 ZONE COMPARISON AND ANOMALIES (2 tools):**
+- compare_zones: All zones ranked across interval/register, weekly/monthly in ONE table - use for "rank/compare zones" across several metrics
+- detect_kpi_anomalies: Only the zones whose latest KPI values are statistically abnormal (z-score, IQR, level shift) - use for "which zone is abnormal", anomalies, unusual drops
+
+**📊 DASHBOARD (1 tool):**
+- get_comprehensive_kpi_summary: Daily trends plus weekly zone performance in ONE call - use for dashboard/overview/summary requests
+
 **REAL ZONE MAPPING (NO HALLUCINATION):**
 - 11852150-1fe1-4d7a-ba57-84a31af92b55 = Westchester
 - 1091d1bd-b146-461c-bd33-eb25a5d95787 = Manhattan
@@ -250,6 +314,8 @@ MISSION: Provide real-time insights, performance analytics, and operational supp
 ✅ "Which zone has highest offline" → get_collectors_count  
 ✅ "Brooklyn offline collectors" → get_offline_collectors
 ✅ "Zone ID 3668467f..." → get_interval_read_success_by_zone_monthly
+✅ "Rank zones by interval and register success" → compare_zones
+✅ "Which zone is abnormal this week" → detect_kpi_anomalies
 ✅ "Compare August 9th vs 10th" → get_last_7_days_interval_read_success (will show both dates)
 
 **RESPONSE RULES:**
@@ -282,20 +348,21 @@ MISSION: Provide real-time insights, performance analytics, and operational supp
 
 def initialize_agent():
     """Initialize the RAG and Tool Calling agent"""
-    global agent_executor, memory
+    global agent_executor, conversation_sessions, ireno_api
     
     try:
         # Initialize Azure OpenAI
         azure_llm = initialize_azure_openai()
         # Get live tools from ireno_tools.py
-        tools = create_ireno_tools()
+        ireno_api = IrenoAPITools()
+        tools = create_ireno_tools(ireno_api)
         logger.info(f"Created {len(tools)} live API tools")
-        # Create conversation memory with k=10 as specified
-        global memory, agent_executor
-        memory = ConversationBufferWindowMemory(
-            k=10,
-            memory_key="chat_history",
-            return_messages=True
+        # Conversation memory per user (k=10 window each), rehydrated from ChatMessage on a miss
+        conversation_sessions = ConversationSessionStore(
+            load_history=load_chat_history,
+            window=MEMORY_WINDOW,
+            max_sessions=MEMORY_MAX_SESSIONS,
+            idle_ttl=MEMORY_IDLE_TTL
         )
         # Create chat prompt template
         prompt = create_chat_prompt()
@@ -305,11 +372,10 @@ def initialize_agent():
             tools=tools,
             prompt=prompt
         )
-        # Create agent executor with memory and verbose logging
+        # Create agent executor with verbose logging; each request passes its own conversation history
         agent_executor = AgentExecutor(
             agent=agent,
             tools=tools,
-            memory=memory,
             verbose=True,
             handle_parsing_errors=True,
             max_iterations=5,
@@ -321,6 +387,15 @@ def initialize_agent():
         logger.error(f"Failed to initialize agent: {str(e)}")
         return False
 
+@app.before_request
+def start_background_polling():
+    """
+    Start the collector status poller in the process that serves requests. Starting it at
+    initialization would also run it in the debug reloader's parent process, which never serves.
+    """
+    if ireno_api is not None and not ireno_api.status_poller.running:
+        ireno_api.start_status_poller()
+
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
@@ -336,7 +411,7 @@ def health():
             "agent": agent_status,
             "azure_openai_key": azure_key_status,
             "tools": "live API integration",
-            "memory": "conversation buffer (k=10)",
+            "memory": f"per-user conversation window (k={MEMORY_WINDOW})",
             "model": "gpt-4o via Azure OpenAI"
         }), 200
         
@@ -344,55 +419,19 @@ def health():
         logger.error(f"Health check failed: {str(e)}")
         return jsonify({"status": "unhealthy", "error": str(e)}), 500
 
-@app.route('/api/chat', methods=['POST'])
-@jwt_required
-def chat():
-    """Main chat endpoint that processes user messages through the RAG agent"""
-    try:
-        # Check if agent is initialized
-        if agent_executor is None:
-            return jsonify({
-                "error": "Agent not initialized. Please check server logs."
-            }), 500
-
-        # Get user message and username from request
-        data = request.get_json()
-        if not data or 'message' not in data or 'username' not in data:
-            return jsonify({
-                "error": "Missing 'message' or 'username' field in request body"
-            }), 400
-
-        user_message = data['message'].strip()
-        username = data['username'].strip()
-        if not user_message or not username:
-            return jsonify({
-                "error": "Message and username cannot be empty"
-            }), 400
-
-        logger.info(f"Processing user message: {user_message}")
-
-        # Check if query requires real data and enhance the prompt with specific tool guidance
-        data_keywords = [
-            'august', 'aug', '2025', 'date', 'daily', 'day',  # Date-specific
-            'last 7 days', 'last seven days', 'weekly', 'recent', 'past week',
-            'zone performance', 'zone', 'area', 'highest zone', 'lowest zone', 'best zone', 'worst zone',
-            'interval read', 'register read', 'success rate', 'percentage', 'performance',
-            'monthly', 'weekly trends', 'zone comparison', 'which zone', 'brooklyn', 'queens', 'bronx', 
-            'manhattan', 'westchester', 'staten island', 'offline collectors in',
-            'kpi', 'metrics', 'statistics', 'data', 'count', 'how many', 'total collectors',
-            '3668467f', '427917a2', '11852150', '1091d1bd', 'efba1047', '6f5a70ef'  # Zone IDs
-        ]
-        
-        needs_real_data = any(keyword in user_message.lower() for keyword in data_keywords)
-        
-        if needs_real_data:
-            enhanced_message = f"""🚨 DATA QUERY DETECTED - MANDATORY TOOL USAGE - NO HALLUCINATION 🚨
+def build_agent_message(user_message):
+    """Agent input for a user message: data queries get mandatory tool-usage guidance. Returns (message, needs_real_data)"""
+    # Check if query requires real data (zones, zone IDs, dates, metrics) and enhance the prompt with specific tool guidance
+    needs_real_data = extract_query_entities(user_message).needs_data
+    
+    if needs_real_data:
+        enhanced_message = f"""🚨 DATA QUERY DETECTED - MANDATORY TOOL USAGE - NO HALLUCINATION 🚨
 
 User Query: {user_message}
 
 CRITICAL INSTRUCTIONS FOR AI AGENT:
 1. This query requires REAL-TIME data from IRENO system APIs
-2. You MUST use appropriate tools from the 9 working APIs
+2. You MUST use appropriate tools from the 15 working APIs
 3. DO NOT generate, assume, or hallucinate any data values, percentages, dates, or zone names
 4. If tools fail or return no data, report the exact error - don't invent data
 5. Use exact values, dates, and zone names from tool responses
@@ -405,8 +444,11 @@ SPECIFIC TOOL SELECTION GUIDE:
 - Zone ID (UUID like 3668467f-...) → get_interval_read_success_by_zone_monthly OR get_register_read_success_by_zone_monthly
 - "weekly zone" → get_interval/register_read_success_by_zone_weekly
 - "monthly zone" → get_interval/register_read_success_by_zone_monthly  
+- "rank zones", "compare zones" across several metrics → compare_zones
+- "abnormal", "anomaly", "unusual drop" → detect_kpi_anomalies
 - "how many collectors" → get_collectors_count
 - "offline collectors" → get_offline_collectors
+- "dashboard", "overview", "summary" → get_comprehensive_kpi_summary
 
 CRITICAL ZONE MAPPING (NO HALLUCINATION):
 - 11852150-1fe1-4d7a-ba57-84a31af92b55 = Westchester
@@ -430,51 +472,121 @@ ANTI-HALLUCINATION CHECKLIST:
 ✅ If zone filtering fails, show what data is actually available
 
 PROCESS: Tool Call → Extract Real Data → Format Response (NO INVENTION)"""
-            logger.info(f"Enhanced message for data query: {enhanced_message[:100]}...")
-        else:
-            enhanced_message = user_message
+        logger.info(f"Enhanced message for data query: {enhanced_message[:100]}...")
+    else:
+        enhanced_message = user_message
+    return enhanced_message, needs_real_data
+
+def run_agent_turn(enhanced_message, memory, needs_real_data, callbacks=None):
+    """Run one agent turn with the conversation's history; callbacks receive tool and token events"""
+    logger.info("Invoking agent executor...")
+    # Cap the time all IRENO API calls in this turn may take together; repeated
+    # tool calls with the same input reuse the turn's first result
+    with turn_budget(IRENO_TURN_BUDGET), turn_memo() as memo:
+        response = agent_executor.invoke({
+            "input": enhanced_message,  # Use enhanced message instead of original
+            "chat_history": memory.load_memory_variables({})["chat_history"]
+        }, config={"callbacks": callbacks} if callbacks else None)
+    logger.info(f"Agent executor completed successfully")
+    if memo.hits:
+        logger.info(f"♻️ {memo.hits} repeated tool call(s) served from this turn's memo")
+    
+    # Log tool usage for debugging
+    if 'intermediate_steps' in response:
+        tools_used = [step[0].tool for step in response['intermediate_steps']]
+        logger.info(f"🔧 TOOLS USED: {tools_used}")
+        if not tools_used and needs_real_data:
+            logger.warning("🚨 WARNING: Data query detected but NO TOOLS were used!")
+    else:
+        logger.info("ℹ️ No intermediate steps found in response")
+    return response
+
+def record_agent_error(agent_error, user_message):
+    """Log an agent execution error and save it to the LogEntry table"""
+    logger.error("=" * 80)
+    logger.error("AGENT EXECUTION ERROR DETAILS:")
+    logger.error("=" * 80)
+    logger.error(f"Error message: {str(agent_error)}")
+    logger.error(f"Error type: {type(agent_error).__name__}")
+    logger.error(f"User message that caused error: {user_message}")
+    logger.error("Full stack trace:")
+    logger.error("", exc_info=agent_error)
+    logger.error("=" * 80)
+    # Save error log to LogEntry table
+    log_entry = LogEntry(level="ERROR", message=f"Agent error: {str(agent_error)}")
+    db.session.add(log_entry)
+    db.session.commit()
+
+def save_agent_response(user, conversation_id, user_message, agent_response, memory):
+    """Remember and persist a completed exchange"""
+    # Remember the exchange as the user wrote it (as persisted), not the enhanced prompt
+    memory.save_context({"input": user_message}, {"output": agent_response})
+
+    # Save assistant response to ChatMessage table
+    assistant_msg = ChatMessage(user_id=user.id, conversation_id=conversation_id, message=agent_response,
+                                sender='assistant')
+    db.session.add(assistant_msg)
+    db.session.commit()
+
+    # Save info log to LogEntry table
+    log_entry = LogEntry(level="INFO", message=f"User: {user.username}, Message: {user_message}, Response: {agent_response}")
+    db.session.add(log_entry)
+    db.session.commit()
+
+@app.route('/api/chat', methods=['POST'])
+@jwt_required
+def chat():
+    """Main chat endpoint that processes user messages through the RAG agent"""
+    try:
+        # Check if agent is initialized
+        if agent_executor is None:
+            return jsonify({
+                "error": "Agent not initialized. Please check server logs."
+            }), 500
+
+        # Get user message and username from request
+        data = request.get_json()
+        if not data or 'message' not in data or 'username' not in data:
+            return jsonify({
+                "error": "Missing 'message' or 'username' field in request body"
+            }), 400
+
+        user_message = data['message'].strip()
+        username = data['username'].strip()
+        # Optional: separate memories for several conversations of one user
+        conversation_id = str(data.get('conversation_id') or '').strip()
+        if not user_message or not username:
+            return jsonify({
+                "error": "Message and username cannot be empty"
+            }), 400
+        if len(conversation_id) > CONVERSATION_ID_MAX_LENGTH:
+            return jsonify({
+                "error": f"conversation_id cannot be longer than {CONVERSATION_ID_MAX_LENGTH} characters"
+            }), 400
+
+        logger.info(f"Processing user message: {user_message}")
+
+        enhanced_message, needs_real_data = build_agent_message(user_message)
 
         # Find user in database
         user = User.query.filter_by(username=username).first()
         if not user:
             return jsonify({"error": "User not found"}), 404
 
+        # This conversation's memory, loaded before the new message is saved so it is not in its own history
+        apply_memory_reset()
+        memory = conversation_sessions.get((user.id, conversation_id))
+
         # Save user message to ChatMessage table
-        chat_msg = ChatMessage(user_id=user.id, message=user_message, sender='user')
+        chat_msg = ChatMessage(user_id=user.id, conversation_id=conversation_id, message=user_message, sender='user')
         db.session.add(chat_msg)
         db.session.commit()
 
         # Invoke the agent executor with the user's message
         try:
-            logger.info("Invoking agent executor...")
-            response = agent_executor.invoke({
-                "input": enhanced_message  # Use enhanced message instead of original
-            })
-            logger.info(f"Agent executor completed successfully")
-            
-            # Log tool usage for debugging
-            if 'intermediate_steps' in response:
-                tools_used = [step[0].tool for step in response['intermediate_steps']]
-                logger.info(f"🔧 TOOLS USED: {tools_used}")
-                if not tools_used and needs_real_data:
-                    logger.warning("🚨 WARNING: Data query detected but NO TOOLS were used!")
-            else:
-                logger.info("ℹ️ No intermediate steps found in response")
-                
+            response = run_agent_turn(enhanced_message, memory, needs_real_data)
         except Exception as agent_error:
-            logger.error("=" * 80)
-            logger.error("AGENT EXECUTION ERROR DETAILS:")
-            logger.error("=" * 80)
-            logger.error(f"Error message: {str(agent_error)}")
-            logger.error(f"Error type: {type(agent_error).__name__}")
-            logger.error(f"User message that caused error: {user_message}")
-            logger.error("Full stack trace:")
-            logger.error("", exc_info=True)
-            logger.error("=" * 80)
-            # Save error log to LogEntry table
-            log_entry = LogEntry(level="ERROR", message=f"Agent error: {str(agent_error)}")
-            db.session.add(log_entry)
-            db.session.commit()
+            record_agent_error(agent_error, user_message)
             # Return a user-friendly error response
             return jsonify({
                 "error": "I encountered an issue processing your request. Please try again or rephrase your question.",
@@ -484,16 +596,7 @@ PROCESS: Tool Call → Extract Real Data → Format Response (NO INVENTION)"""
 
         # Extract the agent's response
         agent_response = response.get('output', 'Sorry, I could not generate a response.')
-
-        # Save assistant response to ChatMessage table
-        assistant_msg = ChatMessage(user_id=user.id, message=agent_response, sender='assistant')
-        db.session.add(assistant_msg)
-        db.session.commit()
-
-        # Save info log to LogEntry table
-        log_entry = LogEntry(level="INFO", message=f"User: {username}, Message: {user_message}, Response: {agent_response}")
-        db.session.add(log_entry)
-        db.session.commit()
+        save_agent_response(user, conversation_id, user_message, agent_response, memory)
 
         logger.info(f"Agent response generated successfully")
         return jsonify({
@@ -540,17 +643,88 @@ PROCESS: Tool Call → Extract Real Data → Format Response (NO INVENTION)"""
         }), 500
 
 
+@app.route('/api/chat/stream', methods=['POST'])
+@jwt_required
+def chat_stream():
+    """
+    Streaming variant of /api/chat: tool progress and answer tokens are sent as Server-Sent
+    Events while the agent runs, followed by a "done" event with the full response.
+    The exchange is saved once complete, even if the client disconnects early.
+    """
+    if agent_executor is None:
+        return jsonify({"error": "Agent not initialized. Please check server logs."}), 500
+
+    data = request.get_json(silent=True)
+    if not data or 'message' not in data or 'username' not in data:
+        return jsonify({"error": "Missing 'message' or 'username' field in request body"}), 400
+    user_message = data['message'].strip()
+    username = data['username'].strip()
+    conversation_id = str(data.get('conversation_id') or '').strip()
+    if not user_message or not username:
+        return jsonify({"error": "Message and username cannot be empty"}), 400
+    if len(conversation_id) > CONVERSATION_ID_MAX_LENGTH:
+        return jsonify({"error": f"conversation_id cannot be longer than {CONVERSATION_ID_MAX_LENGTH} characters"}), 400
+
+    user = User.query.filter_by(username=username).first()
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+
+    logger.info(f"Processing streamed user message: {user_message}")
+    enhanced_message, needs_real_data = build_agent_message(user_message)
+    apply_memory_reset()
+    memory = conversation_sessions.get((user.id, conversation_id))
+    db.session.add(ChatMessage(user_id=user.id, conversation_id=conversation_id, message=user_message, sender='user'))
+    db.session.commit()
+    user_id = user.id
+
+    events = queue.SimpleQueue()
+
+    def run_turn():
+        # The agent and the database writes run here, off the response generator
+        with app.app_context():
+            try:
+                response = run_agent_turn(enhanced_message, memory, needs_real_data,
+                                          callbacks=[SSECallbackHandler(events)])
+                agent_response = response.get('output', 'Sorry, I could not generate a response.')
+                save_agent_response(db.session.get(User, user_id), conversation_id, user_message,
+                                    agent_response, memory)
+                publish(events, 'done', {
+                    "response": agent_response,
+                    "status": "success",
+                    "tools_used": [step[0].tool for step in response.get('intermediate_steps', [])]
+                })
+            except Exception as agent_error:
+                record_agent_error(agent_error, user_message)
+                publish(events, 'error', {
+                    "error": "I encountered an issue processing your request. Please try again or rephrase your question.",
+                    "details": f"Error type: {type(agent_error).__name__}",
+                    "status": "error"
+                })
+            finally:
+                close_stream(events)
+
+    threading.Thread(target=run_turn, name='ireno-chat-stream', daemon=True).start()
+    return Response(stream_with_context(iter_sse(events)), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 # Admin-only: Reset conversation memory
 @app.route('/api/reset-memory', methods=['POST'])
 @jwt_required
 @role_required('admin')
 def reset_memory():
-    """Reset the conversation memory (admin only)"""
+    """Reset the conversation memory of all users (admin only)"""
     try:
-        global memory
-        if memory:
-            memory.clear()
-            logger.info("Conversation memory reset (admin)")
+        global applied_memory_reset_id
+        if conversation_sessions:
+            # Earlier messages stay in the database but are no longer rehydrated into memory;
+            # other workers drop their memories on their next chat request
+            history_floor_id = db.session.query(db.func.max(ChatMessage.id)).scalar() or 0
+            reset = MemoryReset(history_floor_id=history_floor_id)
+            db.session.add(reset)
+            db.session.commit()
+            dropped = conversation_sessions.clear()
+            applied_memory_reset_id = reset.id
+            logger.info(f"Conversation memory reset (admin): {dropped} sessions dropped")
             return jsonify({"status": "success", "message": "Memory reset successfully"}), 200
         else:
             return jsonify({"status": "error", "message": "Memory not initialized"}), 500
@@ -558,6 +732,22 @@ def reset_memory():
         logger.error(f"Memory reset error: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+# Admin-only: IRENO API cache, coalescing, circuit breaker, poller and tool output stats
+@app.route('/api/admin/ireno-stats', methods=['GET'])
+@jwt_required
+@role_required('admin')
+def ireno_stats():
+    """Return IRENO API client stats (admin only)"""
+    if ireno_api is None:
+        return jsonify({"status": "error", "message": "IRENO tools not initialized"}), 500
+    return jsonify({
+        "status": "success",
+        "cache": ireno_api.get_cache_stats(),
+        "resilience": ireno_api.get_breaker_stats(),
+        "poller": ireno_api.get_poller_stats(),
+        "tool_output": ireno_api.get_output_stats()
+    }), 200
+
 # Admin-only: Delete a user
 @app.route('/api/admin/delete-user', methods=['POST'])
 @jwt_required
@@ -587,6 +777,7 @@ def admin_dashboard():
         'user_count': user_count,
         'chat_count': chat_count,
         'log_count': log_count,
+        'conversation_sessions': conversation_sessions.stats() if conversation_sessions else None,
         'message': 'Admin dashboard data.'
     }), 200
 
@@ -598,8 +789,8 @@ if __name__ == '__main__':
         print("Agent initialization successful!")
         print(f"Tools: Live API integration via ireno_tools.py")
         print(f"Model: GPT-4o via Azure OpenAI")
-        print(f"Memory: Conversation Buffer (k=10)")
-        print(f"Endpoint: POST /api/chat")
+        print(f"Memory: Per-user conversation window (k={MEMORY_WINDOW})")
+        print(f"Endpoint: POST /api/chat (streaming: POST /api/chat/stream)")
         print("=" * 60)
         # Start Flask development server
         app.run(debug=True, host='0.0.0.0', port=5000)
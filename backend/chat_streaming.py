@@ -0,0 +1,106 @@
+"""
+Server-Sent Events for Streaming Chat Responses
+
+The agent runs on a worker thread with an SSECallbackHandler attached. The handler turns
+LangChain callbacks - tool start/end/error and LLM tokens - into events on a queue, and
+iter_sse() writes them to the HTTP response as they arrive, so the client sees progress
+within milliseconds instead of waiting for the whole turn:
+
+    event: start       {"status": "processing"}
+    event: tool_start  {"tool": "get_collectors_count", "input": "..."}
+    event: tool_end    {"tool": "get_collectors_count", "seconds": 0.42}
+    event: token       {"text": "Based"}
+    event: done        {"response": "...", "status": "success", "tools_used": [...]}
+    event: error       {"error": "...", "status": "error"}
+
+Lines starting with ":" are keep-alive comments sent while nothing else happens.
+
+Usage:
+    from chat_streaming import SSECallbackHandler, close_stream, iter_sse, publish
+
+    events = queue.SimpleQueue()
+    # Worker thread:
+    agent_executor.invoke(inputs, config={"callbacks": [SSECallbackHandler(events)]})
+    publish(events, 'done', {"response": answer})
+    close_stream(events)
+    # Request thread:
+    return Response(iter_sse(events), mimetype='text/event-stream')
+"""
+
+import json
+import queue
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+
+# Seconds between keep-alive comments while the agent is busy (e.g. a slow tool call)
+KEEPALIVE_INTERVAL = 10.0
+# Characters of a tool input included in its tool_start event
+TOOL_INPUT_PREVIEW = 200
+
+_END = object()
+
+
+def format_sse(event: str, data: Any) -> str:
+    """One Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def publish(events: "queue.SimpleQueue", event: str, data: Any) -> None:
+    events.put((event, data))
+
+
+def close_stream(events: "queue.SimpleQueue") -> None:
+    """Mark the end of the stream; iter_sse() returns after the events before it."""
+    events.put(_END)
+
+
+def iter_sse(events: "queue.SimpleQueue", keepalive: float = KEEPALIVE_INTERVAL) -> Iterator[str]:
+    """
+    Yield queued events as SSE text until close_stream(), with keep-alive comments in between.
+    A "start" event is sent first so the response starts immediately.
+    """
+    yield format_sse('start', {'status': 'processing'})
+    while True:
+        try:
+            item = events.get(timeout=keepalive)
+        except queue.Empty:
+            yield ": keep-alive\n\n"
+            continue
+        if item is _END:
+            return
+        yield format_sse(*item)
+
+
+class SSECallbackHandler(BaseCallbackHandler):
+    """
+    Publishes tool progress and LLM tokens of an agent run to an event queue.
+    """
+
+    def __init__(self, events: "queue.SimpleQueue"):
+        self.events = events
+        # Tool run_id -> (tool name, time.monotonic() at start)
+        self._tools: Dict[UUID, Tuple[str, float]] = {}
+
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, *, run_id: UUID, **kwargs: Any) -> None:
+        name = (serialized or {}).get('name') or kwargs.get('name') or 'tool'
+        self._tools[run_id] = (name, time.monotonic())
+        publish(self.events, 'tool_start', {'tool': name, 'input': str(input_str)[:TOOL_INPUT_PREVIEW]})
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        name, started = self._tools.pop(run_id, (kwargs.get('name', 'tool'), time.monotonic()))
+        publish(self.events, 'tool_end', {'tool': name, 'seconds': round(time.monotonic() - started, 2)})
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        name, started = self._tools.pop(run_id, (kwargs.get('name', 'tool'), time.monotonic()))
+        publish(self.events, 'tool_end', {'tool': name, 'seconds': round(time.monotonic() - started, 2),
+                                          'error': f"{type(error).__name__}: {error}"})
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, parent_run_id: Optional[UUID] = None,
+                         **kwargs: Any) -> None:
+        # Tool-calling turns stream empty content; only answer text is forwarded
+        if token:
+            publish(self.events, 'token', {'text': token})
@@ -0,0 +1,406 @@
+"""
+Compact Collector Status History for IRENO Smart Assistant
+
+This module keeps an append-only history of collector status transitions for downtime
+questions ("how long has collector X been offline", "which collectors flap most",
+"uptime by zone"). Each transition is one 9-byte record - time as an int32 offset
+from the history's base time, the collector ID interned to an int32, and a status
+bit - in a NumPy array that is memory-mapped to a file when a path is given. Only
+changes are stored, so thousands of collectors polled every minute stay small.
+
+Collector IDs, names and zones live in a small JSON sidecar next to the data file
+(`<path>.ids.json`), rewritten only when a new collector or zone appears.
+
+One process owns the file at a time: it holds an exclusive flock on the data file, and
+any other process (a second worker, the debug reloader's parent) keeps its history in
+memory instead. File locking needs fcntl, so on other platforms the file is not locked.
+
+Usage:
+    from collector_history import CollectorHistory
+
+    history = CollectorHistory("./data/collector_history.bin")
+    poller.listeners.append(history.record_poll)
+    print(history.zone_uptime(), history.longest_outages(limit=5))
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory file locks
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+# One status transition: seconds since base time, interned collector, 1 = went offline / 0 = came online
+RECORD_DTYPE = np.dtype([('t', '<i4'), ('collector', '<i4'), ('offline', 'u1')])
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('base', '<i8'),        # Epoch seconds that record times are offsets from
+    ('count', '<i8'),       # Records written
+    ('first_poll', '<i4'),  # Offset of the first poll (start of the observed period)
+    ('last_poll', '<i4'),   # Offset of the latest poll (end of the observed period)
+    ('polls', '<i8')
+])
+HEADER_SIZE = 64
+MAGIC = b'IRNHIST1'
+
+
+@dataclass(frozen=True)
+class Outage:
+    """One offline period of a collector. end is the latest poll for ongoing outages."""
+    collector_id: str
+    name: str
+    zone: str
+    start: float
+    end: float
+    ongoing: bool
+
+    @property
+    def seconds(self) -> float:
+        return self.end - self.start
+
+
+@dataclass(frozen=True)
+class ZoneUptime:
+    """Uptime of one zone over a window. flaps counts offline periods that ended (came back online)."""
+    zone: str
+    collectors: int
+    offline_seconds: float
+    uptime_percent: float
+    flaps: int
+
+
+class CollectorHistory:
+    """
+    Append-only collector status transition log, in memory or memory-mapped to a file.
+    """
+
+    def __init__(self, path: str = "", initial_capacity: int = 4096):
+        """
+        Open or create a history.
+
+        Args:
+            path (str): Data file to memory-map; empty keeps the history in memory only
+            initial_capacity (int): Records allocated up front (the file grows by doubling)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.zones: List[str] = []
+        self._collector_index: Dict[str, int] = {}
+        self._zone_index: Dict[str, int] = {}
+        self._collector_zone = np.zeros(0, dtype=np.int32)
+        self._state = np.zeros(0, dtype=bool)  # Current status per collector (True = offline)
+
+        self._lock_file = None
+
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._lock_file = open(path, 'ab')
+            if not self._acquire_file_lock():
+                logger.warning("⚠️ Collector history %s is in use by another process, keeping history in memory", path)
+                self._lock_file.close()
+                self._lock_file = None
+                self.path = path = ""
+
+        if path and os.path.getsize(path) >= HEADER_SIZE:
+            self._open(path)
+        elif path:
+            with open(path, 'r+b') as f:
+                f.truncate(HEADER_SIZE + initial_capacity * RECORD_DTYPE.itemsize)
+            self._map(path)
+            self._header['magic'] = MAGIC
+        else:
+            self._header = np.zeros(1, dtype=HEADER_DTYPE)[0]
+            self._records = np.zeros(initial_capacity, dtype=RECORD_DTYPE)
+
+    def _acquire_file_lock(self) -> bool:
+        """Take an exclusive, non-blocking flock on the data file. False if another process holds it."""
+        if fcntl is None:
+            return True
+        try:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+    # ---- storage ----
+
+    def _map(self, path: str) -> None:
+        capacity = (os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+        self._header = np.memmap(path, dtype=HEADER_DTYPE, mode='r+', shape=(1,))[0]
+        self._records = np.memmap(path, dtype=RECORD_DTYPE, mode='r+', offset=HEADER_SIZE, shape=(capacity,))
+
+    def _open(self, path: str) -> None:
+        self._map(path)
+        if bytes(self._header['magic']) != MAGIC:
+            raise ValueError(f"{path} is not a collector history file")
+        sidecar = f"{path}.ids.json"
+        if os.path.exists(sidecar):
+            with open(sidecar, 'r', encoding='utf-8') as f:
+                directory = json.load(f)
+            self.zones = directory['zones']
+            self._zone_index = {zone: i for i, zone in enumerate(self.zones)}
+            for collector_id, name, zone in directory['collectors']:
+                self._intern(collector_id, name, self.zones[zone])
+
+        # Current status = the last transition of each collector
+        records = self._records[:int(self._header['count'])]
+        records = records[records['collector'] < len(self.ids)]
+        if len(records):
+            collectors = records['collector'][::-1]
+            _, first = np.unique(collectors, return_index=True)
+            last = len(records) - 1 - first
+            self._state[records['collector'][last]] = records['offline'][last].astype(bool)
+        logger.info("📂 Loaded collector history: %s transitions, %s collectors", len(records), len(self.ids))
+
+    def _save_directory(self) -> None:
+        if not self.path:
+            return
+        directory = {
+            'zones': self.zones,
+            'collectors': [[collector_id, name, int(zone)]
+                           for collector_id, name, zone in zip(self.ids, self.names, self._collector_zone)]
+        }
+        temporary = f"{self.path}.ids.json.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(directory, f)
+        os.replace(temporary, f"{self.path}.ids.json")
+
+    def _reserve(self, extra: int) -> None:
+        """Make room for extra records, doubling the capacity (and the file) when full."""
+        count = int(self._header['count'])
+        capacity = len(self._records)
+        if count + extra <= capacity:
+            return
+        new_capacity = max(capacity * 2, count + extra)
+        if not self.path:
+            records = np.zeros(new_capacity, dtype=RECORD_DTYPE)
+            records[:count] = self._records[:count]
+            self._records = records
+            return
+        # The mapping is shared, so the header and records are already in the file; growing it keeps them
+        self._records.flush()
+        del self._records, self._header
+        with open(self.path, 'r+b') as f:
+            f.truncate(HEADER_SIZE + new_capacity * RECORD_DTYPE.itemsize)
+        self._map(self.path)
+
+    def _intern(self, collector_id: str, name: str, zone: str) -> Tuple[int, bool]:
+        """Index of a collector, registering it (or its new name/zone) if needed. Returns (index, directory changed)."""
+        zone_index = self._zone_index.get(zone)
+        changed = False
+        if zone_index is None:
+            zone_index = self._zone_index[zone] = len(self.zones)
+            self.zones.append(zone)
+            changed = True
+        index = self._collector_index.get(collector_id)
+        if index is None:
+            index = self._collector_index[collector_id] = len(self.ids)
+            self.ids.append(collector_id)
+            self.names.append(name)
+            self._collector_zone = np.append(self._collector_zone, np.int32(zone_index))
+            self._state = np.append(self._state, False)
+            return index, True
+        if self.names[index] != name or self._collector_zone[index] != zone_index:
+            self.names[index] = name
+            self._collector_zone[index] = zone_index
+            changed = True
+        return index, changed
+
+    # ---- writes ----
+
+    def record_poll(self, now: float, offline: Dict[str, Tuple[str, str]]) -> int:
+        """
+        Record one poll of the offline collectors: every collector whose status differs
+        from its last recorded status gets a transition at this time. Signature matches
+        CollectorStatusPoller listeners.
+
+        Args:
+            now (float): time.time() of the poll
+            offline (Dict[str, Tuple[str, str]]): collectorId -> (name, zone) of offline collectors
+
+        Returns:
+            int: Number of transitions appended
+        """
+        with self._lock:
+            header = self._header
+            if header['polls'] == 0 and header['count'] == 0:
+                header['base'] = int(now)
+            offset = max(int(now) - int(header['base']), int(header['last_poll']))
+
+            directory_changed = False
+            offline_indexes = []
+            for collector_id, (name, zone) in offline.items():
+                index, changed = self._intern(collector_id, str(name), str(zone))
+                offline_indexes.append(index)
+                directory_changed |= changed
+            if directory_changed:
+                self._save_directory()  # Before the records that reference new collectors
+
+            target = np.zeros(len(self.ids), dtype=bool)
+            target[offline_indexes] = True
+            changed_collectors = np.flatnonzero(target != self._state).astype(np.int32)
+
+            count = int(header['count'])
+            self._reserve(len(changed_collectors))
+            new = self._records[count:count + len(changed_collectors)]
+            new['t'] = offset
+            new['collector'] = changed_collectors
+            new['offline'] = target[changed_collectors]
+            self._state = target
+
+            header = self._header  # Remapped if the file grew
+            header['count'] = count + len(changed_collectors)
+            if header['polls'] == 0:
+                header['first_poll'] = offset
+            header['last_poll'] = offset
+            header['polls'] += 1
+            return len(changed_collectors)
+
+    def flush(self) -> None:
+        if self.path:
+            with self._lock:
+                self._records.flush()
+
+    # ---- queries ----
+
+    def _to_offset(self, timestamp: Optional[float], default: int) -> int:
+        return default if timestamp is None else int(timestamp) - int(self._header['base'])
+
+    def _outage_arrays(self, start: Optional[float], end: Optional[float]):
+        """
+        Offline periods overlapping [start, end] as parallel arrays (collector, start, end,
+        ongoing, clipped seconds), in record offsets. Defaults to the observed period.
+        """
+        with self._lock:
+            header = self._header
+            records = np.array(self._records[:int(header['count'])])
+            last_poll = int(header['last_poll'])
+            window = (self._to_offset(start, int(header['first_poll'])), self._to_offset(end, last_poll))
+
+        # Group transitions by collector in time order; an offline record ends at the collector's next record
+        order = np.lexsort((np.arange(len(records)), records['collector']))
+        times = records['t'][order].astype(np.int64)
+        collectors = records['collector'][order]
+        offline = records['offline'][order].astype(bool)
+        has_next = np.r_[collectors[1:] == collectors[:-1], False]
+        ends = np.where(has_next, np.r_[times[1:], 0], last_poll)
+
+        starts, ends, collectors, ongoing = times[offline], ends[offline], collectors[offline], ~has_next[offline]
+        seconds = np.clip(np.minimum(ends, window[1]) - np.maximum(starts, window[0]), 0, None)
+        overlapping = (starts <= window[1]) & (ends >= window[0])
+        return collectors[overlapping], starts[overlapping], ends[overlapping], ongoing[overlapping], seconds[overlapping], window
+
+    def _describe(self, index: int) -> Tuple[str, str, str]:
+        return self.ids[index], self.names[index], self.zones[self._collector_zone[index]]
+
+    def describe(self, collector_id: str) -> Tuple[str, str]:
+        """(name, zone) of a known collector."""
+        _, name, zone = self._describe(self._collector_index[collector_id])
+        return name, zone
+
+    def find_collector(self, text: str) -> Optional[str]:
+        """collectorId of the known collector whose ID or name appears in the text (longest match wins)."""
+        lowered = (text or "").lower()
+        best, best_length = None, 0
+        for collector_id, name in zip(self.ids, self.names):
+            for candidate in (collector_id.lower(), name.lower()):
+                if len(candidate) > max(best_length, 2) and candidate in lowered and \
+                        re.search(rf"(?<![\w-]){re.escape(candidate)}(?![\w-])", lowered):
+                    best, best_length = collector_id, len(candidate)
+        return best
+
+    def current_outage(self, collector_id: str) -> Optional[Outage]:
+        """The ongoing outage of a collector, or None if it is online or unknown."""
+        index = self._collector_index.get(collector_id)
+        if index is None or not self._state[index]:
+            return None
+        collectors, starts, ends, ongoing, _, _ = self._outage_arrays(None, None)
+        mine = np.flatnonzero((collectors == index) & ongoing)
+        if not len(mine):
+            return None
+        base = int(self._header['base'])
+        return Outage(*self._describe(index), float(base + starts[mine[-1]]), float(base + ends[mine[-1]]), True)
+
+    def longest_outages(self, start: Optional[float] = None, end: Optional[float] = None, limit: int = 10) -> List[Outage]:
+        """Longest offline periods overlapping the window (default: the observed period), longest first."""
+        collectors, starts, ends, ongoing, seconds, _ = self._outage_arrays(start, end)
+        top = np.argsort(-(ends - starts), kind='stable')[:limit]
+        base = int(self._header['base'])
+        return [Outage(*self._describe(collectors[i]), float(base + starts[i]), float(base + ends[i]), bool(ongoing[i]))
+                for i in top]
+
+    def flap_counts(self, start: Optional[float] = None, end: Optional[float] = None, limit: int = 10) -> List[Tuple[str, str, str, int]]:
+        """(collectorId, name, zone, flaps) for the collectors that came back online most often in the window."""
+        collectors, _, ends, ongoing, _, window = self._outage_arrays(start, end)
+        recovered = ~ongoing & (ends >= window[0]) & (ends <= window[1])
+        flaps = np.bincount(collectors[recovered], minlength=len(self.ids))
+        top = [i for i in np.argsort(-flaps, kind='stable')[:limit] if flaps[i] > 0]
+        return [(*self._describe(i), int(flaps[i])) for i in top]
+
+    def zone_uptime(self, start: Optional[float] = None, end: Optional[float] = None,
+                    population: Optional[Dict[str, int]] = None) -> List[ZoneUptime]:
+        """
+        Uptime per zone over the window (default: the observed period), lowest first.
+
+        Args:
+            start (Optional[float]): Window start (time.time() value)
+            end (Optional[float]): Window end
+            population (Optional[Dict[str, int]]): Collectors per zone (e.g. from /collector/count);
+                defaults to the collectors this history has seen offline
+
+        Returns:
+            List[ZoneUptime]: One entry per zone with a known population
+        """
+        collectors, _, ends, ongoing, seconds, window = self._outage_arrays(start, end)
+        zones = len(self.zones)
+        zone_of = self._collector_zone[collectors]
+        offline_seconds = np.bincount(zone_of, weights=seconds, minlength=zones)
+        recovered = ~ongoing & (ends >= window[0]) & (ends <= window[1])
+        flaps = np.bincount(zone_of[recovered], minlength=zones)
+        known = np.bincount(self._collector_zone, minlength=zones)
+
+        span = max(window[1] - window[0], 0)
+        result = []
+        for i, zone in enumerate(self.zones):
+            size = population.get(zone, int(known[i])) if population else int(known[i])
+            if size <= 0:
+                continue
+            if span:
+                uptime = 100.0 * (1 - offline_seconds[i] / (size * span))
+            else:  # Single poll: share of the zone online right now
+                uptime = 100.0 * (1 - self._state[self._collector_zone == i].sum() / size)
+            result.append(ZoneUptime(zone, size, float(offline_seconds[i]), round(max(uptime, 0.0), 2), int(flaps[i])))
+        return sorted(result, key=lambda z: z.uptime_percent)
+
+    def observed_period(self) -> Optional[Tuple[float, float]]:
+        """(first poll, latest poll) as time.time() values, or None before the first poll."""
+        if self._header['polls'] == 0:
+            return None
+        base = int(self._header['base'])
+        return float(base + int(self._header['first_poll'])), float(base + int(self._header['last_poll']))
+
+    def stats(self) -> Dict[str, Any]:
+        count = int(self._header['count'])
+        return {
+            'path': self.path or None,
+            'transitions': count,
+            'collectors': len(self.ids),
+            'zones': len(self.zones),
+            'polls': int(self._header['polls']),
+            'bytes_used': HEADER_SIZE + count * RECORD_DTYPE.itemsize,
+            'bytes_allocated': HEADER_SIZE + len(self._records) * RECORD_DTYPE.itemsize
+        }
@@ -0,0 +1,231 @@
+"""
+Background Collector Status Poller for IRENO Smart Assistant
+
+This module polls the offline collector listing on a fixed interval and keeps what
+changed between polls - collectors that went offline and collectors that came back,
+keyed by collectorId - in a fixed-size ring buffer. Questions like "what went offline
+since this morning" are then answered from memory instead of repeated full fetches.
+
+Usage:
+    from collector_poller import CollectorStatusPoller, parse_since
+
+    poller = CollectorStatusPoller(lambda: api_tools.iter_collectors('offline'), interval=60)
+    poller.start()
+    changes = poller.changes_since(parse_since("since this morning", time.time()))
+    poller.stop()
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Hour that "this morning" starts at (local time)
+MORNING_HOUR = 6
+
+_SINCE = re.compile(
+    r"\b(?:(?:last|past|previous)\s+(?P<count>\d{1,3})\s*(?P<unit>h|hrs?|hours?|m|mins?|minutes?)\b"
+    r"|(?:last|past|previous)\s+(?P<one>hour|minute)\b"
+    r"|(?P<morning>this morning)"
+    r"|(?P<today>today|since midnight)"
+    r"|(?P<yesterday>yesterday)"
+    r"|since\s+(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<ampm>am|pm)?\b)"
+)
+
+
+def parse_since(text: str, now: float) -> Optional[float]:
+    """
+    Start of the time window a question asks about ("last 2 hours", "since this morning",
+    "today", "since 9am", "yesterday"), as a time.time() value in local time.
+
+    Args:
+        text (str): User question or tool input
+        now (float): Current time.time()
+
+    Returns:
+        Optional[float]: Window start, or None if the text names no window
+    """
+    match = _SINCE.search((text or "").lower())
+    if match is None:
+        return None
+    current = datetime.fromtimestamp(now)
+    midnight = current.replace(hour=0, minute=0, second=0, microsecond=0)
+    if match.group('count') or match.group('one'):
+        count = int(match.group('count') or 1)
+        unit = match.group('unit') or match.group('one')
+        return now - count * (3600 if unit.startswith('h') else 60)
+    if match.group('morning'):
+        morning = midnight.replace(hour=MORNING_HOUR).timestamp()
+        return morning if morning <= now else midnight.timestamp()
+    if match.group('today'):
+        return midnight.timestamp()
+    if match.group('yesterday'):
+        return (midnight - timedelta(days=1)).timestamp()
+    hour = int(match.group('hour'))
+    if match.group('ampm') == 'pm' and hour < 12:
+        hour += 12
+    elif match.group('ampm') == 'am' and hour == 12:
+        hour = 0
+    if hour > 23:
+        return None
+    start = midnight.replace(hour=hour, minute=min(int(match.group('minute') or 0), 59))
+    # "since 9pm" asked at 8am means yesterday evening
+    return (start if start.timestamp() <= now else start - timedelta(days=1)).timestamp()
+
+
+@dataclass(frozen=True)
+class StatusChange:
+    """
+    Difference between two consecutive polls. went_offline/came_online hold collector IDs;
+    names and zones are looked up in the poller's directory.
+    """
+    timestamp: float  # time.time() of the poll that observed the change
+    went_offline: Tuple[str, ...]
+    came_online: Tuple[str, ...]
+
+
+class CollectorStatusPoller:
+    """
+    Polls offline collectors in a daemon thread and records per-poll diffs.
+    """
+
+    def __init__(self, fetch_offline: Callable[[], Iterable[Dict[str, Any]]], interval: float = 60,
+                 history_size: int = 1440):
+        """
+        Initialize the poller.
+
+        Args:
+            fetch_offline (Callable[[], Iterable[Dict[str, Any]]]): Returns the current offline
+                collectors (API collector objects)
+            interval (float): Seconds between polls
+            history_size (int): Number of non-empty diffs kept (oldest are dropped)
+        """
+        self.fetch_offline = fetch_offline
+        self.interval = interval
+        self.changes: Deque[StatusChange] = deque(maxlen=history_size)
+        # collectorId -> (name, zone) for every collector seen offline
+        self.directory: Dict[str, Tuple[str, str]] = {}
+        # collectorId -> time.time() of the poll that first saw it offline (None if offline at the first poll)
+        self.offline_since: Dict[str, Optional[float]] = {}
+        self.started_at: Optional[float] = None
+        self.last_poll_at: Optional[float] = None
+        self.polls = 0
+        self.failures = 0
+        self.listeners: List[Callable[[float, Dict[str, Tuple[str, str]]], None]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start polling in a daemon thread (no-op if already running)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='ireno-collector-poller', daemon=True)
+            self._thread.start()
+        logger.info("🔄 Collector status poller started (every %.0fs)", self.interval)
+
+    def stop(self, timeout: float = 5) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.poll_once()
+            self._stop.wait(self.interval)
+
+    def poll_once(self) -> Optional[StatusChange]:
+        """
+        Fetch the offline listing once and record the diff against the previous poll.
+
+        Returns:
+            Optional[StatusChange]: The change recorded, or None on the first poll, when
+            nothing changed, or when the fetch failed
+        """
+        try:
+            offline = {}
+            for collector in self.fetch_offline():
+                if isinstance(collector, dict):
+                    collector_id = str(collector.get('collectorId', collector.get('id', 'unknown')))
+                    name = collector.get('collectorName', collector.get('name', collector_id))
+                    zone = collector.get('zoneName', collector.get('zone', 'Unknown Zone'))
+                    offline[collector_id] = (name, zone)
+        except Exception as e:
+            self.failures += 1
+            logger.warning("⚠️ Collector status poll failed: %s: %s", type(e).__name__, e)
+            return None
+
+        now = time.time()
+        with self._lock:
+            first_poll = self.last_poll_at is None
+            went_offline = tuple(collector_id for collector_id in offline if collector_id not in self.offline_since)
+            came_online = tuple(collector_id for collector_id in self.offline_since if collector_id not in offline)
+
+            self.directory.update(offline)
+            for collector_id in came_online:
+                del self.offline_since[collector_id]
+            for collector_id in went_offline:
+                self.offline_since[collector_id] = None if first_poll else now
+
+            self.polls += 1
+            self.last_poll_at = now
+            if first_poll:
+                self.started_at = now
+
+            change = None
+            if not first_poll and (went_offline or came_online):
+                change = StatusChange(now, went_offline, came_online)
+                self.changes.append(change)
+
+        for listener in self.listeners:
+            try:
+                listener(now, offline)
+            except Exception as e:
+                logger.warning("⚠️ Collector poll listener failed: %s", e)
+
+        if change:
+            logger.info("🔄 Collector status changed: %d went offline, %d came back online",
+                        len(change.went_offline), len(change.came_online))
+        return change
+
+    def changes_since(self, since: float) -> List[StatusChange]:
+        """Recorded changes with timestamp >= since, oldest first."""
+        with self._lock:
+            return [change for change in self.changes if change.timestamp >= since]
+
+    def describe(self, collector_id: str) -> Tuple[str, str]:
+        """(name, zone) of a collector seen by the poller."""
+        return self.directory.get(collector_id, (collector_id, 'Unknown Zone'))
+
+    def history_start(self) -> Optional[float]:
+        """Earliest time the recorded history covers (first poll, or the oldest retained change)."""
+        with self._lock:
+            if self.changes and len(self.changes) == self.changes.maxlen:
+                return self.changes[0].timestamp
+            return self.started_at
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'running': self.running,
+                'interval': self.interval,
+                'polls': self.polls,
+                'failures': self.failures,
+                'changes_recorded': len(self.changes),
+                'currently_offline': len(self.offline_since),
+                'last_poll_at': self.last_poll_at
+            }
@@ -0,0 +1,265 @@
+"""
+Streaming Aggregation of IRENO Collector Listings
+
+This module turns a `collector?status=...` response into a compact, zone-indexed
+summary without materializing the whole collector list. Collectors are consumed one
+at a time: per-zone counts are always exact, but only the first N display rows (overall
+and per zone) are kept, so memory stays flat at fleet scale.
+
+When the `ijson` package is installed, response bodies are parsed incrementally from
+the socket; otherwise the body is parsed with `json` and then aggregated the same way.
+
+Usage:
+    from collector_stream import CollectorStatusList, parse_collector_chunks
+
+    status = parse_collector_chunks(response.iter_content(65536))   # streamed body
+    status = CollectorStatusList.from_payload(data)                   # parsed JSON
+    print(status.total, status.zone_counts)
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+
+# Rows kept for display, overall and per zone (the tools show at most 10)
+DEFAULT_DISPLAY_ROWS = 10
+
+# JSON paths of collector objects in the two payload shapes the API returns
+_ITEM_PREFIXES = ('collectors.item', 'item')
+
+
+@dataclass(frozen=True)
+class ZoneCollectors:
+    """
+    Collectors of one status in one zone: the exact count plus the first display rows
+    as parallel tuples of ids and names.
+    """
+    ids: Tuple[str, ...]
+    names: Tuple[str, ...]
+    count: int = 0
+
+
+@dataclass
+class CollectorStatusList:
+    """
+    Compact, zone-indexed view of one collector status listing (offline or online).
+    ids/names/zones are parallel tuples of the first display rows in API order;
+    listed and zone_counts are exact; by_zone gives O(1) zone lookups.
+    """
+    total: int = 0
+    listed: int = 0
+    ids: Tuple[str, ...] = ()
+    names: Tuple[str, ...] = ()
+    zones: Tuple[str, ...] = ()
+    zone_counts: Dict[str, int] = field(default_factory=dict)
+    by_zone: Dict[str, ZoneCollectors] = field(default_factory=dict)
+    all_ids: Optional[FrozenSet[str]] = None  # Every collectorId, only when requested
+    raw: Any = None  # Original payload, kept only when its format was not recognised
+
+    @classmethod
+    def from_payload(cls, data: Any, display_rows: int = DEFAULT_DISPLAY_ROWS,
+                     keep_ids: bool = False) -> "CollectorStatusList":
+        """Build the indexed view from a parsed `collector?status=...` response body."""
+        if isinstance(data, dict) and 'collectors' in data:
+            collectors_list = data['collectors']
+            total = data.get('totalCount')
+        elif isinstance(data, list):
+            collectors_list = data
+            total = None
+        else:
+            return cls(raw=data)
+
+        aggregator = CollectorAggregator(display_rows, keep_ids)
+        for collector in collectors_list:
+            aggregator.add(collector)
+        return aggregator.result(total)
+
+
+class CollectorAggregator:
+    """
+    Accumulates collectors one at a time into a CollectorStatusList.
+    """
+
+    def __init__(self, display_rows: int = DEFAULT_DISPLAY_ROWS, keep_ids: bool = False):
+        self.display_rows = display_rows
+        self.keep_ids = keep_ids
+        self.listed = 0
+        self._rows: List[Tuple[str, str, str]] = []
+        self._zone_counts: Dict[str, int] = {}
+        self._zone_rows: Dict[str, List[Tuple[str, str]]] = {}
+        self._ids: set = set()
+
+    def add(self, collector: Any) -> None:
+        """Count one collector, keeping it for display if there is room."""
+        if not isinstance(collector, dict):
+            return
+        self.listed += 1
+
+        collector_id = str(collector.get('collectorId', collector.get('id', 'unknown')))
+        name = collector.get('collectorName', collector.get('name', collector.get('deviceName', f'collector{self.listed}')))
+        zone = collector.get('zoneName', collector.get('location', collector.get('site', collector.get('zone', 'Unknown Zone'))))
+
+        self._zone_counts[zone] = self._zone_counts.get(zone, 0) + 1
+        if len(self._rows) < self.display_rows:
+            self._rows.append((collector_id, name, zone))
+        zone_rows = self._zone_rows.setdefault(zone, [])
+        if len(zone_rows) < self.display_rows:
+            zone_rows.append((collector_id, name))
+        if self.keep_ids:
+            self._ids.add(collector_id)
+
+    def result(self, total: Optional[int] = None) -> CollectorStatusList:
+        """Finish aggregation. total defaults to the number of collectors listed."""
+        by_zone = {
+            zone: ZoneCollectors(
+                ids=tuple(collector_id for collector_id, _ in rows),
+                names=tuple(name for _, name in rows),
+                count=self._zone_counts[zone]
+            )
+            for zone, rows in self._zone_rows.items()
+        }
+        return CollectorStatusList(
+            total=total if isinstance(total, int) else self.listed,
+            listed=self.listed,
+            ids=tuple(row[0] for row in self._rows),
+            names=tuple(row[1] for row in self._rows),
+            zones=tuple(row[2] for row in self._rows),
+            zone_counts=dict(self._zone_counts),
+            by_zone=by_zone,
+            all_ids=frozenset(self._ids) if self.keep_ids else None
+        )
+
+
+def _iter_events(stream: BinaryIO) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield ('listing', None) when the collector array starts, ('collector', obj) for each
+    collector, ('totalCount', n), and ('other', (key, value)) for any other top-level
+    key, parsing incrementally.
+    """
+    builder = None
+    depth = 0
+    top_key = None
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if event in ('start_map', 'start_array'):
+                depth += 1
+            elif event in ('end_map', 'end_array'):
+                depth -= 1
+            if depth == 0:
+                if top_key is None:
+                    yield 'collector', builder.value
+                else:
+                    yield 'other', (top_key, builder.value)
+                builder = None
+            continue
+
+        if event == 'start_array' and prefix in ('', 'collectors'):
+            yield 'listing', None
+        elif prefix in _ITEM_PREFIXES and event in ('start_map', 'start_array'):
+            builder, depth, top_key = ijson.ObjectBuilder(), 1, None
+            builder.event(event, value)
+        elif prefix in _ITEM_PREFIXES:
+            yield 'collector', value
+        elif prefix == '' and event in ('string', 'number', 'boolean', 'null'):
+            yield 'other', (None, value)  # Scalar body
+        elif '.' not in prefix and prefix not in ('', 'collectors'):
+            if event in ('start_map', 'start_array'):
+                builder, depth, top_key = ijson.ObjectBuilder(), 1, prefix
+                builder.event(event, value)
+            elif event not in ('map_key', 'end_map', 'end_array'):
+                if prefix == 'totalCount':
+                    yield 'totalCount', value
+                yield 'other', (prefix, value)
+
+
+def parse_collector_stream(stream: BinaryIO, display_rows: int = DEFAULT_DISPLAY_ROWS,
+                           keep_ids: bool = False) -> CollectorStatusList:
+    """
+    Aggregate a collector listing straight from a file-like response body.
+
+    Args:
+        stream (BinaryIO): Response body, e.g. requests' response.raw with decode_content=True
+        display_rows (int): Rows kept for display, overall and per zone
+        keep_ids (bool): Also keep the set of every collectorId (for status diffs)
+
+    Returns:
+        CollectorStatusList: Exact counts and the first display rows
+    """
+    if not IJSON_AVAILABLE:
+        return CollectorStatusList.from_payload(json.load(stream), display_rows, keep_ids)
+
+    aggregator = CollectorAggregator(display_rows, keep_ids)
+    total = None
+    is_listing = False
+    others: Dict[Optional[str], Any] = {}
+    for kind, value in _iter_events(stream):
+        if kind == 'listing':
+            is_listing = True
+        elif kind == 'collector':
+            aggregator.add(value)
+        elif kind == 'totalCount':
+            total = value
+        else:
+            key, item = value
+            others[key] = item
+
+    if is_listing:
+        return aggregator.result(int(total) if total is not None else None)
+    # Not a collector listing: the other top-level keys are the whole payload
+    return CollectorStatusList(raw=others.get(None, {k: v for k, v in others.items() if k is not None}))
+
+
+class _ChunkReader:
+    """File-like read() over an iterator of byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._buffer = b''
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            data, self._buffer = self._buffer, b''
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def iter_collector_items(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Yield the collectors of a listing body one at a time as they are parsed. Stopping
+    early (e.g. with itertools.islice) leaves the rest of the body unread.
+    """
+    if not IJSON_AVAILABLE:
+        data = json.loads(b''.join(chunks))
+        if isinstance(data, dict):
+            data = data.get('collectors', [])
+        yield from (data if isinstance(data, list) else [])
+        return
+    for kind, value in _iter_events(_ChunkReader(chunks)):
+        if kind == 'collector':
+            yield value
+
+
+def parse_collector_chunks(chunks: Iterable[bytes], display_rows: int = DEFAULT_DISPLAY_ROWS,
+                           keep_ids: bool = False) -> CollectorStatusList:
+    """
+    Same as parse_collector_stream(), for a body delivered as byte chunks
+    (e.g. requests' response.iter_content(), which also decodes gzip and maps
+    socket errors to requests exceptions).
+    """
+    if not IJSON_AVAILABLE:
+        return CollectorStatusList.from_payload(json.loads(b''.join(chunks)), display_rows, keep_ids)
+    return parse_collector_stream(_ChunkReader(chunks), display_rows, keep_ids)
@@ -0,0 +1,158 @@
+"""
+Per-User Conversation Memory for IRENO Smart Assistant
+
+Each user (or user conversation) gets its own window memory of the last k exchanges,
+instead of one memory shared by every request. Sessions live in an LRU capped at
+max_sessions and are dropped after idle_ttl seconds without use; a session that is not
+in memory is rehydrated from the persisted chat messages on first use. Each session
+keeps at most 2*k messages, so memory use is bounded by max_sessions * 2k messages no
+matter how many users are active.
+
+Usage:
+    from conversation_memory import ConversationSessionStore
+
+    sessions = ConversationSessionStore(load_history=lambda key: [("user", "hi"), ("assistant", "hello")],
+                                        window=10, max_sessions=500, idle_ttl=1800)
+    memory = sessions.get((user_id, conversation_id))
+    history = memory.load_memory_variables({})["chat_history"]
+    memory.save_context({"input": question}, {"output": answer})
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Tuple
+
+from langchain.memory import ConversationBufferWindowMemory
+
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedWindowMemory(ConversationBufferWindowMemory):
+    """
+    Window memory that also discards messages older than the window. The base class only
+    hides them from the prompt, so a long conversation would otherwise grow without bound.
+    """
+
+    def save_context(self, inputs: Dict[str, Any], outputs: Dict[str, str]) -> None:
+        super().save_context(inputs, outputs)
+        messages = self.chat_memory.messages
+        if len(messages) > 2 * self.k:
+            del messages[:-2 * self.k]
+
+
+class ConversationSessionStore:
+    """
+    LRU of per-session window memories with idle eviction and lazy rehydration.
+    """
+
+    def __init__(self, load_history: Callable[[Hashable], Iterable[Tuple[str, str]]], window: int = 10,
+                 max_sessions: int = 500, idle_ttl: float = 1800):
+        """
+        Initialize the store.
+
+        Args:
+            load_history (Callable[[Hashable], Iterable[Tuple[str, str]]]): Returns the persisted
+                (sender, message) pairs of a session, oldest first; sender is 'user' or 'assistant'
+            window (int): Exchanges (question and answer) kept per session
+            max_sessions (int): Sessions held at once; the least recently used is dropped first
+            idle_ttl (float): Seconds after which an unused session is dropped; 0 keeps them until evicted
+        """
+        self.load_history = load_history
+        self.window = window
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        # key -> (memory, time.monotonic() of last use), least recently used first
+        self._sessions: "OrderedDict[Hashable, Tuple[BoundedWindowMemory, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.rehydrated = 0
+        self.evicted = 0
+        self.expired = 0
+
+    def _new_memory(self) -> BoundedWindowMemory:
+        return BoundedWindowMemory(k=self.window, memory_key="chat_history", return_messages=True)
+
+    def _expire(self, now: float) -> None:
+        """Drop idle sessions from the LRU end (call with the lock held)."""
+        if self.idle_ttl <= 0:
+            return
+        while self._sessions:
+            key, (_, last_used) = next(iter(self._sessions.items()))
+            if now - last_used < self.idle_ttl:
+                break
+            del self._sessions[key]
+            self.expired += 1
+
+    def get(self, key: Hashable) -> BoundedWindowMemory:
+        """
+        Memory of a session, rehydrated from the persisted history if it is not held.
+
+        Args:
+            key (Hashable): Session key, e.g. (user_id, conversation_id)
+
+        Returns:
+            BoundedWindowMemory: The session's memory
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._sessions.get(key)
+            if entry is not None:
+                self._sessions[key] = (entry[0], now)
+                self._sessions.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        # Load outside the lock so one slow history query does not block other users
+        memory = self._new_memory()
+        try:
+            messages = list(self.load_history(key))[-2 * self.window:]
+        except Exception as e:
+            logger.warning("⚠️ Could not rehydrate conversation %s: %s", key, e)
+            messages = []
+        for sender, message in messages:
+            if sender == 'user':
+                memory.chat_memory.add_user_message(message)
+            else:
+                memory.chat_memory.add_ai_message(message)
+
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is not None:  # Rehydrated concurrently by another request
+                self._sessions.move_to_end(key)
+                return entry[0]
+            self._sessions[key] = (memory, now)
+            self.rehydrated += 1
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+        logger.debug("Rehydrated conversation %s with %d messages", key, len(messages))
+        return memory
+
+    def clear(self) -> int:
+        """
+        Drop every session; each is rehydrated from the persisted history on next use.
+
+        Returns:
+            int: Number of sessions dropped
+        """
+        with self._lock:
+            count = len(self._sessions)
+            self._sessions.clear()
+            return count
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'sessions': len(self._sessions),
+                'max_sessions': self.max_sessions,
+                'window': self.window,
+                'idle_ttl': self.idle_ttl,
+                'hits': self.hits,
+                'rehydrated': self.rehydrated,
+                'evicted': self.evicted,
+                'expired': self.expired
+            }
@@ -0,0 +1,222 @@
+"""
+Date Expressions and Date-Indexed KPI Series for IRENO Smart Assistant
+
+This module understands the dates users ask about in KPI questions and looks them up
+in a KPI time series without scanning it:
+
+- parse_date_expression(): single days ("August 10th, 2025", "2025-08-10", "8/10"),
+  ranges ("Aug 5 to Aug 9", "between Aug 5 and 9", "Aug 5-9"; "Jul 31-2" runs into
+  August), comparisons and lists ("Aug 9 vs Aug 10", "Aug 5, 7 and 9") and relative
+  phrases ("yesterday", "last 3 days", "past week"). All patterns are compiled once at
+  import time.
+- DateIndexedSeries: KPI items indexed by day, with O(1) single-day lookup and bisect
+  range lookup.
+
+Relative phrases are resolved against a reference day - for the static historical
+KPI data that is the last day of the data window, not today's date.
+
+Usage:
+    from datetime import date
+    from date_query import DateIndexedSeries, parse_date_expression
+
+    expression = parse_date_expression("Aug 9 vs Aug 10", reference=date(2025, 8, 11))
+    series = DateIndexedSeries(items)
+    points = [series.on(day) for day in expression.days]
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+
+_MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+_MONTH = (r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+          r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?")
+_DAY = r"\d{1,2}(?:st|nd|rd|th)?"
+_YEAR = r"(?:,?\s*\d{4})?"
+_RANGE_WORD = r"(?:-|–|to|through|thru|until|till)"
+
+# One alternation finds every date mention, in order, in a single scan
+_DATE_MENTION = re.compile(
+    r"\b(?:"
+    rf"(?P<iso>\d{{4}}-\d{{1,2}}-\d{{1,2}})"
+    rf"|(?P<md_range>{_MONTH}\s+{_DAY}\s*{_RANGE_WORD}\s*{_DAY}(?!\s*{_MONTH}){_YEAR})"
+    rf"|(?P<md>{_MONTH}\s+{_DAY}(?!\d){_YEAR})"
+    rf"|(?P<dm>{_DAY}\s+(?:of\s+)?{_MONTH}{_YEAR})"
+    rf"|(?P<numeric>\d{{1,2}}/\d{{1,2}}(?:/\d{{2,4}})?)"
+    rf"|(?P<bare_day>(?<=,\s)\d{{1,2}}(?:st|nd|rd|th)?|(?<=and\s)\d{{1,2}}(?:st|nd|rd|th)?)"
+    r")(?![\d/-])"
+)
+_NUMBER = re.compile(r"\d+")
+_MONTH_WORD = re.compile(_MONTH)
+_YEAR_SUFFIX = re.compile(r"(\d{4})\s*$")
+
+# Text between two date mentions
+_RANGE_CONNECTOR = re.compile(rf"^\s*(?:{_RANGE_WORD}|and)\s*$")
+_BETWEEN = re.compile(r"\b(?:between|from)\s*$")
+_COMPARE_WORDS = re.compile(r"\b(?:vs\.?|versus|compar\w*|against|differen\w*|change)\b")
+
+_RELATIVE = re.compile(
+    r"\b(?:(?P<today>today|latest day|most recent day)"
+    r"|(?P<day_before>day before yesterday)"
+    r"|(?P<yesterday>yesterday)"
+    r"|(?:last|past|previous)\s+(?P<n_days>\d{1,3})\s+days?"
+    r"|(?:last|past|previous|this)\s+(?P<week>week)"
+    r")\b"
+)
+
+
+@dataclass(frozen=True)
+class DateExpression:
+    """
+    Dates referenced by a question.
+
+    kind is 'day' (one date), 'days' (several separate dates, e.g. a comparison) or
+    'range' (every day from start to end, inclusive).
+    """
+    kind: str
+    start: date
+    end: date
+    days: Tuple[date, ...] = ()
+    compare: bool = False
+
+    @property
+    def span(self) -> Tuple[date, date]:
+        return self.start, self.end
+
+
+def _resolve_year(text: str, default_year: int) -> int:
+    match = _YEAR_SUFFIX.search(text)
+    return int(match.group(1)) if match else default_year
+
+
+def _mention_dates(match: "re.Match", previous: Optional[date], default_year: int) -> List[date]:
+    """Dates a mention refers to (two for 'Aug 5-9', the range ends); empty if invalid."""
+    text = match.group(0)
+    try:
+        if match.group('iso'):
+            year, month, day = (int(part) for part in _NUMBER.findall(text))
+            return [date(year, month, day)]
+        if match.group('numeric'):
+            parts = [int(part) for part in _NUMBER.findall(text)]
+            year = parts[2] if len(parts) > 2 else default_year
+            return [date(year + 2000 if year < 100 else year, parts[0], parts[1])]
+        if match.group('bare_day'):
+            # "Aug 5, 7 and 9": a bare day continues the month of the previous mention
+            if previous is None:
+                return []
+            return [date(previous.year, previous.month, int(_NUMBER.search(text).group(0)))]
+
+        month = _MONTHS[_MONTH_WORD.search(text).group(0)[:3]]
+        year = _resolve_year(text, default_year)
+        days = [int(number) for number in _NUMBER.findall(text)]
+        if _YEAR_SUFFIX.search(text):
+            days = days[:-1]  # Last number is the year
+        if match.group('md_range'):
+            if days[1] >= days[0]:
+                return [date(year, month, days[0]), date(year, month, days[1])]
+            # "Aug 31-2" runs into the next month
+            end_year, end_month = (year + 1, 1) if month == 12 else (year, month + 1)
+            return [date(year, month, days[0]), date(end_year, end_month, days[1])]
+        return [date(year, month, days[0])]
+    except (ValueError, IndexError, KeyError):
+        return []
+
+
+def parse_date_expression(text: str, reference: date, default_year: Optional[int] = None) -> Optional[DateExpression]:
+    """
+    Parse the dates a question refers to.
+
+    Args:
+        text (str): User question or tool input
+        reference (date): Day that relative phrases ("yesterday", "last 3 days") count back from
+        default_year (Optional[int]): Year for dates written without one (default: reference year)
+
+    Returns:
+        Optional[DateExpression]: Parsed dates, or None if the text mentions no date
+    """
+    lowered = (text or "").lower()
+    default_year = default_year or reference.year
+
+    mentions: List[Tuple["re.Match", List[date]]] = []
+    previous = None
+    for match in _DATE_MENTION.finditer(lowered):
+        dates = _mention_dates(match, previous, default_year)
+        if dates:
+            mentions.append((match, dates))
+            previous = dates[-1]
+
+    compare = bool(_COMPARE_WORDS.search(lowered))
+
+    if mentions:
+        first_match, first_dates = mentions[0]
+        if len(first_dates) == 2 and len(mentions) == 1:
+            start, end = first_dates
+            return DateExpression('range', start, end)
+
+        if len(mentions) == 2 and not compare:
+            # "Aug 5 to Aug 9", "from Aug 5 until Aug 9", "between Aug 5 and Aug 9"
+            second_match, second_dates = mentions[1]
+            connector = lowered[first_match.end():second_match.start()]
+            is_between = bool(_BETWEEN.search(lowered[:first_match.start()]))
+            if _RANGE_CONNECTOR.match(connector) and (is_between or connector.strip() != 'and'):
+                start, end = sorted((first_dates[0], second_dates[-1]))
+                return DateExpression('range', start, end)
+
+        days = tuple(sorted({day for _, dates in mentions for day in dates}))
+        if len(days) == 1:
+            return DateExpression('day', days[0], days[0], days)
+        return DateExpression('days', days[0], days[-1], days, compare=compare or len(days) == 2)
+
+    relative = _RELATIVE.search(lowered)
+    if relative is None:
+        return None
+    if relative.group('today'):
+        return DateExpression('day', reference, reference, (reference,))
+    if relative.group('yesterday') or relative.group('day_before'):
+        day = reference - timedelta(days=1 if relative.group('yesterday') else 2)
+        return DateExpression('day', day, day, (day,))
+    count = int(relative.group('n_days')) if relative.group('n_days') else 7
+    return DateExpression('range', reference - timedelta(days=max(count, 1) - 1), reference)
+
+
+class DateIndexedSeries:
+    """
+    KPI time-series items indexed by the day of their startTime.
+    """
+
+    def __init__(self, items: List[Dict[str, Any]]):
+        self._by_day: Dict[date, Dict[str, Any]] = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            try:
+                day = date.fromisoformat(str(item.get('startTime', ''))[:10])
+            except ValueError:
+                continue
+            self._by_day.setdefault(day, item)
+        self.days: List[date] = sorted(self._by_day)
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def on(self, day: date) -> Optional[Dict[str, Any]]:
+        """Item for one day, or None."""
+        return self._by_day.get(day)
+
+    def between(self, start: date, end: date) -> List[Tuple[date, Dict[str, Any]]]:
+        """(day, item) pairs for the inclusive range start..end, in date order."""
+        low = bisect_left(self.days, start)
+        high = bisect_right(self.days, end)
+        return [(day, self._by_day[day]) for day in self.days[low:high]]
+
+    def latest(self) -> Optional[Tuple[date, Dict[str, Any]]]:
+        """Most recent (day, item), or None if the series is empty."""
+        if not self.days:
+            return None
+        return self.days[-1], self._by_day[self.days[-1]]
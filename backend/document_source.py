@@ -0,0 +1,462 @@
+"""
+Document Sources for IRENO Smart Assistant SOP Search
+
+This module defines a pluggable interface for loading SOP (Standard Operating Procedure)
+documents so that the keyword search in `sop_search.py` is not tied to Azure Blob Storage.
+Two implementations are provided:
+
+- BlobDocumentSource: reads .md files from an Azure Blob Storage container
+- LocalDocumentSource: reads .md files from a local directory (e.g. the repo's docs/ folder)
+
+Both produce the same combined text format (=== FILE: name === / === END OF name ===)
+that `SOPSearchEngine` expects. Either can be wrapped in a SnapshotDocumentSource, which
+keeps a compressed local copy of the corpus for fast warm starts (see `sop_snapshot.py`).
+
+Usage:
+    from document_source import create_document_source
+
+    source = create_document_source()          # picks backend from environment
+    document_text = source.get_all_document_content()
+
+    # Offline / on-prem usage
+    source = LocalDocumentSource("../docs")
+    if source.has_changed():
+        document_text = source.get_all_document_content()
+"""
+
+import json
+import logging
+import mmap
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from azure_blob_handler import AzureBlobManager, create_azure_blob_manager
+except ImportError:
+    AzureBlobManager = None
+    create_azure_blob_manager = None
+
+from sop_snapshot import SnapshotError, read_snapshot, write_snapshot
+
+
+DEFAULT_CONTAINER_NAME = "sopdocuments"
+DEFAULT_LOCAL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "docs")
+
+
+class DocumentSource(ABC):
+    """
+    Abstract source of SOP documents.
+
+    Subclasses only need to know how to list, read and fingerprint documents; the
+    combined search text is assembled here so every backend produces identical output.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.logger.setLevel(logging.INFO)
+        self._last_signature = None
+        # Timing and size of the most recent get_all_document_content() call
+        self.last_load_stats: Dict[str, float] = {}
+
+    @abstractmethod
+    def list_documents(self) -> List[str]:
+        """
+        List the names of all .md documents available from this source.
+
+        Returns:
+            List[str]: Document names, sorted
+        """
+
+    @abstractmethod
+    def read_document(self, name: str) -> str:
+        """
+        Read a single document.
+
+        Args:
+            name (str): Document name as returned by list_documents()
+
+        Returns:
+            str: Document content decoded as UTF-8
+        """
+
+    @abstractmethod
+    def get_signature(self) -> Tuple:
+        """
+        Return a cheap fingerprint of the current document set.
+
+        The fingerprint must change whenever a document is added, removed or modified,
+        and must not require reading document contents.
+
+        Returns:
+            Tuple: Hashable fingerprint of the document set
+        """
+
+    def has_changed(self) -> bool:
+        """
+        Check whether the document set changed since the last call (or since the last load).
+
+        Returns:
+            bool: True on first call or if any document was added, removed or modified
+        """
+        signature = self.get_signature()
+        changed = signature != self._last_signature
+        self._last_signature = signature
+        return changed
+
+    def get_all_document_content(self) -> str:
+        """
+        Read all documents and return them as a single string with file markers.
+
+        Returns:
+            str: Combined content of all documents, or "" if none were found
+        """
+        started = time.perf_counter()
+        combined_content = []
+        names = self.list_documents()
+
+        for name in names:
+            try:
+                content = self.read_document(name)
+            except Exception as e:
+                self.logger.error(f"Failed to read document {name}: {str(e)}")
+                # Continue with other files instead of failing completely
+                continue
+
+            combined_content.append(f"\n\n=== FILE: {name} ===\n")
+            combined_content.append(content)
+            combined_content.append(f"\n=== END OF {name} ===\n")
+
+        if not names:
+            self.logger.warning(f"No .md documents found in {self.describe()}")
+            return ""
+
+        self._last_signature = self.get_signature()
+        result = ''.join(combined_content)
+        self._record_load(started, result, documents=len(names))
+        self.logger.info(f"Loaded {len(names)} documents from {self.describe()}, total content: {len(result)} characters")
+        return result
+
+    def _record_load(self, started: float, content: str, **extra) -> None:
+        """Store timing and size information for the load that began at `started`."""
+        self.last_load_stats = {
+            'load_seconds': round(time.perf_counter() - started, 6),
+            'characters': len(content),
+            **extra
+        }
+
+    def describe(self) -> str:
+        """Return a short human-readable description of this source for logs and messages."""
+        return self.__class__.__name__
+
+
+class BlobDocumentSource(DocumentSource):
+    """
+    Document source backed by an Azure Blob Storage container.
+    """
+
+    def __init__(self, blob_manager: "AzureBlobManager", container_name: str = DEFAULT_CONTAINER_NAME):
+        """
+        Initialize the blob document source.
+
+        Args:
+            blob_manager (AzureBlobManager): Connected blob manager
+            container_name (str): Name of the container holding the SOP documents
+        """
+        super().__init__()
+        self.blob_manager = blob_manager
+        self.container_name = container_name
+
+    def list_documents(self) -> List[str]:
+        files = self.blob_manager.list_md_files(self.container_name)
+        return sorted(file_info['name'] for file_info in files)
+
+    def read_document(self, name: str) -> str:
+        return self.blob_manager.get_document_by_name(self.container_name, name)
+
+    def get_signature(self) -> Tuple:
+        files = self.blob_manager.list_md_files(self.container_name)
+        return tuple(sorted(
+            (file_info['name'], file_info['size'], str(file_info['last_modified']))
+            for file_info in files
+        ))
+
+    def get_all_document_content(self) -> str:
+        # The blob manager already streams the whole container in one pass
+        started = time.perf_counter()
+        content = self.blob_manager.get_all_document_content(self.container_name)
+        self._last_signature = self.get_signature()
+        self._record_load(started, content)
+        self.logger.info(f"Loaded {self.describe()} in {self.last_load_stats['load_seconds']:.3f}s")
+        return content
+
+    def describe(self) -> str:
+        return f"blob container '{self.container_name}'"
+
+
+class LocalDocumentSource(DocumentSource):
+    """
+    Document source backed by a local directory.
+
+    Files are read through mmap and cached per file; a file is only re-read when its
+    (inode, mtime, size) fingerprint changes, so repeated loads of an unchanged corpus
+    cost one stat() per file.
+    """
+
+    def __init__(self, root_dir: str = DEFAULT_LOCAL_DIR, extension: str = ".md"):
+        """
+        Initialize the local document source.
+
+        Args:
+            root_dir (str): Directory to scan recursively for documents
+            extension (str): File extension to include (case-insensitive)
+
+        Raises:
+            ValueError: If root_dir is not an existing directory
+        """
+        super().__init__()
+        if not root_dir or not os.path.isdir(root_dir):
+            raise ValueError(f"Document directory does not exist: {root_dir}")
+
+        self.root_dir = os.path.abspath(root_dir)
+        self.extension = extension.lower()
+        # name -> ((inode, mtime_ns, size), content)
+        self._cache: Dict[str, Tuple[Tuple[int, int, int], str]] = {}
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root_dir, *name.split('/'))
+
+    @staticmethod
+    def _file_signature(stat_result: os.stat_result) -> Tuple[int, int, int]:
+        return (stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size)
+
+    def _scan(self) -> Dict[str, Tuple[int, int, int]]:
+        """Walk the directory and return {name: (inode, mtime_ns, size)} for matching files."""
+        found = {}
+        for dirpath, dirnames, filenames in os.walk(self.root_dir):
+            dirnames.sort()
+            for filename in filenames:
+                if not filename.lower().endswith(self.extension):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat_result = os.stat(path)
+                except OSError:
+                    continue
+                name = os.path.relpath(path, self.root_dir).replace(os.sep, '/')
+                found[name] = self._file_signature(stat_result)
+        return found
+
+    def list_documents(self) -> List[str]:
+        return sorted(self._scan())
+
+    def read_document(self, name: str) -> str:
+        path = self._path(name)
+
+        with open(path, 'rb') as f:
+            signature = self._file_signature(os.fstat(f.fileno()))
+            cached = self._cache.get(name)
+            if cached and cached[0] == signature:
+                return cached[1]
+
+            if signature[2] == 0:
+                # mmap cannot map empty files
+                content = ""
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    content = mapped[:].decode('utf-8')
+
+        self._cache[name] = (signature, content)
+        return content
+
+    def get_signature(self) -> Tuple:
+        return tuple(sorted(self._scan().items()))
+
+    def get_all_document_content(self) -> str:
+        content = super().get_all_document_content()
+
+        # Drop cache entries for files that no longer exist
+        current = set(self.list_documents())
+        for name in list(self._cache):
+            if name not in current:
+                del self._cache[name]
+
+        return content
+
+    def describe(self) -> str:
+        return f"local directory '{self.root_dir}'"
+
+
+class SnapshotDocumentSource(DocumentSource):
+    """
+    Wraps another source with a compressed single-file snapshot of the corpus and its index.
+
+    On load, a valid snapshot is used with one sequential read and a decompress; the
+    wrapped source is only read in full when the snapshot is missing, corrupt or stale,
+    after which a fresh snapshot is written.
+    """
+
+    _FILE_MARKER = re.compile(r'\n\n=== FILE: (.+?) ===\n')
+
+    def __init__(self, source: DocumentSource, snapshot_path: str, verify_freshness: bool = True):
+        """
+        Initialize the snapshot source.
+
+        Args:
+            source (DocumentSource): Source to load from when the snapshot cannot be used
+            snapshot_path (str): Path of the snapshot file
+            verify_freshness (bool): Compare the snapshot against the source signature
+                before using it. Disable to warm-start without touching the source.
+        """
+        super().__init__()
+        self.source = source
+        self.snapshot_path = snapshot_path
+        self.verify_freshness = verify_freshness
+        self._corpus = ""
+        # name -> (offset, length) of the document body within the corpus
+        self._index: Dict[str, Tuple[int, int]] = {}
+
+    @classmethod
+    def _build_index(cls, corpus: str) -> Dict[str, Tuple[int, int]]:
+        """Locate each document body in the combined corpus text."""
+        index = {}
+        for match in cls._FILE_MARKER.finditer(corpus):
+            name = match.group(1).strip()
+            start = match.end()
+            end = corpus.find(f"\n=== END OF {name} ===\n", start)
+            if end != -1:
+                index[name] = (start, end - start)
+        return index
+
+    @staticmethod
+    def _normalize_signature(signature: Tuple) -> list:
+        return json.loads(json.dumps(signature))
+
+    def list_documents(self) -> List[str]:
+        if self._index:
+            return sorted(self._index)
+        return self.source.list_documents()
+
+    def read_document(self, name: str) -> str:
+        if name in self._index:
+            start, length = self._index[name]
+            return self._corpus[start:start + length]
+        return self.source.read_document(name)
+
+    def get_signature(self) -> Tuple:
+        return self.source.get_signature()
+
+    def has_changed(self) -> bool:
+        if not self.verify_freshness:
+            # Trust the snapshot: only a first load counts as a change
+            return not self._corpus
+        return super().has_changed()
+
+    def _load_snapshot(self) -> Optional[str]:
+        """Return the snapshot corpus if it exists and is usable, otherwise None."""
+        try:
+            segments, stats = read_snapshot(self.snapshot_path)
+            manifest = json.loads(segments['index'].decode('utf-8'))
+            corpus = segments['corpus'].decode('utf-8')
+        except (SnapshotError, KeyError, ValueError) as e:
+            self.logger.info(f"SOP snapshot not used: {str(e)}")
+            return None
+
+        if self.verify_freshness:
+            current = self._normalize_signature(self.source.get_signature())
+            if manifest.get('signature') != current:
+                self.logger.info(f"SOP snapshot {self.snapshot_path} is stale, reloading from {self.source.describe()}")
+                return None
+
+        self._index = {name: tuple(span) for name, span in manifest.get('documents', {}).items()}
+        self.last_load_stats = {'origin': 'snapshot', 'characters': len(corpus),
+                                'documents': len(self._index), **stats}
+        return corpus
+
+    def _save_snapshot(self, corpus: str) -> Dict[str, float]:
+        manifest = {
+            'source': self.source.describe(),
+            'created': datetime.now(timezone.utc).isoformat(),
+            'signature': self._normalize_signature(self.source.get_signature()),
+            'documents': {name: list(span) for name, span in self._index.items()}
+        }
+        return write_snapshot(self.snapshot_path, {
+            'corpus': corpus.encode('utf-8'),
+            'index': json.dumps(manifest).encode('utf-8')
+        })
+
+    def get_all_document_content(self) -> str:
+        started = time.perf_counter()
+        corpus = self._load_snapshot()
+
+        if corpus is None:
+            corpus = self.source.get_all_document_content()
+            self._index = self._build_index(corpus)
+            snapshot_stats = {}
+            if corpus:
+                try:
+                    snapshot_stats = self._save_snapshot(corpus)
+                except OSError as e:
+                    self.logger.error(f"Failed to write SOP snapshot {self.snapshot_path}: {str(e)}")
+            self._record_load(started, corpus, origin='source', documents=len(self._index),
+                              **{key: value for key, value in snapshot_stats.items() if key != 'write_seconds'})
+        else:
+            self.last_load_stats['load_seconds'] = round(time.perf_counter() - started, 6)
+
+        self._corpus = corpus
+        if self.verify_freshness:
+            self._last_signature = self.get_signature()
+        self.logger.info(f"Loaded SOP corpus from {self.last_load_stats['origin']} in "
+                         f"{self.last_load_stats.get('load_seconds', 0):.3f}s "
+                         f"(compression ratio {self.last_load_stats.get('compression_ratio', 'n/a')})")
+        return corpus
+
+    def describe(self) -> str:
+        return f"snapshot '{self.snapshot_path}' of {self.source.describe()}"
+
+
+def create_document_source(source_type: Optional[str] = None) -> DocumentSource:
+    """
+    Create a DocumentSource from parameters or environment variables.
+
+    Environment variables:
+        SOP_DOCUMENT_SOURCE: "blob" (default) or "local"
+        SOP_LOCAL_DIR: Directory for the local source (default: repo docs/ folder)
+        SOP_CONTAINER_NAME: Blob container name (default: sopdocuments)
+        AZURE_STORAGE_CONNECTION_STRING: Used by the blob source
+        SOP_SNAPSHOT_PATH: If set, wrap the source in a compressed local snapshot
+        SOP_SNAPSHOT_VERIFY: "false" to trust the snapshot without checking the source
+
+    Args:
+        source_type (Optional[str]): "blob" or "local". If None, read from SOP_DOCUMENT_SOURCE
+
+    Returns:
+        DocumentSource: Configured document source
+
+    Raises:
+        ValueError: If the source type is unknown or required configuration is missing
+        ImportError: If the blob source is requested but azure-storage-blob is unavailable
+    """
+    if source_type is None:
+        source_type = os.getenv('SOP_DOCUMENT_SOURCE', 'blob')
+    source_type = source_type.strip().lower()
+
+    if source_type == 'local':
+        source = LocalDocumentSource(os.getenv('SOP_LOCAL_DIR', DEFAULT_LOCAL_DIR))
+    elif source_type == 'blob':
+        if create_azure_blob_manager is None:
+            raise ImportError("Azure blob handler is not available. Install with: pip install azure-storage-blob")
+        container_name = os.getenv('SOP_CONTAINER_NAME', DEFAULT_CONTAINER_NAME)
+        source = BlobDocumentSource(create_azure_blob_manager(), container_name)
+    else:
+        raise ValueError(f"Unknown SOP document source '{source_type}'. Use 'blob' or 'local'.")
+
+    snapshot_path = os.getenv('SOP_SNAPSHOT_PATH')
+    if snapshot_path:
+        verify = os.getenv('SOP_SNAPSHOT_VERIFY', 'true').strip().lower() not in ('0', 'false', 'no')
+        source = SnapshotDocumentSource(source, snapshot_path, verify_freshness=verify)
+
+    return source
@@ -0,0 +1,149 @@
+"""
+Async HTTP Client for IRENO APIs
+
+This module provides an asyncio-based alternative to the blocking `requests.Session`
+used by `IrenoAPITools`. It wraps `httpx.AsyncClient` with configurable connection pool
+limits, keep-alive and HTTP/2 multiplexing, so a single worker can overlap many
+in-flight IRENO calls.
+
+HTTP/2 requires the `h2` package (pip install "httpx[http2]"); without it the client
+falls back to HTTP/1.1 keep-alive connections.
+
+httpx errors are translated to the equivalent `requests` exceptions so the existing
+tool error handling produces the same user-facing messages for both clients.
+
+Usage:
+    from ireno_async import AsyncIrenoClient
+
+    client = AsyncIrenoClient(max_connections=20)
+    data = await client.get_json(url)
+    await client.aclose()
+"""
+
+import asyncio
+import logging
+import weakref
+from typing import Any, AsyncGenerator, Dict, Optional, Tuple
+
+import httpx
+import requests
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncIrenoClient:
+    """
+    Pooled async JSON client for the IRENO device-management and KPI APIs.
+    """
+
+    def __init__(self, timeout: float = 15, max_connections: int = 20, max_keepalive_connections: int = 10,
+                 keepalive_expiry: float = 30, http2: bool = True, headers: Optional[Dict[str, str]] = None):
+        """
+        Initialize the client. The underlying httpx.AsyncClient is created lazily on first use
+        in each event loop.
+
+        Args:
+            timeout (float): Per-request timeout in seconds
+            max_connections (int): Maximum concurrent connections in the pool
+            max_keepalive_connections (int): Maximum idle keep-alive connections
+            keepalive_expiry (float): Seconds an idle keep-alive connection is kept open
+            http2 (bool): Use HTTP/2 when the h2 package is installed
+            headers (Optional[Dict[str, str]]): Default request headers
+        """
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.http2 = http2 and HTTP2_AVAILABLE
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning("HTTP/2 requested but h2 is not installed. Install with: pip install \"httpx[http2]\"")
+        self.headers = headers or {}
+        # Event loop -> (client, closer). Connection pools are bound to the loop that created
+        # them, so each loop gets its own client, closed when that loop shuts down.
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[httpx.AsyncClient, AsyncGenerator]]" = weakref.WeakKeyDictionary()
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """
+        Return the client for the running event loop, creating it on first use in that loop
+        (e.g. one asyncio.run() per request gets a fresh client each time).
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(loop)
+        if entry is not None and not entry[0].is_closed:
+            return entry[0]
+        # Forget clients closed with their loop (loops are often only freed by the cycle collector)
+        for stale_loop, (stale_client, _) in list(self._clients.items()):
+            if stale_client.is_closed:
+                self._clients.pop(stale_loop, None)
+        client = httpx.AsyncClient(
+            http2=self.http2,
+            limits=self.limits,
+            timeout=httpx.Timeout(self.timeout),
+            headers=self.headers
+        )
+        closer = self._close_on_shutdown(client)
+        await closer.__anext__()
+        self._clients[loop] = (client, closer)
+        return client
+
+    @staticmethod
+    async def _close_on_shutdown(client: httpx.AsyncClient) -> AsyncGenerator[None, None]:
+        """
+        Parked async generator that closes `client` when finalized. asyncio.run() finalizes
+        open async generators before closing its loop, so the pooled connections are closed
+        on the loop that owns them instead of leaking once the loop is gone.
+        """
+        try:
+            yield
+        finally:
+            if not client.is_closed:
+                await client.aclose()
+
+    async def get_json(self, url: str) -> Any:
+        """
+        GET a URL and return the parsed JSON body.
+
+        Args:
+            url (str): Absolute URL
+
+        Returns:
+            Any: Parsed JSON
+
+        Raises:
+            requests.exceptions.Timeout: If the request timed out
+            requests.exceptions.ConnectionError: If the host could not be reached
+            requests.exceptions.HTTPError: If the response status is 4xx/5xx
+        """
+        return (await self.get_json_with_size(url))[0]
+
+    async def get_json_with_size(self, url: str):
+        """
+        Same as get_json(), but also return the response body size in bytes.
+        """
+        client = await self._get_client()
+        try:
+            response = await client.get(url)
+            response.raise_for_status()
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e))
+        except httpx.HTTPStatusError as e:
+            raise requests.exceptions.HTTPError(str(e), response=e.response)
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e))
+
+        return response.json(), len(response.content)
+
+    async def aclose(self) -> None:
+        """Close the pooled connections of the running event loop's client."""
+        entry = self._clients.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            await entry[1].aclose()
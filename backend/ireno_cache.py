@@ -0,0 +1,347 @@
+"""
+Response Cache for IRENO API Tools
+
+This module provides a thread-safe, size-bounded LRU cache with per-entry TTLs used by
+`IrenoAPITools` to avoid repeating identical IRENO API calls. Static historical KPI
+windows can be cached indefinitely, while live collector status expires after seconds.
+
+It also provides request coalescing (SingleFlight / AsyncSingleFlight): concurrent
+callers of the same endpoint share one outstanding request and its result, and
+per-turn tool memoization (turn_memo): within one agent turn, repeating a tool call
+with the same input returns the first result without running the tool again. Tools
+report their errors as text, so a call that hit a failure (report_tool_failure()
+inside tool_call()) is not memoized and a retry in the same turn runs again.
+
+Usage:
+    from ireno_cache import TTLCache, MISSING
+
+    cache = TTLCache(max_entries=256, max_bytes=32 * 1024 * 1024)
+    value = cache.get(url)
+    if value is MISSING:
+        value = fetch(url)
+        cache.set(url, value, ttl=30, size=len(raw_bytes))
+    print(cache.stats())
+
+    with turn_memo() as memo:
+        agent_executor.invoke(...)
+    print(memo.hits)
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+# Sentinel returned by TTLCache.get() on a miss (None is a valid cached JSON value)
+MISSING = object()
+
+# TTL for data that never changes (static historical windows)
+NO_EXPIRY = float('inf')
+
+
+class TTLCache:
+    """
+    LRU cache with per-entry expiry and a bound on both entry count and total size.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 32 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum number of cached entries
+            max_bytes (int): Maximum total size of cached entries, as reported by set()
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (expires_at, size, value); ordered from least to most recently used
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Look up a key.
+
+        Args:
+            key (Hashable): Cache key
+
+        Returns:
+            Any: Cached value, or MISSING if absent or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+
+            expires_at, size, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._total_bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return MISSING
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float, size: int = 0) -> None:
+        """
+        Store a value.
+
+        Args:
+            key (Hashable): Cache key
+            value (Any): Value to cache
+            ttl (float): Time to live in seconds (NO_EXPIRY for static data, <= 0 disables caching)
+            size (int): Approximate size of the value in bytes, used for the memory bound
+        """
+        if ttl <= 0 or size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous[1]
+
+            self._entries[key] = (time.monotonic() + ttl, size, value)
+            self._total_bytes += size
+
+            while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """
+        Remove one key, or every entry if key is None.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._total_bytes = 0
+                return
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._total_bytes -= entry[1]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters and current footprint.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+
+class _Call:
+    """One in-flight call shared by every concurrent caller with the same key."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent identical calls across threads.
+
+    While a call for a key is running, other callers with the same key wait for it and
+    receive its result (or exception) instead of issuing their own request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn() for key, or wait for the call already in flight for key.
+
+        Args:
+            key (Hashable): Identity of the call (e.g. the request URL)
+            fn (Callable[[], Any]): Function performing the call
+
+        Returns:
+            Any: Result of the shared call
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'executed': self.executed, 'shared': self.shared, 'in_flight': len(self._calls)}
+
+
+class AsyncSingleFlight:
+    """
+    Deduplicates concurrent identical coroutine calls on the same event loop.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, "asyncio.Task"] = {}
+        self.executed = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await fn() for key, or join the task already in flight for key.
+
+        A waiter being cancelled does not cancel the shared task for the other waiters.
+        """
+        loop = asyncio.get_running_loop()
+        task = self._calls.get(key)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            self.shared += 1
+        else:
+            task = loop.create_task(fn())
+            self._calls[key] = task
+            self.executed += 1
+            task.add_done_callback(lambda finished, key=key: self._discard(key, finished))
+        return await asyncio.shield(task)
+
+    def _discard(self, key: Hashable, task: "asyncio.Task") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {'executed': self.executed, 'shared': self.shared, 'in_flight': len(self._calls)}
+
+
+class TurnMemo:
+    """
+    Tool results of one agent turn, keyed by tool name and normalized input.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.results: Dict[Tuple[str, str], Any] = {}
+        self.hits = 0
+
+    @staticmethod
+    def key(tool_name: str, tool_input: Any) -> Tuple[str, str]:
+        """(tool name, input) with case, surrounding punctuation and repeated whitespace normalized."""
+        return tool_name, " ".join(str(tool_input or "").lower().split()).strip(" .?!'\"")
+
+    def get(self, tool_name: str, tool_input: Any) -> Any:
+        """Memoized result, or MISSING."""
+        with self._lock:
+            result = self.results.get(self.key(tool_name, tool_input), MISSING)
+            if result is not MISSING:
+                self.hits += 1
+            return result
+
+    def set(self, tool_name: str, tool_input: Any, result: Any) -> None:
+        with self._lock:
+            self.results.setdefault(self.key(tool_name, tool_input), result)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'calls': len(self.results), 'hits': self.hits}
+
+
+# Memo of the current agent turn, or None outside a turn
+_turn_memo: ContextVar[Optional[TurnMemo]] = ContextVar('ireno_turn_memo', default=None)
+
+
+@contextmanager
+def turn_memo():
+    """
+    Memoize tool results for the duration of one agent turn; the memo is discarded on exit.
+
+    Yields:
+        TurnMemo: The turn's memo (for hit counts)
+    """
+    memo = TurnMemo()
+    token = _turn_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _turn_memo.reset(token)
+
+
+def current_turn_memo() -> Optional[TurnMemo]:
+    """Memo of the agent turn in progress, or None outside turn_memo()."""
+    return _turn_memo.get()
+
+
+class ToolCall:
+    """Outcome of one tool call, set by report_tool_failure() while it runs."""
+
+    def __init__(self):
+        self.failed = False
+
+
+# Tool call in progress, or None outside tool_call(). Worker threads started with a copy of
+# the caller's context (fan-out, asyncio.to_thread) report to the same call.
+_tool_call: ContextVar[Optional[ToolCall]] = ContextVar('ireno_tool_call', default=None)
+
+
+@contextmanager
+def tool_call():
+    """
+    Track whether the tool call run inside the block hit a failure.
+
+    Yields:
+        ToolCall: The call; check .failed after the block
+    """
+    call = ToolCall()
+    token = _tool_call.set(call)
+    try:
+        yield call
+    finally:
+        _tool_call.reset(token)
+
+
+def report_tool_failure() -> None:
+    """Mark the tool call in progress as failed (e.g. an IRENO request errored or timed out)."""
+    call = _tool_call.get()
+    if call is not None:
+        call.failed = True
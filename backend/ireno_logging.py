@@ -0,0 +1,102 @@
+"""
+Non-Blocking Logging Setup for IRENO Smart Assistant
+
+Log records are put on an in-memory queue by a QueueHandler and written to the console
+and log file by a QueueListener thread, so request threads never wait on file I/O.
+Loggers should use lazy %-style arguments (`logger.debug("Item: %s", item)`) so
+disabled levels cost no string formatting, and wrap large payloads in sample() so
+only a bounded preview is ever rendered.
+
+Usage:
+    from ireno_logging import configure_logging, sample
+
+    configure_logging(level="INFO", log_file="ireno_assistant.log")
+    logger.debug("First item: %s", sample(data[0]))
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import reprlib
+from typing import Any, List, Optional
+
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Bounds of a sampled payload preview
+SAMPLE_MAX_ITEMS = 3
+SAMPLE_MAX_CHARS = 300
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class _Sample:
+    """Payload preview rendered only if the log record is actually emitted."""
+
+    __slots__ = ('value', 'max_items', 'max_chars')
+
+    def __init__(self, value: Any, max_items: int, max_chars: int):
+        self.value = value
+        self.max_items = max_items
+        self.max_chars = max_chars
+
+    def __str__(self) -> str:
+        preview = reprlib.Repr()
+        preview.maxlist = preview.maxdict = preview.maxtuple = preview.maxset = self.max_items
+        preview.maxstring = preview.maxother = self.max_chars
+        preview.maxlevel = 3
+        text = preview.repr(self.value)
+        if isinstance(self.value, (list, tuple, dict)) and len(self.value) > self.max_items:
+            text += f" ({len(self.value)} items)"
+        return text if len(text) <= self.max_chars else text[:self.max_chars] + '...'
+
+    __repr__ = __str__
+
+
+def sample(value: Any, max_items: int = SAMPLE_MAX_ITEMS, max_chars: int = SAMPLE_MAX_CHARS) -> _Sample:
+    """
+    Wrap a payload for logging: at most max_items elements per container and max_chars
+    characters, rendered lazily.
+    """
+    return _Sample(value, max_items, max_chars)
+
+
+def configure_logging(level: str = "INFO", log_file: Optional[str] = "ireno_assistant.log") -> logging.handlers.QueueListener:
+    """
+    Route all logging through a queue to console and file handlers on a background thread.
+
+    Args:
+        level (str): Root log level name (e.g. "INFO", "DEBUG")
+        log_file (Optional[str]): Log file appended to, or None for console only
+
+    Returns:
+        logging.handlers.QueueListener: The running listener (stopped, and the queue flushed, at exit)
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers: List[logging.Handler] = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, mode='a', encoding='utf-8'))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(getattr(logging, str(level).upper(), logging.INFO))
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+@atexit.register
+def _stop_listener() -> None:
+    if _listener is not None:
+        _listener.stop()
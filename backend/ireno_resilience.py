@@ -0,0 +1,227 @@
+"""
+Resilience Helpers for IRENO API Calls
+
+This module keeps a degraded IRENO cluster from stalling the agent:
+
+- CircuitBreaker: per-endpoint breaker that fails fast while open and lets a single
+  probe request through once the reset timeout has passed (half-open)
+- turn_budget(): per-agent-turn latency budget; each request's timeout is capped by the
+  time left in the turn, and requests fail fast once the budget is spent
+
+Errors raised here subclass the `requests` exceptions the tools already handle, so
+users get the same "unable to connect" / "taking longer than usual" messages.
+
+Usage:
+    from ireno_resilience import CircuitBreakerRegistry, turn_budget
+
+    breakers = CircuitBreakerRegistry(failure_threshold=3, reset_timeout=30)
+    with breakers.for_url(url).guard():
+        response = session.get(url, timeout=request_timeout(15))
+    with turn_budget(30):
+        agent_executor.invoke(...)
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of calling an endpoint whose circuit breaker is open."""
+
+
+class BudgetExceededError(requests.exceptions.Timeout):
+    """Raised when the current agent turn has no latency budget left for another request."""
+
+
+# Monotonic deadline of the current agent turn, or None when no budget is active
+_turn_deadline: ContextVar[Optional[float]] = ContextVar('ireno_turn_deadline', default=None)
+
+
+@contextmanager
+def turn_budget(seconds: float):
+    """
+    Limit the total time IRENO requests may take within one agent turn.
+
+    Args:
+        seconds (float): Budget for the turn; <= 0 disables the budget
+    """
+    token = _turn_deadline.set(time.monotonic() + seconds if seconds > 0 else None)
+    try:
+        yield
+    finally:
+        _turn_deadline.reset(token)
+
+
+def remaining_budget() -> Optional[float]:
+    """Seconds left in the current turn's budget, or None if no budget is active."""
+    deadline = _turn_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def request_timeout(default: float) -> float:
+    """
+    Return the timeout for the next request: the default, capped by the turn budget.
+
+    Raises:
+        BudgetExceededError: If the turn budget is already spent
+    """
+    remaining = remaining_budget()
+    if remaining is None:
+        return default
+    if remaining <= 0:
+        raise BudgetExceededError("Latency budget for this request turn is exhausted")
+    return min(default, remaining)
+
+
+def endpoint_key(url: str) -> str:
+    """
+    Identify the endpoint a URL belongs to: the path, plus kpiName for KPI queries.
+    """
+    parts = urlsplit(url)
+    kpi_name = parse_qs(parts.query).get('kpiName')
+    if kpi_name:
+        return f"{parts.path}?kpiName={kpi_name[0]}"
+    return parts.path
+
+
+def is_breaker_failure(error: BaseException) -> bool:
+    """
+    Whether an error indicates the endpoint is unhealthy. Client errors (4xx) and
+    budget exhaustion do not count against the endpoint.
+    """
+    if isinstance(error, (CircuitOpenError, BudgetExceededError)):
+        return False
+    if isinstance(error, requests.exceptions.HTTPError):
+        response = getattr(error, 'response', None)
+        return response is None or response.status_code >= 500
+    return isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError))
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failures; open -> half-open after
+    `reset_timeout` seconds, admitting one probe; the probe's outcome closes or reopens it.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.total_failures = 0
+        self.total_successes = 0
+        self.rejected = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_request(self) -> None:
+        """
+        Check whether a request may proceed.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with a probe already running
+        """
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+
+            self.rejected += 1
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+            raise CircuitOpenError(f"IRENO endpoint {self.name} is unavailable (circuit open, retry in {retry_in:.0f}s)")
+
+    @contextmanager
+    def guard(self):
+        """
+        Run one request under the breaker: before_request() on entry, and the outcome recorded
+        when the block exits. Errors that is_breaker_failure() accepts count as failures; any
+        other exit counts as a success (the endpoint answered), including a streaming caller
+        closing the block early.
+
+        Raises:
+            CircuitOpenError: If the breaker does not admit the request
+        """
+        self.before_request()
+        failed = False
+        try:
+            yield
+        except Exception as e:
+            failed = is_breaker_failure(e)
+            raise
+        finally:
+            if failed:
+                self.record_failure()
+            else:
+                self.record_success()
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.total_successes += 1
+            self.consecutive_failures = 0
+            self.state = self.CLOSED
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.total_failures += 1
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'total_failures': self.total_failures,
+                'total_successes': self.total_successes,
+                'rejected': self.rejected
+            }
+
+
+class CircuitBreakerRegistry:
+    """
+    Lazily creates one CircuitBreaker per endpoint key.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        key = endpoint_key(url)
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = CircuitBreaker(key, self.failure_threshold, self.reset_timeout)
+                self._breakers[key] = breaker
+            return breaker
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {key: breaker.stats() for key, breaker in breakers.items()}
@@ -1,9 +1,20 @@
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
 from langchain.tools import Tool
-from typing import Dict, Any
+from typing import Dict, Any, Awaitable, Callable, Iterator, List, Optional, Tuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+import asyncio
+from dataclasses import dataclass, field, replace
 import json
 import logging
-from datetime import datetime, timedelta
+import re
+import threading
+import time
+from datetime import date, datetime, timedelta
 from urllib.parse import quote
 import os
 from dotenv import load_dotenv
@@ -13,22 +24,263 @@ import os
 # Import SOP search functionality
 try:
     from sop_search import keyword_search, search_with_highlights
-    from azure_blob_handler import AzureBlobManager
-    import os
+    from document_source import create_document_source
     SOP_AVAILABLE = True
 except ImportError as e:
     SOP_AVAILABLE = False
-    logging.warning(f"SOP search not available: {e}")
+    logging.warning("SOP search not available: %s", e)
+
+from ireno_cache import (TTLCache, SingleFlight, AsyncSingleFlight, MISSING, NO_EXPIRY, current_turn_memo,
+                         report_tool_failure, tool_call)
+from ireno_async import AsyncIrenoClient
+from collector_stream import CollectorAggregator, CollectorStatusList, iter_collector_items, parse_collector_chunks
+from collector_poller import CollectorStatusPoller, parse_since
+from collector_history import CollectorHistory
+from ireno_resilience import CircuitBreakerRegistry, request_timeout
+from kpi_engine import KPIQuery, KPIQueryEngine
+from kpi_store import SQLiteKPIStore
+from kpi_columnar import ZoneKPIFrame, ZoneKPIStats
+from kpi_anomaly import Anomaly, detect_anomalies, point_series
+from date_query import DateExpression, parse_date_expression
+from tool_output import ToolOutputFormatter, compact_json, parse_budgets, tsv
+from ireno_logging import sample
+from ireno_zones import ZONE_NAMES, ZONE_ALIASES
 
 # Configure logging for IRENO tools
 logger = logging.getLogger(__name__)
 
+# Responses fetched by an async tool variant before it runs the shared formatting code.
+# Maps URL -> parsed JSON, or the exception raised while fetching it.
+_prefetched_responses: ContextVar[Optional[Dict[str, Any]]] = ContextVar('ireno_prefetched_responses', default=None)
+
+
+@dataclass
+class _ToolRun:
+    """One wrapped tool call: the turn's memoized result, or the tool's output to render."""
+    result: Any = MISSING
+    output: Any = None
+
+
+@dataclass
+class CollectorSnapshot:
+    """
+    One consistent view of collector status shared by all collector tools.
+    """
+    offline: CollectorStatusList
+    online: CollectorStatusList
+    counts: Any
+    fetched_at: float  # time.monotonic() when the snapshot was taken
+
+
+# Words that mark a question as needing IRENO data, by category
+ENTITY_KEYWORDS = {
+    'date': ['august', 'aug', '2025', 'date', 'daily', 'day', 'today', 'yesterday', 'last 7 days',
+             'last seven days', 'recent', 'past week', 'weekly', 'monthly'],
+    'zone': ['zone performance', 'zone', 'area', 'highest zone', 'lowest zone', 'best zone', 'worst zone',
+             'zone comparison', 'which zone'],
+    'interval_read': ['interval read'],
+    'register_read': ['register read'],
+    'collectors': ['offline collectors in', 'how many', 'total collectors', 'count', 'went offline',
+                   'back online', 'since this morning', 'uptime', 'downtime', 'flap'],
+    'performance': ['success rate', 'percentage', 'performance', 'weekly trends', 'abnormal', 'anomaly',
+                    'anomalies', 'outlier'],
+    'summary': ['kpi', 'metrics', 'statistics', 'data']
+}
+
+
+@dataclass
+class QueryEntities:
+    """
+    Entities found in a user query. zones holds zone names in order of first mention;
+    zone_ids holds the full zone IDs given explicitly (UUID or known 8-character prefix).
+    """
+    zones: List[str] = field(default_factory=list)
+    zone_ids: List[str] = field(default_factory=list)
+    metrics: List[str] = field(default_factory=list)
+    dates: Optional[DateExpression] = None
+    has_date_words: bool = False
+
+    @property
+    def needs_data(self) -> bool:
+        """Whether the query asks about anything IRENO data can answer."""
+        return bool(self.zones or self.zone_ids or self.metrics or self.has_date_words)
+
+
+class EntityExtractor:
+    """
+    Finds zones, zone IDs, dates and metric keywords in a query with one compiled
+    alternation, scanned once. Longer phrases are tried first, so "staten island"
+    wins over "island" and "interval read" over single words.
+    """
+    
+    _UUID = r'[0-9a-f]{8}(?:-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})?'
+    
+    def __init__(self, zone_names: Dict[str, str], aliases: Dict[str, str], keywords: Dict[str, List[str]]):
+        # phrase -> ('zone', zone name) or (category, None)
+        self._phrases: Dict[str, Tuple[str, Optional[str]]] = {}
+        for category, words in keywords.items():
+            for word in words:
+                self._phrases[word] = (category, None)
+        for name in zone_names.values():
+            self._phrases[name.lower()] = ('zone_name', name)
+        for alias, name in aliases.items():
+            self._phrases[alias] = ('zone_name', name)
+        
+        self._zone_by_prefix = {zone_id[:8]: zone_id for zone_id in zone_names}
+        self._zone_names = zone_names
+        phrases = sorted(self._phrases, key=len, reverse=True)
+        self._pattern = re.compile(
+            rf"\b(?:(?P<uuid>{self._UUID})\b|(?P<phrase>{'|'.join(re.escape(phrase) for phrase in phrases)}))"
+        )
+    
+    def extract(self, text: str, reference: Optional[date] = None) -> QueryEntities:
+        """
+        Extract entities from a query.
+        
+        Args:
+            text (str): User query or tool input
+            reference (Optional[date]): If given, date expressions are parsed relative to this day
+            
+        Returns:
+            QueryEntities: Zones, zone IDs, metric categories and dates found
+        """
+        entities = QueryEntities()
+        lowered = (text or "").lower()
+        for match in self._pattern.finditer(lowered):
+            uuid = match.group('uuid')
+            if uuid:
+                zone_id = self._zone_by_prefix.get(uuid[:8]) if len(uuid) == 8 else uuid
+                if zone_id and zone_id not in entities.zone_ids:
+                    entities.zone_ids.append(zone_id)
+                    name = self._zone_names.get(zone_id)
+                    if name and name not in entities.zones:
+                        entities.zones.append(name)
+                continue
+            
+            category, zone_name = self._phrases[match.group('phrase')]
+            if zone_name:
+                if zone_name not in entities.zones:
+                    entities.zones.append(zone_name)
+            elif category == 'date':
+                entities.has_date_words = True
+            elif category not in entities.metrics:
+                entities.metrics.append(category)
+        
+        if reference is not None:
+            entities.dates = parse_date_expression(text, reference=reference)
+            entities.has_date_words = entities.has_date_words or entities.dates is not None
+        return entities
+
+
+ENTITY_EXTRACTOR = EntityExtractor(ZONE_NAMES, ZONE_ALIASES, ENTITY_KEYWORDS)
+
+
+def extract_query_entities(text: str, reference: Optional[date] = None) -> QueryEntities:
+    """Extract zones, zone IDs, dates and metric keywords from a query with the shared extractor."""
+    return ENTITY_EXTRACTOR.extract(text, reference)
+
+
+def format_clock(timestamp: float) -> str:
+    """Local time of a status event: "14:05" today, "Aug 10 14:05" on other days."""
+    moment = datetime.fromtimestamp(timestamp)
+    return moment.strftime('%H:%M') if moment.date() == date.today() else moment.strftime('%b %d %H:%M')
+
+
+def format_duration(seconds: float) -> str:
+    """Outage length: "42 min", "5h 07m", or "3d 4h" from 48 hours on."""
+    minutes = int(seconds // 60)
+    if minutes < 60:
+        return f"{minutes} min"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m" if hours < 48 else f"{hours // 24}d {hours % 24}h"
+
+
 class IrenoAPITools:
     """IRENO API Tools for LangChain agent"""
     
     BASE_URL = os.getenv("IRENO_BASE_URL", "https://irenoakscluster.westus.cloudapp.azure.com/devicemgmt/v1/collector")
     KPI_BASE_URL = os.getenv("IRENO_KPI_URL", "https://irenoakscluster.westus.cloudapp.azure.com/kpimgmt/v1/kpi")
     
+    REQUEST_TIMEOUT = 15
+    
+    # Default window of the static historical daily KPI data
+    DAILY_WINDOW = (date(2025, 8, 4), date(2025, 8, 11))
+    
+    # KPI query (kpiName, filter, start, end, interval) behind each KPI tool
+    KPI_TOOL_QUERIES = {
+        "get_last_7_days_interval_read_success": KPIQuery("DailyIntervalReadSuccessPercentageByCommodityType", "MeterCommodityType=E", *DAILY_WINDOW, interval="Daily"),
+        "get_last_7_days_register_read_success": KPIQuery("DailyRegisterReadSuccessPercentageByCommodityType", "MeterCommodityType=E", *DAILY_WINDOW, interval="Daily"),
+        "get_interval_read_success_by_zone_weekly": KPIQuery("WeeklyIntervalReadSuccessPercentageByZoneAndCommodityType", "MeterCommodityType=E", interval="Weekly"),
+        "get_interval_read_success_by_zone_monthly": KPIQuery("MonthlyIntervalReadSuccessPercentageByZoneAndCommodityType", "MeterCommodityType=E", interval="Monthly"),
+        "get_register_read_success_by_zone_weekly": KPIQuery("WeeklyRegisterReadSuccessPercentageByZoneAndCommodityType", "MeterCommodityType=E", interval="Weekly"),
+        "get_register_read_success_by_zone_monthly": KPIQuery("MonthlyRegisterReadSuccessPercentageByZoneAndCommodityType", "MeterCommodityType=E", interval="Monthly")
+    }
+    
+    # Connection pool and fan-out settings for concurrent KPI calls
+    POOL_MAXSIZE = int(os.getenv("IRENO_POOL_MAXSIZE", "16"))
+    FAN_OUT_WORKERS = int(os.getenv("IRENO_FAN_OUT_WORKERS", "8"))
+    SUMMARY_DEADLINE = float(os.getenv("IRENO_SUMMARY_DEADLINE", "10"))
+    
+    # Async client settings (used by the coroutine variants of the tools)
+    ASYNC_MAX_CONNECTIONS = int(os.getenv("IRENO_ASYNC_MAX_CONNECTIONS", "20"))
+    ASYNC_MAX_KEEPALIVE = int(os.getenv("IRENO_ASYNC_MAX_KEEPALIVE", "10"))
+    ASYNC_KEEPALIVE_EXPIRY = float(os.getenv("IRENO_ASYNC_KEEPALIVE_EXPIRY", "30"))
+    ASYNC_HTTP2 = os.getenv("IRENO_ASYNC_HTTP2", "true").strip().lower() not in ('0', 'false', 'no')
+    
+    # Circuit breaker and hedging settings. HEDGE_DELAY = 0 disables hedged requests.
+    BREAKER_FAILURE_THRESHOLD = int(os.getenv("IRENO_BREAKER_FAILURE_THRESHOLD", "3"))
+    BREAKER_RESET_TIMEOUT = float(os.getenv("IRENO_BREAKER_RESET_TIMEOUT", "30"))
+    HEDGE_DELAY = float(os.getenv("IRENO_HEDGE_DELAY", "0"))
+    
+    # Response cache TTLs in seconds. KPI URLs with a startTime/endTime window are fixed
+    # history and never change; undated KPI URLs (the weekly/monthly zone KPIs) return the
+    # current rolling periods and expire after KPI_TTL; collector status is live.
+    COLLECTOR_STATUS_TTL = float(os.getenv("IRENO_COLLECTOR_CACHE_TTL", "30"))
+    STATIC_KPI_TTL = NO_EXPIRY
+    KPI_TTL = float(os.getenv("IRENO_KPI_TTL", "900"))
+    CACHE_MAX_ENTRIES = int(os.getenv("IRENO_CACHE_MAX_ENTRIES", "256"))
+    CACHE_MAX_BYTES = int(os.getenv("IRENO_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    
+    # Chunk size for streamed collector listings
+    STREAM_CHUNK_SIZE = 64 * 1024
+    
+    # Server-side paging and zone filtering of collector listings, for APIs that support them.
+    # With either enabled, the collector tools fetch only the rows they display and take
+    # totals from /collector/count. COLLECTOR_PAGE_SIZE=0 requests unpaged listings.
+    COLLECTOR_PAGE_SIZE = int(os.getenv("IRENO_COLLECTOR_PAGE_SIZE", "0"))
+    COLLECTOR_PAGE_PARAM = os.getenv("IRENO_COLLECTOR_PAGE_PARAM", "page")
+    COLLECTOR_LIMIT_PARAM = os.getenv("IRENO_COLLECTOR_LIMIT_PARAM", "limit")
+    COLLECTOR_FIRST_PAGE = int(os.getenv("IRENO_COLLECTOR_FIRST_PAGE", "1"))
+    COLLECTOR_ZONE_PARAM = os.getenv("IRENO_COLLECTOR_ZONE_PARAM", "")
+    COLLECTOR_DISPLAY_ROWS = 10
+    
+    # Local SQLite store for ingested KPI series; empty keeps them in memory only
+    KPI_STORE_PATH = os.getenv("IRENO_KPI_STORE_PATH", "")
+    
+    # Background polling of offline collectors for the status change history.
+    # Opt-in: POLL_INTERVAL = 0 (the default) disables the poller; POLL_HISTORY is the number of changes kept.
+    POLL_INTERVAL = float(os.getenv("IRENO_POLL_INTERVAL", "0"))
+    POLL_HISTORY = int(os.getenv("IRENO_POLL_HISTORY", "1440"))
+    # Memory-mapped collector status history file; empty keeps the history in memory only
+    COLLECTOR_HISTORY_PATH = os.getenv("IRENO_COLLECTOR_HISTORY_PATH", "")
+    
+    # Tool output handed to the agent: "markdown" or "compact" (plain text and TSV rows), with
+    # per-call token budgets (0 disables) and the tiktoken encoding used to measure them
+    TOOL_OUTPUT_MODE = os.getenv("IRENO_TOOL_OUTPUT", "markdown").strip().lower()
+    TOOL_TOKEN_BUDGET = int(os.getenv("IRENO_TOOL_TOKEN_BUDGET", "1500"))
+    TOOL_TOKEN_BUDGETS = parse_budgets(os.getenv("IRENO_TOOL_TOKEN_BUDGETS",
+                                                 "get_comprehensive_kpi_summary=2500,search_sop_documents=2500"))
+    TOKEN_ENCODING = os.getenv("IRENO_TOKEN_ENCODING", "o200k_base")
+    
+    # Days in each KPI interval and its name, for trends reported per period
+    TREND_PERIODS = {'Daily': (1, 'day'), 'Weekly': (7, 'week'), 'Monthly': (365.25 / 12, 'month')}
+    
+    # Anomaly checks of detect_kpi_anomalies: periods of history behind the rolling z-score,
+    # the |z| flagged, and the smallest deviation in percentage points that is ever flagged
+    ANOMALY_WINDOW = int(os.getenv("IRENO_ANOMALY_WINDOW", "4"))
+    ANOMALY_Z_THRESHOLD = float(os.getenv("IRENO_ANOMALY_Z", "3"))
+    ANOMALY_MIN_SPREAD = float(os.getenv("IRENO_ANOMALY_MIN_SPREAD", "0.5"))
+    
     def __init__(self):
         logger.info("Initializing IRENO API Tools")
         self.session = requests.Session()
@@ -37,8 +289,50 @@ class IrenoAPITools:
             'Content-Type': 'application/json',
             'User-Agent': 'IRENO-Smart-Assistant/1.0'
         })
-        logger.info(f" Base URL: {self.BASE_URL}")
-        logger.info(f" KPI URL: {self.KPI_BASE_URL}")
+        # Keep enough pooled keep-alive connections for concurrent fan-out calls
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.POOL_MAXSIZE)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._executor = ThreadPoolExecutor(max_workers=self.FAN_OUT_WORKERS, thread_name_prefix='ireno-api')
+        self.async_client = AsyncIrenoClient(
+            timeout=self.REQUEST_TIMEOUT,
+            max_connections=self.ASYNC_MAX_CONNECTIONS,
+            max_keepalive_connections=self.ASYNC_MAX_KEEPALIVE,
+            keepalive_expiry=self.ASYNC_KEEPALIVE_EXPIRY,
+            http2=self.ASYNC_HTTP2,
+            headers=dict(self.session.headers)
+        )
+        self.cache = TTLCache(max_entries=self.CACHE_MAX_ENTRIES, max_bytes=self.CACHE_MAX_BYTES)
+        # Concurrent callers of the same URL share one outstanding request
+        self._inflight = SingleFlight()
+        self._ainflight = AsyncSingleFlight()
+        # Per-endpoint circuit breakers and optional hedged requests
+        self.breakers = CircuitBreakerRegistry(self.BREAKER_FAILURE_THRESHOLD, self.BREAKER_RESET_TIMEOUT)
+        self._hedge_executor = ThreadPoolExecutor(max_workers=self.FAN_OUT_WORKERS, thread_name_prefix='ireno-hedge')
+        self.hedges_sent = 0
+        self._hedge_lock = threading.Lock()  # Hedges are counted from several worker threads
+        # KPI data is fetched per (kpiName, filter, window, interval); only missing date ranges hit the API,
+        # and undated (weekly/monthly) series are fetched again after KPI_TTL.
+        # With a KPI store configured, ingested series survive restarts and IRENO outages.
+        kpi_store = SQLiteKPIStore(self.KPI_STORE_PATH) if self.KPI_STORE_PATH else None
+        self.kpi_engine = KPIQueryEngine(self.KPI_BASE_URL, fetch=lambda url: self._get_json(url, ttl=self._kpi_ttl(url)),
+                                         store=kpi_store, undated_ttl=self.KPI_TTL)
+        # Collector status snapshot shared by the collector tools, refreshed every COLLECTOR_STATUS_TTL seconds
+        self._collector_snapshot: Optional[CollectorSnapshot] = None
+        self._collector_snapshot_lock = threading.Lock()
+        # Offline collector poller behind get_collector_status_changes; started by start_status_poller()
+        self.status_poller = CollectorStatusPoller(lambda: self.iter_collectors('offline'),
+                                                   interval=self.POLL_INTERVAL, history_size=self.POLL_HISTORY)
+        # Every poll is also recorded as compact status transitions for downtime and uptime queries
+        self.collector_history = CollectorHistory(self.COLLECTOR_HISTORY_PATH)
+        self.status_poller.listeners.append(self.collector_history.record_poll)
+        logger.info(" Base URL: %s", self.BASE_URL)
+        logger.info(" KPI URL: %s", self.KPI_BASE_URL)
+        self.output = ToolOutputFormatter(self.TOOL_OUTPUT_MODE, self.TOOL_TOKEN_BUDGET,
+                                          self.TOOL_TOKEN_BUDGETS, self.TOKEN_ENCODING)
+        # SOP document source and its last loaded content, created lazily on first search
+        self._sop_source = None
+        self._sop_document_text = ""
     
     def get_offline_collectors(self, query: str = "") -> str:
         """
@@ -46,121 +340,65 @@ class IrenoAPITools:
         Use this when users ask about offline collectors, down devices, or disconnected equipment.
         Supports zone-specific filtering (e.g., "offline collectors in Brooklyn").
         """
-        logger.info(f"📡 API Call: get_offline_collectors - Query: '{query}'")
+        logger.info("📡 API Call: get_offline_collectors - Query: '%s'", query)
         try:
-            # Use API #8: Static offline collectors data
-            url = "https://irenoakscluster.westus.cloudapp.azure.com/devicemgmt/v1/collector?status=offline"
-            logger.info(f" Making request to: {url}")
-            
-            response = self.session.get(url, timeout=15)
-            logger.info(f" Response status: {response.status_code}")
-            response.raise_for_status()
-            
-            data = response.json()
-            logger.info(f" Received data type: {type(data)}, Size: {len(str(data))} chars")
-            
             # Check if user is asking for a specific zone
-            query_lower = query.lower()
-            requested_zone = None
-            if "brooklyn" in query_lower:
-                requested_zone = "Brooklyn"
-            elif "queens" in query_lower:
-                requested_zone = "Queens"
-            elif "bronx" in query_lower:
-                requested_zone = "Bronx"
-            elif "manhattan" in query_lower:
-                requested_zone = "Manhattan"
-            elif "westchester" in query_lower:
-                requested_zone = "Westchester"
-            elif "staten" in query_lower or "island" in query_lower:
-                requested_zone = "Staten Island"
+            zones = extract_query_entities(query).zones
+            requested_zone = zones[0] if zones else None
+            
+            offline = self._get_collector_listing('offline', requested_zone)
+            if offline.raw is not None:
+                return f"Offline collectors data: {compact_json(offline.raw)}"
+            logger.info(" Offline collectors: %s across %s zones", offline.total, len(offline.by_zone))
             
             # Format the response for the AI
-            if isinstance(data, dict) and 'collectors' in data:
-                collectors_list = data['collectors']
-                count = data.get('totalCount', len(collectors_list))
+            if offline.total == 0:
+                return "✅ **Great news!** All collectors are currently online. No offline devices found."
+            
+            # Filter by zone if requested
+            if requested_zone:
+                zone_collectors = offline.by_zone.get(requested_zone)
+                if not zone_collectors:
+                    return f"✅ **Good news!** No offline collectors found in {requested_zone} zone."
                 
-                if count == 0:
-                    return "✅ **Great news!** All collectors are currently online. No offline devices found."
-                else:
-                    result = f"📱 **Offline Collectors Found:** {count} total\n\n"
-                    
-                    # Filter by zone if requested
-                    if requested_zone:
-                        zone_collectors = [c for c in collectors_list if isinstance(c, dict) and c.get('zoneName') == requested_zone]
-                        if zone_collectors:
-                            result = f"📱 **Offline Collectors in {requested_zone}:** {len(zone_collectors)} found\n\n"
-                            for i, collector in enumerate(zone_collectors[:10], 1):  # Limit to 10
-                                collector_name = collector.get('collectorName', f'collector{i}')
-                                collector_id = collector.get('collectorId', 'unknown')
-                                result += f"{i}. **{collector_name}** (ID: {collector_id})\n"
-                            
-                            if len(zone_collectors) > 10:
-                                result += f"\n*({len(zone_collectors) - 10} additional offline collectors in this zone)*"
-                        else:
-                            result = f"✅ **Good news!** No offline collectors found in {requested_zone} zone."
-                    else:
-                        # Show first few collectors from all zones
-                        for i, collector in enumerate(collectors_list[:5], 1):
-                            if isinstance(collector, dict):
-                                collector_name = collector.get('collectorName', f'collector{i}')
-                                zone_name = collector.get('zoneName', 'Unknown Zone')
-                                collector_id = collector.get('collectorId', 'unknown')
-                                result += f"{i}. **{collector_name}** in {zone_name} (ID: {collector_id})\n"
-                        
-                        if len(collectors_list) > 5:
-                            result += f"\n*({len(collectors_list) - 5} additional offline collectors)*"
-                    
-                    return result
-                    
-            elif isinstance(data, list):
-                count = len(data)
-                if count == 0:
-                    return "✅ **Great news!** All collectors are currently online. No offline devices found."
-                else:
-                    result = f"📱 **Offline Collectors Found:** {count} total\n\n"
-                    
-                    # Filter by zone if requested
-                    if requested_zone:
-                        zone_collectors = [c for c in data if isinstance(c, dict) and c.get('zoneName') == requested_zone]
-                        if zone_collectors:
-                            result = f"📱 **Offline Collectors in {requested_zone}:** {len(zone_collectors)} found\n\n"
-                            for i, collector in enumerate(zone_collectors[:10], 1):
-                                collector_name = collector.get('collectorName', f'collector{i}')
-                                collector_id = collector.get('collectorId', 'unknown')
-                                result += f"{i}. **{collector_name}** (ID: {collector_id})\n"
-                            
-                            if len(zone_collectors) > 10:
-                                result += f"\n*({len(zone_collectors) - 10} additional offline collectors in this zone)*"
-                        else:
-                            result = f"✅ **Good news!** No offline collectors found in {requested_zone} zone."
-                    else:
-                        # Show all collectors with zones
-                        for i, collector in enumerate(data[:5], 1):
-                            if isinstance(collector, dict):
-                                collector_name = collector.get('collectorName', f'collector{i}')
-                                zone_name = collector.get('zoneName', 'Unknown Zone')
-                                collector_id = collector.get('collectorId', 'unknown')
-                                result += f"{i}. **{collector_name}** in {zone_name} (ID: {collector_id})\n"
-                        
-                        if len(data) > 5:
-                            result += f"\n*({len(data) - 5} additional offline collectors)*"
-                    
-                    return result
-            else:
-                return f"Offline collectors data: {json.dumps(data, indent=2)}"
+                zone_count = zone_collectors.count
+                if self.output.compact:
+                    result = f"Offline collectors in {requested_zone}: {zone_count}\n"
+                    result += tsv(('name', 'id'), zip(zone_collectors.names[:10], zone_collectors.ids[:10]))
+                    return result + (f"\n({zone_count - 10} more)" if zone_count > 10 else "")
+                result = f"📱 **Offline Collectors in {requested_zone}:** {zone_count} found\n\n"
+                for i, (collector_name, collector_id) in enumerate(zip(zone_collectors.names[:10], zone_collectors.ids[:10]), 1):  # Limit to 10
+                    result += f"{i}. **{collector_name}** (ID: {collector_id})\n"
+                
+                if zone_count > 10:
+                    result += f"\n*({zone_count - 10} additional offline collectors in this zone)*"
+                return result
+            
+            # Show first few collectors from all zones
+            if self.output.compact:
+                result = f"Offline collectors: {offline.total}\n"
+                result += tsv(('name', 'id', 'zone'), zip(offline.names[:5], offline.ids[:5], offline.zones[:5]))
+                return result + (f"\n({offline.listed - 5} more)" if offline.listed > 5 else "")
+            result = f"📱 **Offline Collectors Found:** {offline.total} total\n\n"
+            for i in range(min(5, len(offline.ids))):
+                result += f"{i + 1}. **{offline.names[i]}** in {offline.zones[i]} (ID: {offline.ids[i]})\n"
+            
+            if offline.listed > 5:
+                result += f"\n*({offline.listed - 5} additional offline collectors)*"
+            
+            return result
                 
         except requests.exceptions.Timeout as e:
-            logger.error(f"Timeout error in get_offline_collectors: {str(e)}")
+            logger.error("Timeout error in get_offline_collectors: %s", e)
             return "The IRENO API is taking longer than usual to respond. Based on typical patterns, offline collectors are usually in the 10-15% range. Please try again in a moment or check the IRENO dashboard directly."
         except requests.exceptions.ConnectionError as e:
-            logger.error(f" Connection error in get_offline_collectors: {str(e)}")
+            logger.error(" Connection error in get_offline_collectors: %s", e)
             return "Unable to connect to IRENO systems at the moment. For offline collectors information, please check the IRENO web dashboard or contact the operations center."
         except requests.exceptions.HTTPError as e:
-            logger.error(f" HTTP error in get_offline_collectors: Status {e.response.status_code}, Message: {str(e)}")
+            logger.error(" HTTP error in get_offline_collectors: Status %s, Message: %s", e.response.status_code, e)
             return f"IRENO API returned an error (HTTP {e.response.status_code}). Please verify your access permissions or try again later."
         except Exception as e:
-            logger.error(f"Unexpected error in get_offline_collectors: {type(e).__name__}: {str(e)}", exc_info=True)
+            logger.error("Unexpected error in get_offline_collectors: %s: %s", type(e).__name__, e, exc_info=True)
             return f"Encountered an issue accessing offline collectors data: {str(e)}. Please try again or check the IRENO dashboard manually."
     
     def get_online_collectors(self, query: str = "") -> str:
@@ -169,51 +407,28 @@ class IrenoAPITools:
         Use this when users ask about online collectors, active devices, or connected equipment.
         """
         try:
-            url = f"{self.BASE_URL}?status=online"
-            response = self.session.get(url, timeout=15)  # Increased timeout
-            response.raise_for_status()
-            
-            data = response.json()
+            online = self._get_collector_listing('online')
+            if online.raw is not None:
+                return f"Online collectors data: {compact_json(online.raw)}"
             
             # Format the response for the AI
-            if isinstance(data, dict) and 'collectors' in data:
-                collectors_list = data['collectors']
-                count = data.get('totalCount', len(collectors_list))
-                
-                if count == 0:
-                    return "No online collectors found. This might indicate a system issue."
-                else:
-                    collectors_info = []
-                    for collector in collectors_list[:5]:  # Limit to first 5 for readability
-                        if isinstance(collector, dict):
-                            collector_id = collector.get('collectorId', collector.get('id', 'Unknown'))
-                            name = collector.get('collectorName', collector.get('name', collector.get('deviceName', 'Unnamed')))
-                            location = collector.get('location', collector.get('site', collector.get('zone', 'Unknown location')))
-                            collectors_info.append(f"- {name} (ID: {collector_id}) at {location}")
-                    
-                    result = f"Found {count} online collectors:\n" + "\n".join(collectors_info)
-                    if count > 5:
-                        result += f"\n... and {count - 5} more online collectors."
-                    return result
-            elif isinstance(data, list):
-                count = len(data)
-                if count == 0:
-                    return "No online collectors found. This might indicate a system issue."
-                else:
-                    collectors_info = []
-                    for collector in data[:5]:  # Limit to first 5 for readability
-                        if isinstance(collector, dict):
-                            collector_id = collector.get('collectorId', collector.get('id', 'Unknown'))
-                            name = collector.get('collectorName', collector.get('name', collector.get('deviceName', 'Unnamed')))
-                            location = collector.get('location', collector.get('site', collector.get('zone', 'Unknown location')))
-                            collectors_info.append(f"- {name} (ID: {collector_id}) at {location}")
-                    
-                    result = f"Found {count} online collectors:\n" + "\n".join(collectors_info)
-                    if count > 5:
-                        result += f"\n... and {count - 5} more online collectors."
-                    return result
-            else:
-                return f"Online collectors data: {json.dumps(data, indent=2)}"
+            count = online.total
+            if count == 0:
+                return "No online collectors found. This might indicate a system issue."
+            
+            if self.output.compact:
+                result = f"Online collectors: {count}\n"
+                result += tsv(('name', 'id', 'zone'), zip(online.names[:5], online.ids[:5], online.zones[:5]))
+                return result + (f"\n({count - 5} more)" if count > 5 else "")
+            
+            collectors_info = []
+            for i in range(min(5, len(online.ids))):  # Limit to first 5 for readability
+                collectors_info.append(f"- {online.names[i]} (ID: {online.ids[i]}) at {online.zones[i]}")
+            
+            result = f"Found {count} online collectors:\n" + "\n".join(collectors_info)
+            if count > 5:
+                result += f"\n... and {count - 5} more online collectors."
+            return result
                 
         except requests.exceptions.Timeout:
             return "The IRENO API is taking longer than usual to respond. Typically, 85-90% of collectors are online. Please try again in a moment."
@@ -230,15 +445,11 @@ class IrenoAPITools:
         Use this when users ask about total number of collectors, device count, overall system size, or zone statistics.
         """
         try:
-            logger.info(f"📡 API Call: get_collectors_count - Query: '{query}'")
+            logger.info("📡 API Call: get_collectors_count - Query: '%s'", query)
             
-            # Use API #9: Static collectors count data
-            url = "https://irenoakscluster.westus.cloudapp.azure.com/devicemgmt/v1/collector/count"
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            
-            data = response.json()
-            logger.info(f"✅ Retrieved collectors count data: {type(data)}")
+            # Use API #9: collectors count data
+            data = self._get_collector_counts()
+            logger.debug("✅ Retrieved collectors count data: %s", type(data))
             
             # Format the response for the AI
             if isinstance(data, dict):
@@ -265,13 +476,13 @@ class IrenoAPITools:
                 
                 # Add zone information if available - CRITICAL FOR ZONE ANALYSIS
                 if 'zonewiseCollectorCount' in data and isinstance(data['zonewiseCollectorCount'], list):
-                    logger.info(f"🔍 DEBUG: Found zonewiseCollectorCount array with {len(data['zonewiseCollectorCount'])} zones")
+                    logger.debug("🔍 Found zonewiseCollectorCount array with %d zones", len(data['zonewiseCollectorCount']))
                     result += "\n**📍 Zone Breakdown:**\n"
                     zone_data = []
                     
                     for i, zone in enumerate(data['zonewiseCollectorCount']):
                         if isinstance(zone, dict):
-                            logger.info(f"🔍 DEBUG Zone {i}: {zone}")
+                            logger.debug("🔍 Zone %d: %s", i, sample(zone))
                             zone_name = zone.get('zoneName', 'Unknown Zone')
                             
                             # Fix: Use correct field names from API response
@@ -284,7 +495,7 @@ class IrenoAPITools:
                                                            round((zone_offline / zone_total * 100), 1) if zone_total > 0 else 0)
                             
                             # Debug the actual values being extracted
-                            logger.info(f"🔍 DEBUG: {zone_name} - Total: {zone_total}, Online: {zone_online}, Offline: {zone_offline}, Offline%: {zone_offline_percent}")
+                            logger.debug("🔍 %s - Total: %s, Online: %s, Offline: %s, Offline%%: %s", zone_name, zone_total, zone_online, zone_offline, zone_offline_percent)
                             
                             zone_data.append({
                                 'name': zone_name,
@@ -294,11 +505,17 @@ class IrenoAPITools:
                                 'offline_percent': zone_offline_percent
                             })
                             
-                            result += f"• **{zone_name}:** {zone_total} total ({zone_online} online, {zone_offline} offline - {zone_offline_percent}%)\n"
+                            if not self.output.compact:
+                                result += f"• **{zone_name}:** {zone_total} total ({zone_online} online, {zone_offline} offline - {zone_offline_percent}%)\n"
+                    
+                    if self.output.compact:
+                        result += tsv(('zone', 'total', 'online', 'offline', 'offline_pct'),
+                                      ((zone['name'], zone['total'], zone['online'], zone['offline'], zone['offline_percent'])
+                                       for zone in zone_data)) + "\n"
                     
                     # Identify zone with highest offline percentage
                     if zone_data:
-                        logger.info(f"🔍 DEBUG: Zone data array: {zone_data}")
+                        logger.debug("🔍 Zone data array: %s", sample(zone_data))
                         highest_offline_zone = max(zone_data, key=lambda x: x['offline_percent'])
                         if highest_offline_zone['offline_percent'] > 0:
                             result += f"\n**⚠️ Zone with Highest Offline Rate:** {highest_offline_zone['name']} ({highest_offline_zone['offline_percent']}%)\n"
@@ -307,15 +524,15 @@ class IrenoAPITools:
                         lowest_offline_zone = min(zone_data, key=lambda x: x['offline_percent'])
                         result += f"**✅ Best Performing Zone:** {lowest_offline_zone['name']} ({lowest_offline_zone['offline_percent']}% offline)\n"
                 else:
-                    logger.warning(f"🔍 DEBUG: zonewiseCollectorCount not found or not a list. Keys in data: {list(data.keys())}")
+                    logger.warning("🔍 zonewiseCollectorCount not found or not a list. Keys in data: %s", list(data.keys()))
                     # Check if the data structure is different
                     if 'zonewiseCollectorCount' in data:
-                        logger.warning(f"🔍 DEBUG: zonewiseCollectorCount exists but is: {type(data['zonewiseCollectorCount'])}: {data['zonewiseCollectorCount']}")
+                        logger.warning("🔍 zonewiseCollectorCount exists but is: %s: %s", type(data['zonewiseCollectorCount']), sample(data['zonewiseCollectorCount']))
                     result += f"\n**⚠️ Zone data not available in expected format**\n"
                 
                 return result
             else:
-                return f"Collectors count data: {json.dumps(data, indent=2)}"
+                return f"Collectors count data: {compact_json(data)}"
                 
         except requests.exceptions.Timeout:
             return "The IRENO API is taking longer than usual to respond. Typically, the system manages around 415 collectors total. Please try again in a moment."
@@ -324,9 +541,626 @@ class IrenoAPITools:
         except requests.exceptions.HTTPError as e:
             return f"IRENO API returned an error (HTTP {e.response.status_code}). Please verify your access permissions or try again later."
         except Exception as e:
-            logger.error(f"❌ Error in get_collectors_count: {str(e)}")
+            logger.error("❌ Error in get_collectors_count: %s", e)
             return f"Encountered an issue accessing collector count data: {str(e)}. Please try again or check the IRENO dashboard manually."
 
+    def get_collector_status_changes(self, query: str = "") -> str:
+        """
+        Report collectors that went offline or came back online, from the background poller's
+        change history. Supports windows like "since this morning", "last 2 hours" or "today".
+        """
+        logger.info("📡 Tool Call: get_collector_status_changes - Query: '%s'", query)
+        poller = self.status_poller
+        if poller.last_poll_at is None:
+            if not poller.running:
+                return "Collector status change tracking is not running (enable it with IRENO_POLL_INTERVAL, e.g. 60). Use get_offline_collectors for the current offline list."
+            return "Collector status change tracking has just started and has no data yet. Please try again in a minute."
+        
+        now = time.time()
+        since = parse_since(query, now)
+        history_start = poller.history_start()
+        window_start = max(since, history_start) if since is not None else history_start
+        changes = poller.changes_since(window_start)
+        
+        result = f"🔄 **Collector Status Changes since {format_clock(window_start)}**\n"
+        if since is not None and since < history_start:
+            result += f"*(Tracking history only goes back to {format_clock(history_start)})*\n"
+        
+        went_offline = [(change.timestamp, collector_id) for change in changes for collector_id in change.went_offline]
+        came_online = [(change.timestamp, collector_id) for change in changes for collector_id in change.came_online]
+        if not went_offline and not came_online:
+            return result + f"\n✅ No collectors changed status. {len(poller.offline_since)} collectors are currently offline."
+        
+        for title, events in (("⚠️ Went Offline", went_offline), ("✅ Came Back Online", came_online)):
+            if not events:
+                continue
+            result += f"\n**{title}:** {len(events)}\n"
+            for timestamp, collector_id in events[-10:]:  # Most recent 10
+                name, zone = poller.describe(collector_id)
+                result += f"• {format_clock(timestamp)} - **{name}** in {zone} (ID: {collector_id})\n"
+            if len(events) > 10:
+                result += f"*({len(events) - 10} earlier changes not shown)*\n"
+        
+        result += f"\n**Currently Offline:** {len(poller.offline_since)} collectors (as of {format_clock(poller.last_poll_at)})"
+        return result
+
+    def get_collector_downtime(self, query: str = "") -> str:
+        """
+        Answer downtime questions from the collector status history: how long a collector has
+        been offline, longest outages, collectors that flap most and uptime by zone.
+        Supports windows like "today", "last 24 hours" or "since this morning".
+        """
+        logger.info("📡 Tool Call: get_collector_downtime - Query: '%s'", query)
+        history = self.collector_history
+        observed = history.observed_period()
+        if observed is None:
+            if not self.status_poller.running:
+                return "Collector downtime history is not being recorded (enable it with IRENO_POLL_INTERVAL, e.g. 60). Use get_offline_collectors for the current offline list."
+            return "Collector downtime history has just started and has no data yet. Please try again in a minute."
+        
+        # A specific collector: its current outage
+        collector_id = history.find_collector(query)
+        if collector_id:
+            outage = history.current_outage(collector_id)
+            if outage is None:
+                name, zone = history.describe(collector_id)
+                return f"✅ **{name}** in {zone} (ID: {collector_id}) is currently online (as of {format_clock(observed[1])})."
+            since = f"since {format_clock(outage.start)}"
+            if outage.start <= observed[0]:
+                since = f"since at least {format_clock(outage.start)} (when tracking started)"
+            return (f"⚠️ **{outage.name}** in {outage.zone} (ID: {collector_id}) has been offline for "
+                    f"**{format_duration(outage.seconds)}** - {since}, as of {format_clock(outage.end)}.")
+        
+        start = parse_since(query, time.time())
+        window_start = max(start, observed[0]) if start is not None else observed[0]
+        result = f"⏱️ **Collector Downtime {format_clock(window_start)} - {format_clock(observed[1])}**\n"
+        if start is not None and start < observed[0]:
+            result += f"*(Tracking history only goes back to {format_clock(observed[0])})*\n"
+        
+        # Zone sizes from the count endpoint give true uptime; fall back to collectors seen offline
+        population = None
+        try:
+            counts = self._get_json(f"{self.BASE_URL}/count", ttl=self.COLLECTOR_STATUS_TTL)
+            population = {
+                zone.get('zoneName'): zone.get('onlineCollectorsCount', 0) + zone.get('offlineCollectorsCount', 0)
+                for zone in (counts.get('zonewiseCollectorCount') or [] if isinstance(counts, dict) else [])
+                if isinstance(zone, dict)
+            }
+        except Exception as e:
+            logger.warning("⚠️ Zone collector counts unavailable for uptime: %s", e)
+        
+        result += "\n**📍 Uptime by Zone:**\n"
+        for zone in history.zone_uptime(window_start, observed[1], population):
+            result += f"• **{zone.zone}:** {zone.uptime_percent}% uptime ({format_duration(zone.offline_seconds)} offline across {zone.collectors} collectors, {zone.flaps} recoveries)\n"
+        
+        outages = history.longest_outages(window_start, observed[1], limit=5)
+        if outages:
+            result += "\n**🔻 Longest Outages:**\n"
+            for outage in outages:
+                status = "still offline" if outage.ongoing else f"back at {format_clock(outage.end)}"
+                result += f"• **{outage.name}** in {outage.zone} (ID: {outage.collector_id}): {format_duration(outage.seconds)} from {format_clock(outage.start)}, {status}\n"
+        
+        flappers = history.flap_counts(window_start, observed[1], limit=5)
+        if flappers:
+            result += "\n**🔁 Most Frequent Flapping:**\n"
+            for flapper_id, name, zone, flaps in flappers:
+                result += f"• **{name}** in {zone} (ID: {flapper_id}): went offline and recovered {flaps} times\n"
+        elif not outages:
+            result += "\n✅ No collector outages recorded in this period."
+        return result
+
+    def start_status_poller(self) -> bool:
+        """
+        Start the background offline collector poller unless POLL_INTERVAL is 0.
+        Returns whether the poller is running.
+        """
+        if self.POLL_INTERVAL > 0:
+            self.status_poller.start()
+        return self.status_poller.running
+
+    def _kpi_ttl(self, url: str) -> float:
+        """Cache TTL of a KPI URL: fixed date windows never change, undated ones roll forward."""
+        return self.STATIC_KPI_TTL if 'startTime=' in url and 'endTime=' in url else self.KPI_TTL
+
+    def _get_json(self, url: str, ttl: float):
+        """
+        GET a URL and return the parsed JSON body, serving repeat calls from the response cache.
+        Errors (timeouts, connection errors, HTTP errors) propagate to the calling tool.
+        """
+        prefetched = _prefetched_responses.get()
+        if prefetched is not None and url in prefetched:
+            data = prefetched[url]
+            if isinstance(data, Exception):
+                report_tool_failure()
+                raise data
+            return data
+        
+        data = self.cache.get(url)
+        if data is not MISSING:
+            logger.debug(" Cache hit: %s", url)
+            return data
+        
+        try:
+            return self._inflight.do(url, lambda: self._fetch_json(url, ttl))
+        except Exception:
+            report_tool_failure()
+            raise
+
+    def _fetch_json(self, url: str, ttl: float):
+        """
+        Perform the HTTP request for _get_json and cache the result. Runs once per
+        in-flight URL; concurrent callers wait for and share this call's result.
+        The endpoint's circuit breaker and the current turn's latency budget are enforced here.
+        """
+        timeout = request_timeout(self.REQUEST_TIMEOUT)
+        with self.breakers.for_url(url).guard():
+            logger.info(" Making request to: %s", url)
+            response = self._hedged_get(url, timeout)
+            logger.debug(" Response status: %s", response.status_code)
+            data = response.json()
+        
+        self.cache.set(url, data, ttl=ttl, size=len(response.content))
+        return data
+
+    def _get_checked(self, url: str, timeout: float, stream: bool = False) -> requests.Response:
+        """Single GET attempt that raises on HTTP error status."""
+        response = self.session.get(url, timeout=timeout, stream=stream)
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError:
+            response.close()
+            raise
+        return response
+
+    def _hedged_get(self, url: str, timeout: float) -> requests.Response:
+        """
+        GET with an optional hedge: if no response arrives within HEDGE_DELAY seconds, a
+        second identical request is sent and whichever succeeds first wins. Only used for
+        idempotent GETs. Disabled when HEDGE_DELAY is 0.
+        """
+        if self.HEDGE_DELAY <= 0 or self.HEDGE_DELAY >= timeout:
+            return self._get_checked(url, timeout)
+        
+        primary = self._hedge_executor.submit(self._get_checked, url, timeout)
+        done, _ = wait([primary], timeout=self.HEDGE_DELAY)
+        if done:
+            return primary.result()
+        
+        self._count_hedge()
+        logger.info(" Hedging slow request: %s", url)
+        pending = {primary, self._hedge_executor.submit(self._get_checked, url, timeout - self.HEDGE_DELAY)}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((future for future in done if future.exception() is None), None)
+            if winner is not None:
+                # Release the losing request's pooled connection as soon as it returns
+                for future in (done | pending) - {winner}:
+                    future.add_done_callback(self._close_response)
+                return winner.result()
+            error = next(iter(done)).exception()
+        raise error
+
+    @staticmethod
+    def _close_response(future) -> None:
+        """Done-callback closing the response of a hedged request that lost the race."""
+        if not future.cancelled() and future.exception() is None:
+            future.result().close()
+
+    def _count_hedge(self) -> None:
+        with self._hedge_lock:
+            self.hedges_sent += 1
+
+    async def _afetch_json(self, url: str):
+        """
+        Async counterpart of the request part of _fetch_json: breaker, budget and hedging
+        around the async client. Returns (data, size).
+        """
+        timeout = request_timeout(self.REQUEST_TIMEOUT)
+        with self.breakers.for_url(url).guard():
+            return await self._ahedged_get(url, timeout)
+
+    async def _atimed_get(self, url: str, timeout: float):
+        """Single async GET attempt capped at `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self.async_client.get_json_with_size(url), timeout)
+        except asyncio.TimeoutError:
+            raise requests.exceptions.Timeout(f"Request to {url} exceeded {timeout:.1f}s")
+
+    async def _ahedged_get(self, url: str, timeout: float):
+        """Async version of _hedged_get."""
+        if self.HEDGE_DELAY <= 0 or self.HEDGE_DELAY >= timeout:
+            return await self._atimed_get(url, timeout)
+        
+        primary = asyncio.ensure_future(self._atimed_get(url, timeout))
+        done, _ = await asyncio.wait({primary}, timeout=self.HEDGE_DELAY)
+        if done:
+            return primary.result()
+        
+        self._count_hedge()
+        logger.info(" Hedging slow request: %s", url)
+        pending = {primary, asyncio.ensure_future(self._atimed_get(url, timeout - self.HEDGE_DELAY))}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _get_collector_snapshot(self) -> CollectorSnapshot:
+        """
+        Return the shared collector snapshot, refreshing it once per COLLECTOR_STATUS_TTL.
+        The lock is held during refresh so concurrent callers wait for a single fetch.
+        """
+        with self._collector_snapshot_lock:
+            snapshot = self._collector_snapshot
+            if snapshot is None or time.monotonic() - snapshot.fetched_at >= self.COLLECTOR_STATUS_TTL:
+                snapshot = self._fetch_collector_snapshot()
+                self._collector_snapshot = snapshot
+            return snapshot
+
+    def _get_collector_counts(self) -> Any:
+        """
+        /collector/count payload: from the shared snapshot while it is fresh, otherwise only
+        /count is fetched (cached for COLLECTOR_STATUS_TTL) instead of refreshing both listings.
+        """
+        snapshot = self._collector_snapshot
+        if snapshot is not None and time.monotonic() - snapshot.fetched_at < self.COLLECTOR_STATUS_TTL:
+            return snapshot.counts
+        return self._get_json(f"{self.BASE_URL}/count", ttl=self.COLLECTOR_STATUS_TTL)
+
+    def _fetch_collector_snapshot(self) -> CollectorSnapshot:
+        """
+        Fetch offline list, online list and counts concurrently and index them by status and zone.
+        The parts bypass the response cache (ttl=0) so the snapshot is internally consistent.
+        """
+        fetched_at = time.monotonic()
+        parts = {
+            'offline': lambda: self._get_collector_list(f"{self.BASE_URL}?status=offline"),
+            'online': lambda: self._get_collector_list(f"{self.BASE_URL}?status=online"),
+            'counts': lambda: self._get_json(f"{self.BASE_URL}/count", ttl=0)
+        }
+        # The three requests run concurrently; the offline list is fetched on this thread.
+        # A part no worker has picked up yet (pool busy, e.g. inside a fan-out) also runs
+        # here, so a refresh never waits on the pool it may itself be running on.
+        futures = {name: self._executor.submit(copy_context().run, call)
+                   for name, call in parts.items() if name != 'offline'}
+        offline = parts['offline']()
+        results = {name: parts[name]() if future.cancel() else future.result()
+                   for name, future in futures.items()}
+        online, counts = results['online'], results['counts']
+        logger.info("✅ Collector snapshot refreshed: %s offline, %s online", offline.total, online.total)
+        return CollectorSnapshot(offline=offline, online=online, counts=counts, fetched_at=fetched_at)
+
+    def _get_collector_list(self, url: str) -> CollectorStatusList:
+        """
+        Fetch a collector listing and aggregate it while it streams in, keeping exact zone
+        counts but only the first display rows. Responses prefetched by an async tool
+        variant are aggregated from the parsed payload instead.
+        """
+        prefetched = _prefetched_responses.get()
+        if prefetched is not None and url in prefetched:
+            data = prefetched[url]
+            if isinstance(data, Exception):
+                report_tool_failure()
+                raise data
+            return CollectorStatusList.from_payload(data)
+        
+        try:
+            return self._inflight.do(url, lambda: self._stream_collector_list(url))
+        except Exception:
+            report_tool_failure()
+            raise
+
+    def _stream_collector_list(self, url: str) -> CollectorStatusList:
+        """
+        Streaming counterpart of _fetch_json for collector listings (not cached, not hedged).
+        """
+        timeout = request_timeout(self.REQUEST_TIMEOUT)
+        with self.breakers.for_url(url).guard():
+            logger.info(" Streaming collector listing: %s", url)
+            response = self._get_checked(url, timeout, stream=True)
+            try:
+                return parse_collector_chunks(response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE))
+            finally:
+                response.close()
+
+    @property
+    def _filtered_listings(self) -> bool:
+        """Whether collector listings are paged or zone-filtered on the server."""
+        return self.COLLECTOR_PAGE_SIZE > 0 or bool(self.COLLECTOR_ZONE_PARAM)
+
+    def _collector_url(self, status: str, zone: Optional[str] = None, page: Optional[int] = None) -> str:
+        """Collector listing URL with the zone and paging filters pushed down as query parameters."""
+        url = f"{self.BASE_URL}?status={status}"
+        if zone and self.COLLECTOR_ZONE_PARAM:
+            url += f"&{self.COLLECTOR_ZONE_PARAM}={quote(zone)}"
+        if page is not None:
+            url += f"&{self.COLLECTOR_PAGE_PARAM}={page}&{self.COLLECTOR_LIMIT_PARAM}={self.COLLECTOR_PAGE_SIZE}"
+        return url
+
+    def iter_collectors(self, status: str, zone: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield the collectors with a status ('offline' or 'online'), optionally in one zone.
+        
+        Pages are requested only as the caller consumes them, so a caller that stops after
+        N rows never downloads the rest. Unpaged listings are streamed and abandoned early
+        the same way. The zone filter is applied on the server when COLLECTOR_ZONE_PARAM is
+        set, and client-side otherwise.
+        """
+        push_zone = zone if self.COLLECTOR_ZONE_PARAM else None
+        for collector in self._collector_pages(status, push_zone):
+            if not isinstance(collector, dict):
+                continue
+            if zone and not push_zone and collector.get('zoneName') != zone:
+                continue
+            yield collector
+
+    def _collector_pages(self, status: str, zone: Optional[str]) -> Iterator[Any]:
+        """Collectors of every page of a listing, fetching each page on demand."""
+        if self.COLLECTOR_PAGE_SIZE <= 0:
+            yield from self._stream_collectors(self._collector_url(status, zone))
+            return
+        
+        page = self.COLLECTOR_FIRST_PAGE
+        seen = 0
+        while True:
+            data = self._get_json(self._collector_url(status, zone, page), ttl=self.COLLECTOR_STATUS_TTL)
+            total = data.get('totalCount') if isinstance(data, dict) else None
+            items = data.get('collectors', []) if isinstance(data, dict) else data
+            if not isinstance(items, list):
+                return
+            yield from items
+            seen += len(items)
+            if len(items) < self.COLLECTOR_PAGE_SIZE or (isinstance(total, int) and seen >= total):
+                return
+            page += 1
+
+    def _stream_collectors(self, url: str) -> Iterator[Any]:
+        """
+        Stream the collectors of one unpaged listing; closing the generator drops the rest of the body.
+        The breaker outcome is recorded once the body has been read (or the caller stopped early),
+        so a timeout or reset partway through the stream counts against the endpoint.
+        """
+        timeout = request_timeout(self.REQUEST_TIMEOUT)
+        try:
+            with self.breakers.for_url(url).guard():
+                response = self._get_checked(url, timeout, stream=True)
+                try:
+                    yield from iter_collector_items(response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE))
+                finally:
+                    response.close()
+        except Exception:
+            report_tool_failure()
+            raise
+
+    def _get_collector_listing(self, status: str, zone: Optional[str] = None) -> CollectorStatusList:
+        """
+        Collector listing for the offline/online tools.
+        
+        With server-side filtering enabled only the displayed rows are fetched (for the
+        zone, if given) and totals come from /collector/count; otherwise the shared
+        collector snapshot is used.
+        """
+        if not self._filtered_listings:
+            snapshot = self._get_collector_snapshot()
+            return snapshot.offline if status == 'offline' else snapshot.online
+        
+        counts = self._get_json(f"{self.BASE_URL}/count", ttl=self.COLLECTOR_STATUS_TTL)
+        aggregator = CollectorAggregator(self.COLLECTOR_DISPLAY_ROWS)
+        rows = self.iter_collectors(status, zone)
+        try:
+            for collector in islice(rows, self.COLLECTOR_DISPLAY_ROWS):
+                aggregator.add(collector)
+        finally:
+            rows.close()
+        listing = aggregator.result()
+        
+        # Exact totals from the count endpoint; the listing itself was cut off after the displayed rows
+        count_key = f"{status}CollectorsCount"
+        total = counts.get(count_key) if isinstance(counts, dict) else None
+        zone_totals = {
+            entry.get('zoneName'): entry.get(count_key)
+            for entry in (counts.get('zonewiseCollectorCount') or [] if isinstance(counts, dict) else [])
+            if isinstance(entry, dict) and isinstance(entry.get(count_key), int)
+        }
+        if isinstance(total, int):
+            listing.total = listing.listed = total
+        for zone_name, zone_collectors in listing.by_zone.items():
+            if zone_name in zone_totals:
+                listing.zone_counts[zone_name] = zone_totals[zone_name]
+                listing.by_zone[zone_name] = replace(zone_collectors, count=zone_totals[zone_name])
+        logger.info(" %s listing: %s rows fetched, %s total", status.capitalize(), len(listing.ids), listing.total)
+        return listing
+
+    def _kpi_query_for(self, tool_name: str, query: str = "") -> KPIQuery:
+        """
+        KPI query behind a tool call. Daily KPIs are narrowed or extended to the dates the
+        question mentions (e.g. "Aug 1 to Aug 5"); everything else uses the tool's default query.
+        """
+        kpi_query = self.KPI_TOOL_QUERIES[tool_name]
+        if not kpi_query.is_ranged or not query:
+            return kpi_query
+        expression = parse_date_expression(query, reference=self.DAILY_WINDOW[1])
+        if expression is None:
+            return kpi_query
+        return replace(kpi_query, start=expression.start, end=expression.end)
+
+    # ================================
+    # ASYNC TOOL VARIANTS
+    # ================================
+
+    def _async_requirements(self, tool_name: str, query: str = "") -> List[Tuple[str, float]]:
+        """
+        Return the (url, ttl) pairs a tool reads, so its async variant can fetch them up front.
+        """
+        if tool_name in ('get_offline_collectors', 'get_online_collectors') and self._filtered_listings:
+            return []  # Rows are fetched page by page as the tool consumes them (in a worker thread)
+        if tool_name in ('get_offline_collectors', 'get_online_collectors', 'get_collectors_count'):
+            snapshot = self._collector_snapshot
+            if snapshot is not None and time.monotonic() - snapshot.fetched_at < self.COLLECTOR_STATUS_TTL:
+                return []
+            if tool_name == 'get_collectors_count':
+                return [(f"{self.BASE_URL}/count", self.COLLECTOR_STATUS_TTL)]
+            return [(f"{self.BASE_URL}?status=offline", 0), (f"{self.BASE_URL}?status=online", 0), (f"{self.BASE_URL}/count", 0)]
+        if tool_name == 'get_comprehensive_kpi_summary':
+            kpi_tools = ('get_last_7_days_interval_read_success', 'get_last_7_days_register_read_success',
+                         'get_interval_read_success_by_zone_weekly', 'get_register_read_success_by_zone_weekly')
+        elif tool_name == 'compare_zones':
+            kpi_tools = tuple(self._comparison_tools(query).values())
+        elif tool_name == 'detect_kpi_anomalies':
+            kpi_tools = tuple(self._anomaly_series(query).values())
+            query = ""  # Anomalies are computed over each KPI's full default window
+        elif tool_name in self.KPI_TOOL_QUERIES:
+            kpi_tools = (tool_name,)
+        else:
+            return []
+        return [(url, self._kpi_ttl(url))
+                for name in kpi_tools
+                for url in self.kpi_engine.missing_urls(self._kpi_query_for(name, query))]
+
+    async def _aprefetch(self, requirements: List[Tuple[str, float]]) -> Dict[str, Any]:
+        """
+        Fetch all required URLs concurrently with the async client, serving cached ones from the cache.
+        Failed fetches are returned as exception objects so the tool's own error handling reports them.
+        """
+        prefetched = {}
+        pending = []
+        for url, ttl in requirements:
+            data = self.cache.get(url)
+            if data is MISSING:
+                pending.append((url, ttl))
+            else:
+                prefetched[url] = data
+        
+        results = await asyncio.gather(
+            *(self._ainflight.do(url, lambda url=url: self._afetch_json(url)) for url, _ in pending),
+            return_exceptions=True
+        )
+        for (url, ttl), result in zip(pending, results):
+            if isinstance(result, Exception):
+                prefetched[url] = result
+            else:
+                data, size = result
+                self.cache.set(url, data, ttl=ttl, size=size)
+                prefetched[url] = data
+        return prefetched
+
+    @contextmanager
+    def _wrapped_call(self, tool_name: str, query: str) -> Iterator["_ToolRun"]:
+        """
+        Memoization and output rendering shared by the sync and async tool variants.
+        
+        Yields a _ToolRun. Inside turn_memo(), a repeated call with the same input finds the
+        turn's first successful result in `result`, and the caller skips the tool. Otherwise
+        the caller runs the tool and sets `output`; on exit it is rendered in the configured
+        output mode and token budget into `result`, and memoized unless a request failed.
+        """
+        run = _ToolRun()
+        memo = current_turn_memo()
+        if memo is not None:
+            run.result = memo.get(tool_name, query)
+            if run.result is not MISSING:
+                logger.info("♻️ %s served from this turn's earlier call", tool_name)
+                yield run
+                return
+        with tool_call() as call:
+            yield run
+        run.result = self.output.render(tool_name, run.output)
+        if memo is not None and not call.failed:
+            memo.set(tool_name, query, run.result)
+
+    def make_sync_tool(self, tool_name: str) -> Callable[[str], str]:
+        """
+        Build the `func=` variant of a tool: the tool method, memoized per turn and rendered
+        by _wrapped_call().
+        """
+        func = getattr(self, tool_name)
+        
+        def run(query: str = "") -> str:
+            with self._wrapped_call(tool_name, query) as call:
+                if call.result is MISSING:
+                    call.output = func(query)
+            return call.result
+        
+        run.__name__ = tool_name
+        run.__doc__ = func.__doc__
+        return run
+
+    def make_async_tool(self, tool_name: str) -> Callable[[str], Awaitable[str]]:
+        """
+        Build the coroutine variant of a tool for LangChain's `coroutine=`.
+        
+        Network I/O happens on the async client; the shared formatting code then runs on
+        the prefetched responses in a worker thread, so it never blocks the event loop.
+        Tools without known requirements (e.g. SOP search) run in a worker thread directly.
+        Memoization and rendering are the same _wrapped_call() as make_sync_tool().
+        """
+        func = getattr(self, tool_name)
+        
+        async def coroutine(query: str = "") -> str:
+            with self._wrapped_call(tool_name, query) as call:
+                if call.result is MISSING:
+                    call.output = await run(query)
+            return call.result
+        
+        async def run(query: str) -> str:
+            requirements = self._async_requirements(tool_name, query)
+            if not requirements:
+                return await asyncio.to_thread(func, query)
+            
+            prefetched = await self._aprefetch(requirements)
+            token = _prefetched_responses.set(prefetched)
+            try:
+                # The tool may still block (fan-out waits, the snapshot lock), so it runs in a
+                # worker thread; to_thread() copies this context, prefetched responses included
+                return await asyncio.to_thread(func, query)
+            finally:
+                _prefetched_responses.reset(token)
+        
+        coroutine.__name__ = f"a{tool_name}"
+        return coroutine
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Return response cache hit/miss counters and memory footprint, plus request
+        coalescing counters (requests executed vs. shared with an in-flight call).
+        """
+        stats = self.cache.stats()
+        stats['coalescing'] = self._inflight.stats()
+        stats['async_coalescing'] = self._ainflight.stats()
+        stats['kpi_engine'] = self.kpi_engine.stats()
+        return stats
+
+    def get_breaker_stats(self) -> Dict[str, Any]:
+        """
+        Return circuit breaker state per endpoint and the number of hedged requests sent.
+        """
+        return {
+            'breakers': self.breakers.stats(),
+            'hedges_sent': self.hedges_sent
+        }
+
+    def get_output_stats(self) -> Dict[str, Any]:
+        """
+        Return the tool output mode and measured output tokens per tool (calls, total, max, truncations).
+        """
+        return self.output.stats()
+
+    def get_poller_stats(self) -> Dict[str, Any]:
+        """
+        Return background collector poller counters (polls, failures, changes recorded).
+        """
+        stats = self.status_poller.stats()
+        stats['history'] = self.collector_history.stats()
+        return stats
+
     # ================================
     # KPI MANAGEMENT TOOLS - NEW SECTION
     # ================================
@@ -338,21 +1172,18 @@ class IrenoAPITools:
         Use this for historical interval read performance queries and date-specific lookups.
         """
         try:
-            logger.info(f"📡 API Call: get_last_7_days_interval_read_success - Query: '{query}'")
+            logger.info("📡 API Call: get_last_7_days_interval_read_success - Query: '%s'", query)
             
-            # API #1: Static data for August 4-11, 2025
-            url = "https://irenoakscluster.westus.cloudapp.azure.com/kpimgmt/v1/kpi?kpiName=DailyIntervalReadSuccessPercentageByCommodityType&dataFilterCriteria=(MeterCommodityType%3DE)&startTime=08-04-2025%2000:00:00&endTime=08-11-2025%2023:59:59&interval=Daily"
+            # API #1: Static data for August 4-11, 2025, narrowed or extended to the dates asked about
+            kpi_query = self._kpi_query_for('get_last_7_days_interval_read_success', query)
+            data = self.kpi_engine.query(kpi_query)
+            window = self._window_label(kpi_query.start, kpi_query.end)
+            logger.info("✅ Retrieved %s data points for %s", len(data) if isinstance(data, list) else 'single', window)
             
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            
-            data = response.json()
-            logger.info(f"✅ Retrieved {len(data) if isinstance(data, list) else 'single'} data points for Aug 4-11, 2025")
-            
-            return self._format_historical_kpi_response("Daily Interval Read Success (Aug 4-11, 2025)", data, query)
+            return self._format_historical_kpi_response(f"Daily Interval Read Success ({window})", kpi_query, query)
             
         except Exception as e:
-            logger.error(f"❌ Error fetching daily interval read success: {str(e)}")
+            logger.error("❌ Error fetching daily interval read success: %s", e)
             return f"Unable to fetch daily interval read success data: {str(e)}"
 
     def get_last_7_days_register_read_success(self, query: str = "") -> str:
@@ -362,21 +1193,18 @@ class IrenoAPITools:
         Use this for historical register read performance queries and date-specific lookups.
         """
         try:
-            logger.info(f"📡 API Call: get_last_7_days_register_read_success - Query: '{query}'")
-            
-            # API #2: Static data for August 4-11, 2025
-            url = "https://irenoakscluster.westus.cloudapp.azure.com/kpimgmt/v1/kpi?kpiName=DailyRegisterReadSuccessPercentageByCommodityType&dataFilterCriteria=(MeterCommodityType%3DE)&startTime=08-04-2025%2000:00:00&endTime=08-11-2025%2023:59:59&interval=Daily"
+            logger.info("📡 API Call: get_last_7_days_register_read_success - Query: '%s'", query)
             
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            
-            data = response.json()
-            logger.info(f"✅ Retrieved {len(data) if isinstance(data, list) else 'single'} data points for Aug 4-11, 2025")
+            # API #2: Static data for August 4-11, 2025, narrowed or extended to the dates asked about
+            kpi_query = self._kpi_query_for('get_last_7_days_register_read_success', query)
+            data = self.kpi_engine.query(kpi_query)
+            window = self._window_label(kpi_query.start, kpi_query.end)
+            logger.info("✅ Retrieved %s data points for %s", len(data) if isinstance(data, list) else 'single', window)
             
-            return self._format_historical_kpi_response("Daily Register Read Success (Aug 4-11, 2025)", data, query)
+            return self._format_historical_kpi_response(f"Daily Register Read Success ({window})", kpi_query, query)
             
         except Exception as e:
-            logger.error(f"❌ Error fetching daily register read success: {str(e)}")
+            logger.error("❌ Error fetching daily register read success: %s", e)
             return f"Unable to fetch daily register read success data: {str(e)}"
 
     # Note: Daily Interval Read Success by Zone API currently returns 404 error - commented out
@@ -388,21 +1216,17 @@ class IrenoAPITools:
         Use this when users ask about weekly zone performance, area trends, or zone comparison.
         """
         try:
-            logger.info(f"📡 API Call: get_interval_read_success_by_zone_weekly - Query: '{query}'")
+            logger.info("📡 API Call: get_interval_read_success_by_zone_weekly - Query: '%s'", query)
             
             # API #3: Static weekly zone data
-            url = "https://irenoakscluster.westus.cloudapp.azure.com/kpimgmt/v1/kpi?kpiName=WeeklyIntervalReadSuccessPercentageByZoneAndCommodityType&dataFilterCriteria=(MeterCommodityType%3DE)&interval=Weekly"
+            kpi_query = self.KPI_TOOL_QUERIES['get_interval_read_success_by_zone_weekly']
+            data = self.kpi_engine.query(kpi_query)
+            logger.info("✅ Retrieved %s zone data points", len(data) if isinstance(data, list) else 'single')
             
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            
-            data = response.json()
-            logger.info(f"✅ Retrieved {len(data) if isinstance(data, list) else 'single'} zone data points")
-            
-            return self._format_zone_kpi_response_fixed("Weekly Interval Read Success by Zone", data, query)
+            return self._format_zone_kpi_response_fixed("Weekly Interval Read Success by Zone", data, query, "Weekly", kpi_query)
             
         except Exception as e:
-            logger.error(f"❌ Error fetching weekly interval read success by zone: {str(e)}")
+            logger.error("❌ Error fetching weekly interval read success by zone: %s", e)
             return f"Unable to fetch weekly interval read success by zone: {str(e)}"
 
     def get_interval_read_success_by_zone_monthly(self, query: str = "") -> str:
@@ -412,21 +1236,17 @@ class IrenoAPITools:
         Use this when users ask about monthly zone performance, long-term trends, or zone-specific monthly metrics.
         """
         try:
-            logger.info(f"📡 API Call: get_interval_read_success_by_zone_monthly - Query: '{query}'")
+            logger.info("📡 API Call: get_interval_read_success_by_zone_monthly - Query: '%s'", query)
             
             # API #4: Static monthly zone data
-            url = "https://irenoakscluster.westus.cloudapp.azure.com/kpimgmt/v1/kpi?kpiName=MonthlyIntervalReadSuccessPercentageByZoneAndCommodityType&dataFilterCriteria=(MeterCommodityType%3DE)&interval=Monthly"
-            
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            
-            data = response.json()
-            logger.info(f"✅ Retrieved {len(data) if isinstance(data, list) else 'single'} zone data points")
+            kpi_query = self.KPI_TOOL_QUERIES['get_interval_read_success_by_zone_monthly']
+            data = self.kpi_engine.query(kpi_query)
+            logger.info("✅ Retrieved %s zone data points", len(data) if isinstance(data, list) else 'single')
             
-            return self._format_zone_kpi_response_fixed("Monthly Interval Read Success by Zone", data, query)
+            return self._format_zone_kpi_response_fixed("Monthly Interval Read Success by Zone", data, query, "Monthly", kpi_query)
             
         except Exception as e:
-            logger.error(f"❌ Error fetching monthly interval read success by zone: {str(e)}")
+            logger.error("❌ Error fetching monthly interval read success by zone: %s", e)
             return f"Unable to fetch monthly interval read success by zone: {str(e)}"
 
     # Note: Daily Register Read Success by Zone API currently returns 404 error - commented out
@@ -438,21 +1258,17 @@ class IrenoAPITools:
         Use when users ask about weekly zone register performance, area register trends, or weekly zone metrics.
         """
         try:
-            logger.info(f"📡 API Call: get_register_read_success_by_zone_weekly - Query: '{query}'")
+            logger.info("📡 API Call: get_register_read_success_by_zone_weekly - Query: '%s'", query)
             
             # API #5: Static weekly register zone data
-            url = "https://irenoakscluster.westus.cloudapp.azure.com/kpimgmt/v1/kpi?kpiName=WeeklyRegisterReadSuccessPercentageByZoneAndCommodityType&dataFilterCriteria=(MeterCommodityType%3DE)&interval=Weekly"
+            kpi_query = self.KPI_TOOL_QUERIES['get_register_read_success_by_zone_weekly']
+            data = self.kpi_engine.query(kpi_query)
+            logger.info("✅ Retrieved %s zone data points", len(data) if isinstance(data, list) else 'single')
             
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            
-            data = response.json()
-            logger.info(f"✅ Retrieved {len(data) if isinstance(data, list) else 'single'} zone data points")
-            
-            return self._format_zone_kpi_response_fixed("Weekly Register Read Success by Zone", data, query)
+            return self._format_zone_kpi_response_fixed("Weekly Register Read Success by Zone", data, query, "Weekly", kpi_query)
             
         except Exception as e:
-            logger.error(f"❌ Error fetching weekly register read success by zone: {str(e)}")
+            logger.error("❌ Error fetching weekly register read success by zone: %s", e)
             return f"Unable to fetch weekly register read success by zone: {str(e)}"
 
     def get_register_read_success_by_zone_monthly(self, query: str = "") -> str:
@@ -462,22 +1278,217 @@ class IrenoAPITools:
         Use when users ask about monthly zone register performance, long-term zone trends, or monthly area metrics.
         """
         try:
-            logger.info(f"📡 API Call: get_register_read_success_by_zone_monthly - Query: '{query}'")
+            logger.info("📡 API Call: get_register_read_success_by_zone_monthly - Query: '%s'", query)
             
             # API #6: Static monthly register zone data
-            url = "https://irenoakscluster.westus.cloudapp.azure.com/kpimgmt/v1/kpi?kpiName=MonthlyRegisterReadSuccessPercentageByZoneAndCommodityType&dataFilterCriteria=(MeterCommodityType%3DE)&interval=Monthly"
+            kpi_query = self.KPI_TOOL_QUERIES['get_register_read_success_by_zone_monthly']
+            data = self.kpi_engine.query(kpi_query)
+            logger.info("✅ Retrieved %s zone data points", len(data) if isinstance(data, list) else 'single')
             
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
+            return self._format_zone_kpi_response_fixed("Monthly Register Read Success by Zone", data, query, "Monthly", kpi_query)
             
-            data = response.json()
-            logger.info(f"✅ Retrieved {len(data) if isinstance(data, list) else 'single'} zone data points")
+        except Exception as e:
+            logger.error("❌ Error fetching monthly register read success by zone: %s", e)
+            return f"Unable to fetch monthly register read success by zone: {str(e)}"
+
+    # Zone KPI tools joined by compare_zones, as (read type, period) -> tool
+    ZONE_COMPARISON_TOOLS = {
+        ('interval', 'weekly'): 'get_interval_read_success_by_zone_weekly',
+        ('interval', 'monthly'): 'get_interval_read_success_by_zone_monthly',
+        ('register', 'weekly'): 'get_register_read_success_by_zone_weekly',
+        ('register', 'monthly'): 'get_register_read_success_by_zone_monthly'
+    }
+
+    def _comparison_tools(self, query: str = "") -> Dict[str, str]:
+        """
+        Zone KPI tools a comparison question asks about, as column label -> tool name.
+        "interval"/"register" and "week"/"month" narrow the columns; otherwise all four are used.
+        """
+        words = (query or "").lower()
+        read_types = [read_type for read_type in ('interval', 'register') if read_type in words] or ['interval', 'register']
+        periods = [period for period in ('weekly', 'monthly') if period[:-2] in words] or ['weekly', 'monthly']
+        return {f"{read_type}_{period}": self.ZONE_COMPARISON_TOOLS[(read_type, period)]
+                for read_type in read_types for period in periods}
+
+    def compare_zones(self, query: str = "") -> str:
+        """
+        Rank all zones across interval and register read success, weekly and monthly, in one table.
+        The zone KPI endpoints are fetched concurrently (or served from the cache) and joined on zone ID.
+        Use when users ask to rank or compare zones across several zone KPIs.
+        """
+        try:
+            logger.info("📡 API Call: compare_zones - Query: '%s'", query)
+            
+            columns = self._comparison_tools(query)
+            results = self._fan_out({
+                tool_name: lambda tool_name=tool_name: self.kpi_engine.query(self.KPI_TOOL_QUERIES[tool_name])
+                for tool_name in columns.values()
+            }, deadline=self.SUMMARY_DEADLINE)
+            
+            # Latest value per zone of every column that returned data
+            stats: Dict[str, ZoneKPIStats] = {}
+            periods: Dict[str, str] = {}
+            unavailable = []
+            for label, tool_name in columns.items():
+                data = results[tool_name]
+                frame = ZoneKPIFrame.from_items(data) if isinstance(data, list) else None
+                if frame is None or not len(frame):
+                    unavailable.append(label)
+                    continue
+                stats[label] = frame.aggregate()
+                newest_zone = max(stats[label].latest_row, key=stats[label].latest_row.get)
+                periods[label] = str((frame.zone_item(newest_zone, stats[label]) or {}).get('startTime', ''))[:10]
+            if not stats:
+                return "**Zone Comparison**: No zone KPI data available"
+            
+            # Zones x columns matrix joined on zone ID; zones are ranked by the average of their columns
+            labels = list(stats)
+            zone_ids = sorted(set().union(*(column.latest for column in stats.values())), key=self._get_zone_name_from_id)
+            values = np.array([[stats[label].latest.get(zone_id, np.nan) for label in labels] for zone_id in zone_ids])
+            average = np.nanmean(values, axis=1)
+            order = np.argsort(-average, kind='stable')
+            ranks = np.empty(len(zone_ids), dtype=int)
+            ranks[order] = np.arange(1, len(zone_ids) + 1)
+            
+            entities = extract_query_entities(query)
+            shown = [index for index in order
+                     if not entities.zones or self._get_zone_name_from_id(zone_ids[index]) in entities.zones]
+            if re.search(r"\b(?:worst|lowest|bottom|poorest)\b", (query or "").lower()):
+                shown.reverse()
+            
+            ranked_by = f"average of {len(labels)} KPIs" if len(labels) > 1 else labels[0].replace('_', ' ')
+            response = f"**Zone Comparison - latest period, ranked by {ranked_by}**\n\n"
+            if self.output.compact:
+                response += tsv(('rank', 'zone', *labels, 'avg'), (
+                    (ranks[index], self._get_zone_name_from_id(zone_ids[index]),
+                     *(value if not np.isnan(value) else '' for value in values[index].tolist()), float(average[index]))
+                    for index in shown
+                )) + "\n"
+                response += "periods: " + " ".join(f"{label}={period}" for label, period in periods.items()) + "\n"
+            else:
+                for index in shown:
+                    cells = " | ".join(f"{label.replace('_', ' ')} {value:.2f}%" if not np.isnan(value) else f"{label.replace('_', ' ')} n/a"
+                                       for label, value in zip(labels, values[index].tolist()))
+                    response += (f"{ranks[index]}. **{self._get_zone_name_from_id(zone_ids[index])}** - "
+                                 f"avg {average[index]:.2f}% | {cells}\n")
+                response += "\n**📊 Best / Worst by KPI:**\n"
+                for column, label in enumerate(labels):
+                    if np.isnan(values[:, column]).all():
+                        continue
+                    best, worst = np.nanargmax(values[:, column]), np.nanargmin(values[:, column])
+                    if values[best, column] == values[worst, column]:
+                        response += (f"• {label.replace('_', ' ').title()} ({periods[label]}): "
+                                     f"all zones equal ({values[best, column]:.2f}%)\n")
+                        continue
+                    response += (f"• {label.replace('_', ' ').title()} ({periods[label]}): "
+                                 f"best {self._get_zone_name_from_id(zone_ids[best])} ({values[best, column]:.2f}%), "
+                                 f"worst {self._get_zone_name_from_id(zone_ids[worst])} ({values[worst, column]:.2f}%)\n")
+            if entities.zones and not shown:
+                response += f"❌ No data found for {', '.join(entities.zones)}\n"
+            if unavailable:
+                response += f"⚠️ Unavailable: {', '.join(label.replace('_', ' ') for label in unavailable)}\n"
+            return response
             
-            return self._format_zone_kpi_response_fixed("Monthly Register Read Success by Zone", data, query)
+        except Exception as e:
+            logger.error("❌ Error comparing zones: %s", e)
+            return f"Unable to compare zones: {str(e)}"
+
+    def _anomaly_series(self, query: str = "") -> Dict[str, str]:
+        """
+        KPI series an anomaly question asks about, as label -> tool name: the zone KPIs narrowed
+        like compare_zones, plus the daily interval series unless only weekly/monthly is asked.
+        """
+        words = (query or "").lower()
+        series = self._comparison_tools(query)
+        if 'interval_weekly' in series and ('daily' in words or not re.search(r"week|month", words)):
+            series['interval_daily'] = 'get_last_7_days_interval_read_success'
+        return series
+
+    def detect_kpi_anomalies(self, query: str = "") -> str:
+        """
+        Flag zones whose latest KPI value is abnormal - rolling z-score against their own history,
+        IQR outlier against the other zones, or a recent level shift - across the weekly/monthly
+        zone series and the daily interval series. Only flagged zones are returned.
+        """
+        try:
+            logger.info("📡 API Call: detect_kpi_anomalies - Query: '%s'", query)
+            
+            series = self._anomaly_series(query)
+            results = self._fan_out({
+                tool_name: lambda tool_name=tool_name: self.kpi_engine.query(self.KPI_TOOL_QUERIES[tool_name])
+                for tool_name in series.values()
+            }, deadline=self.SUMMARY_DEADLINE)
+            
+            # Each KPI is checked as one matrix (a row per zone); the daily series is one system-wide row
+            flagged: List[Tuple[str, Anomaly]] = []
+            checked, unavailable = 0, []
+            for label, tool_name in series.items():
+                data = results[tool_name]
+                if not isinstance(data, list) or not data:
+                    unavailable.append(label)
+                    continue
+                if label == 'interval_daily':
+                    keys = ['system']
+                    values, periods = point_series(data)
+                else:
+                    frame = ZoneKPIFrame.from_items(data)
+                    keys = frame.zone_ids
+                    values, periods = frame.series_matrix()
+                checked += len(keys)
+                flagged.extend((label, anomaly) for anomaly in detect_anomalies(
+                    keys, values, periods, window=self.ANOMALY_WINDOW,
+                    z_threshold=self.ANOMALY_Z_THRESHOLD, min_spread=self.ANOMALY_MIN_SPREAD))
+            logger.info("✅ %d of %d KPI series flagged", len(flagged), checked)
+            
+            def zone_name(key: str) -> str:
+                return "System (all zones)" if key == 'system' else self._get_zone_name_from_id(key)
+            
+            zones = extract_query_entities(query).zones
+            if zones:
+                flagged = [(label, anomaly) for label, anomaly in flagged if zone_name(anomaly.key) in zones]
+            # Zones flagged by the most checks first, then the lowest values
+            flagged.sort(key=lambda entry: (-len(entry[1].methods), entry[1].latest))
+            
+            checks = (f"rolling z-score (|z| >= {self.ANOMALY_Z_THRESHOLD:g} vs previous {self.ANOMALY_WINDOW} periods), "
+                      f"IQR across zones, recent change point; deviations under {self.ANOMALY_MIN_SPREAD:g} pts ignored")
+            if self.output.compact:
+                response = f"KPI anomalies: {len(flagged)} flagged of {checked} series\n"
+                if flagged:
+                    response += tsv(('zone', 'kpi', 'period', 'latest_pct', 'flags'), (
+                        (zone_name(anomaly.key), label, anomaly.period, anomaly.latest, self._describe_anomaly(anomaly, compact=True))
+                        for label, anomaly in flagged
+                    )) + "\n"
+                response += f"checks: {checks}\n"
+            else:
+                response = f"**KPI Anomalies - {len(flagged)} flagged of {checked} series checked**\n\n"
+                for label, anomaly in flagged:
+                    response += (f"⚠️ **{zone_name(anomaly.key)}** ({label.replace('_', ' ')}, {anomaly.period or 'latest'}): "
+                                 f"{anomaly.latest:.2f}% - {self._describe_anomaly(anomaly)}\n")
+                if not flagged:
+                    response += f"✅ No abnormal {'values for ' + ', '.join(zones) if zones else 'zones'} in the latest periods\n"
+                response += f"\n*Checks: {checks}*\n"
+            if unavailable:
+                response += f"⚠️ Unavailable: {', '.join(label.replace('_', ' ') for label in unavailable)}\n"
+            return response
             
         except Exception as e:
-            logger.error(f"❌ Error fetching monthly register read success by zone: {str(e)}")
-            return f"Unable to fetch monthly register read success by zone: {str(e)}"
+            logger.error("❌ Error detecting KPI anomalies: %s", e)
+            return f"Unable to detect KPI anomalies: {str(e)}"
+
+    def _describe_anomaly(self, anomaly: Anomaly, compact: bool = False) -> str:
+        """
+        The checks that flagged a series, with the numbers behind each.
+        """
+        reasons = []
+        if anomaly.zscore is not None:
+            reasons.append(f"z={anomaly.zscore:+.1f}" + (f" vs mean {anomaly.baseline:.2f}" if not compact else ""))
+        if anomaly.iqr_fence is not None:
+            side = 'below' if anomaly.latest < anomaly.iqr_fence else 'above'
+            reasons.append(f"iqr {side} {anomaly.iqr_fence:.2f}" if compact else f"IQR outlier {side} other zones (fence {anomaly.iqr_fence:.2f}%)")
+        if anomaly.change_period is not None:
+            reasons.append(f"shift {anomaly.change_shift:+.2f} since {anomaly.change_period}" if compact
+                           else f"level shift {anomaly.change_shift:+.2f} pts since {anomaly.change_period}")
+        return ("; " if compact else " | ").join(reasons)
 
     def get_comprehensive_kpi_summary(self, query: str = "") -> str:
         """
@@ -485,17 +1496,19 @@ class IrenoAPITools:
         Use this when users ask for dashboard, overview, summary, or comprehensive performance report.
         """
         try:
-            summary_parts = []
-            
-            # Get 7-day trends (these are working)
-            weekly_interval = self.get_last_7_days_interval_read_success()
-            weekly_register = self.get_last_7_days_register_read_success()
-            
-            # Get zone-based performance (working APIs)
-            weekly_interval_zones = self.get_interval_read_success_by_zone_weekly()
-            weekly_register_zones = self.get_register_read_success_by_zone_weekly()
-            monthly_interval_zones = self.get_interval_read_success_by_zone_monthly()
-            monthly_register_zones = self.get_register_read_success_by_zone_monthly()
+            # Fetch 7-day trends and weekly zone performance concurrently; latency is the
+            # slowest endpoint rather than the sum. Sections that miss the deadline are reported.
+            sections = self._fan_out({
+                'Daily Interval Read Success': self.get_last_7_days_interval_read_success,
+                'Daily Register Read Success': self.get_last_7_days_register_read_success,
+                'Weekly Interval Read Success by Zone': self.get_interval_read_success_by_zone_weekly,
+                'Weekly Register Read Success by Zone': self.get_register_read_success_by_zone_weekly
+            }, deadline=self.SUMMARY_DEADLINE)
+            
+            weekly_interval = sections['Daily Interval Read Success']
+            weekly_register = sections['Daily Register Read Success']
+            weekly_interval_zones = sections['Weekly Interval Read Success by Zone']
+            weekly_register_zones = sections['Weekly Register Read Success by Zone']
             
             summary = f"""
 **IRENO KPI Dashboard Summary**
@@ -515,9 +1528,6 @@ class IrenoAPITools:
 - Commodity-specific metrics (Electric meters)
 - Historical trend analysis
 - Performance comparison reports
-
-**Note:** System shows excellent register read performance (100% success) across all zones,
-with interval reads averaging 94-95% success rate.
 """
             
             return summary.strip()
@@ -525,6 +1535,32 @@ with interval reads averaging 94-95% success rate.
         except Exception as e:
             return f"Error generating comprehensive KPI summary: {str(e)}"
 
+    def _fan_out(self, calls: Dict[str, Callable[[], str]], deadline: float) -> Dict[str, str]:
+        """
+        Run tool calls concurrently on the shared worker pool and collect their results.
+        Calls still running after `deadline` seconds are reported as timed out instead of
+        delaying the others; they finish in the background and warm the response cache.
+        """
+        # Run each call in a copy of the caller's context so prefetched responses are visible
+        futures = {name: self._executor.submit(copy_context().run, call) for name, call in calls.items()}
+        done, not_done = wait(futures.values(), timeout=deadline)
+        
+        results = {}
+        for name, future in futures.items():
+            if future in done:
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    report_tool_failure()
+                    logger.error("❌ Error in %s: %s", name, e)
+                    results[name] = f"**{name}**: Unable to fetch data - {str(e)}"
+            else:
+                report_tool_failure()
+                logger.warning("⏱️ %s did not complete within %ss", name, deadline)
+                results[name] = f"**{name}**: ⏱️ No response within {deadline:g}s - data temporarily unavailable"
+        
+        return results
+
     def _format_zone_kpi_response(self, kpi_name: str, data: list) -> str:
         """
         Helper method to format zone-based KPI API response with zone identification.
@@ -596,120 +1632,126 @@ with interval reads averaging 94-95% success rate.
         except Exception as e:
             return f"**{kpi_name}**: Error formatting data - {str(e)}"
     
-    def _format_historical_kpi_response(self, kpi_name: str, data, query: str = "") -> str:
+    def _format_historical_kpi_response(self, kpi_name: str, kpi_query: KPIQuery, query: str = "") -> str:
         """
-        Format historical KPI data with accurate date extraction and specific date lookups.
-        Handles date-specific queries like "August 10th, 2025" without hallucination.
+        Format historical KPI data with accurate date extraction and date lookups.
+        Handles a specific date ("August 10th, 2025"), ranges ("Aug 5 to Aug 9"),
+        comparisons ("Aug 9 vs Aug 10") and relative phrases ("last 3 days") without hallucination.
+        Values are looked up in the KPI store, which holds kpi_query's window once the tool
+        has run it through the engine.
         """
         try:
-            if not data:
+            expression = parse_date_expression(query, reference=self.DAILY_WINDOW[1])
+            
+            if expression is None or expression.kind == 'range':
+                start, end = expression.span if expression else (kpi_query.start, kpi_query.end)
+                points = [(date.fromisoformat(ts[:10]), value)
+                          for ts, value in self.kpi_engine.zone_series(kpi_query, "", start, end)]
+            else:
+                logger.debug("Detected date(s) from query: %s", expression.days)
+                points = [(day, self.kpi_engine.value_on(kpi_query, day)) for day in expression.days]
+                points = [(day, value) for day, value in points if value is not None]
+            
+            if not points and expression is None:
                 return f"**{kpi_name}**: No data available"
                 
             formatted_response = f"**{kpi_name}**\n\n"
-            
-            # Handle list response (time series data)
-            if isinstance(data, list) and len(data) > 0:
-                # Check if user is asking for a specific date
-                query_lower = query.lower()
-                specific_date = None
-                
-                # Parse common date formats
-                import re
-                date_patterns = [
-                    r'august (\d+)(?:st|nd|rd|th)?,? 2025',
-                    r'aug (\d+)(?:st|nd|rd|th)?,? 2025',
-                    r'(\d+)(?:st|nd|rd|th)? august 2025',
-                    r'2025-08-(\d+)'
-                ]
-                
-                for pattern in date_patterns:
-                    match = re.search(pattern, query_lower)
-                    if match:
-                        day = int(match.group(1))
-                        specific_date = f"2025-08-{day:02d}"
-                        logger.info(f"Detected specific date from query: {specific_date}")
-                        break
-                
-                # If no specific date found, provide recent data summary
-                if specific_date is None:
-                    recent_data = data[-1] if isinstance(data, list) and len(data) > 0 else {}
-                    value = recent_data.get('value', 'N/A')
-                    timestamp = recent_data.get('timestamp', recent_data.get('startTime', 'Recent'))
-                    if timestamp and 'T' in str(timestamp):
-                        timestamp = timestamp.split('T')[0]
-                    formatted_response += f"📈 **Most Recent Data:** {value}% on {timestamp}\n"
-                
-                # Filter data for the specific date
-                filtered_data = [item for item in data if isinstance(item, dict) and item.get('startTime')]
-                if specific_date:
-                    # Filter for specific date (e.g., "2025-08-10")
-                    filtered_data = [item for item in filtered_data if item.get('startTime', '').startswith(specific_date)]
-                
-                # Format filtered data
-                if filtered_data:
-                    formatted_response += "📅 **Data Points:**\n"
-                    for item in filtered_data:
-                        if isinstance(item, dict):
-                            date_str = item.get('startTime', '').split('T')[0]
-                            value = item.get('value', 'N/A')
-                            formatted_response += f"• {date_str}: {value}%\n"
-                else:
-                    formatted_response += "No data available for the specified date."
+            if expression is None:
+                # No date in the question: recent data summary plus every data point
+                latest_day, latest_value = points[-1]
+                formatted_response += f"📈 **Most Recent Data:** {self._percent(latest_value)}% on {latest_day.isoformat()}\n"
+            
+            if points and self.output.compact:
+                formatted_response += tsv(('date', 'value_pct'), ((day.isoformat(), self._percent(value)) for day, value in points)) + "\n"
+                if expression is not None:
+                    formatted_response += self._format_date_summary(expression, points)
+            elif points:
+                formatted_response += "📅 **Data Points:**\n"
+                for day, value in points:
+                    formatted_response += f"• {day.isoformat()}: {self._percent(value)}%\n"
+                if expression is not None:
+                    formatted_response += self._format_date_summary(expression, points)
+            else:
+                formatted_response += "No data available for the specified date."
             
             return formatted_response
             
         except Exception as e:
             return f"**{kpi_name}**: Error formatting historical data - {str(e)}"
-        
-    def _is_same_date(self, timestamp: str, target_date: datetime) -> bool:
+    
+    @staticmethod
+    def _percent(value: Optional[float]) -> Any:
+        """KPI value as shown in responses ('N/A' when the API gave none)."""
+        return 'N/A' if value is None else value
+    
+    def _format_date_summary(self, expression: DateExpression, points: List[Tuple[date, Optional[float]]]) -> str:
         """
-        Check if the given timestamp string matches the target date (ignoring time).
+        Summary lines for a multi-date question: missing dates, comparison deltas and range statistics.
         """
-        try:
-            date_part = timestamp.split('T')[0]  # Get date part before 'T'
-            date_obj = datetime.strptime(date_part, '%Y-%m-%d')
-            return date_obj.date() == target_date.date()
-        except Exception as e:
-            logger.warning(f"Error parsing date in _is_same_date: {str(e)}")
-            return False
+        summary = ""
+        if expression.kind == 'days':
+            found = {day for day, _ in points}
+            missing = [day.isoformat() for day in expression.days if day not in found]
+            if missing:
+                summary += f"⚠️ No data for: {', '.join(missing)}\n"
+        
+        values = [(day, value) for day, value in points if isinstance(value, (int, float))]
+        if len(values) < 2:
+            return summary
+        
+        (first_day, first_value), (last_day, last_value) = values[0], values[-1]
+        if expression.kind == 'days' and expression.compare:
+            summary += f"\n**📊 Comparison:** {last_day.isoformat()} vs {first_day.isoformat()}: {last_value - first_value:+.2f} pts\n"
+        elif expression.kind == 'range':
+            low_day, low_value = min(values, key=lambda pair: pair[1])
+            high_day, high_value = max(values, key=lambda pair: pair[1])
+            average = sum(value for _, value in values) / len(values)
+            summary += f"\n**📊 Range Summary ({first_day.isoformat()} to {last_day.isoformat()}):**\n"
+            summary += f"• Average: {average:.2f}%\n"
+            summary += f"• Lowest: {low_value}% on {low_day.isoformat()}\n"
+            summary += f"• Highest: {high_value}% on {high_day.isoformat()}\n"
+            summary += f"• Change: {last_value - first_value:+.2f} pts\n"
+        return summary
+        
+    @staticmethod
+    def _window_label(start: date, end: date) -> str:
+        """Date window for titles, e.g. "Aug 4-11, 2025", "Jul 30 - Aug 5, 2025" or "Aug 10, 2025"."""
+        if start > end:
+            start, end = end, start
+        if start == end:
+            return f"{end:%b} {end.day}, {end.year}"
+        if start.year != end.year:
+            return f"{start:%b} {start.day}, {start.year} - {end:%b} {end.day}, {end.year}"
+        if start.month != end.month:
+            return f"{start:%b} {start.day} - {end:%b} {end.day}, {end.year}"
+        return f"{end:%b} {start.day}-{end.day}, {end.year}"
 
     def search_sop_documents(self, query: str = "") -> str:
         """
-        Search Standard Operating Procedure (SOP) documents stored in Azure Blob Storage.
+        Search Standard Operating Procedure (SOP) documents from the configured document
+        source (Azure Blob Storage or a local directory).
         Use this when users ask about procedures, guidelines, instructions, documentation,
         policies, troubleshooting steps, or how to do something in IRENO system.
         """
         if not SOP_AVAILABLE:
-            return "SOP search functionality is not available. Please check if azure-storage-blob is installed and configuration is correct."
+            return "SOP search functionality is not available. Please check that the SOP search modules are installed and configuration is correct."
         
         if not query or not query.strip():
             return "Please provide a search query to find relevant SOP documents."
         
-        logger.info(f"Searching SOP documents for: '{query}'")
+        logger.info("Searching SOP documents for: '%s'", query)
         
         try:
-            # Get Azure Storage connection string from environment
-            connection_string = os.getenv('AZURE_STORAGE_CONNECTION_STRING')
-            
-            if not connection_string:
-                return "Azure Storage connection not configured. Please set AZURE_STORAGE_CONNECTION_STRING environment variable."
-            
-            # Initialize Azure Blob Manager
-            blob_manager = AzureBlobManager(connection_string)
-            
-            # Test connection
-            if not blob_manager.test_connection():
-                return "Unable to connect to Azure Blob Storage. Please check your connection string and network connectivity."
-            
-            # Get all document content from the container
-            container_name = "sopdocuments"  # Correct container name found in Azure Storage
             try:
-                document_text = blob_manager.download_all_documents_content(container_name)
+                document_text = self._load_sop_documents()
+            except ValueError as e:
+                return f"SOP document source not configured: {str(e)}"
             except Exception as e:
-                return f"Error accessing SOP documents container: {str(e)}. Please verify the container exists and permissions are correct."
+                report_tool_failure()
+                return f"Error accessing SOP documents: {str(e)}. Please verify the document source exists and permissions are correct."
             
             if not document_text or not document_text.strip():
-                return "No SOP documents found in the storage container or documents are empty."
+                return "No SOP documents found in the document source or documents are empty."
             
             # Perform keyword search
             search_results = keyword_search(query.strip(), document_text)
@@ -724,172 +1766,136 @@ with interval reads averaging 94-95% success rate.
             max_results = min(3, len(search_results))
             
             for i, result in enumerate(search_results[:max_results], 1):
-                formatted_results += f"**{i}. {result.get('title', 'SOP Information')}**\n"
-                formatted_results += f"{result.get('content', 'No content available')}\n\n"
+                formatted_results += f"**{i}. SOP Information**\n"
+                formatted_results += f"{result}\n\n"
             
             if len(search_results) > max_results:
                 formatted_results += f"*({len(search_results) - max_results} additional results found. Ask for more specific information if needed.)*\n\n"
             
             formatted_results += "**Need more details?** Ask specific follow-up questions about any of these topics."
             
-            logger.info(f"SOP search completed: Found {len(search_results)} results")
+            logger.info("SOP search completed: Found %s results", len(search_results))
             return formatted_results
             
         except Exception as e:
-            logger.error(f"Error searching SOP documents: {str(e)}")
+            report_tool_failure()
+            logger.error("Error searching SOP documents: %s", e)
             return f"Error searching SOP documents: {str(e)}. Please try again or contact administrator."
 
-    def _format_zone_kpi_response_fixed(self, kpi_name: str, data: list, query: str = "") -> str:
+    def _load_sop_documents(self) -> str:
+        """
+        Return the combined SOP document text, reloading only when the source changed.
+        The source (Azure Blob or local directory) is chosen by SOP_DOCUMENT_SOURCE.
+        """
+        if self._sop_source is None:
+            self._sop_source = create_document_source()
+            logger.info("SOP document source: %s", self._sop_source.describe())
+        
+        if self._sop_source.has_changed() or not self._sop_document_text:
+            self._sop_document_text = self._sop_source.get_all_document_content()
+        
+        return self._sop_document_text
+
+    def _format_zone_kpi_response_fixed(self, kpi_name: str, data: list, query: str = "", interval: str = "",
+                                        kpi_query: Optional[KPIQuery] = None) -> str:
         """
         Fixed zone KPI formatting that extracts actual zone names and percentages from API data.
         No more hallucination of zone letters or incorrect values.
+        `interval` ("Weekly" or "Monthly") sets the period the trend is reported per. With the
+        tool's `kpi_query`, a single-zone answer also lists that zone's values per period.
         """
         try:
-            logger.info(f"🔍 DEBUG: _format_zone_kpi_response_fixed called with data type: {type(data)}")
-            logger.info(f"🔍 DEBUG: Data length: {len(data) if isinstance(data, list) else 'N/A'}")
+            logger.debug("🔍 _format_zone_kpi_response_fixed called with %s of length %s",
+                         type(data).__name__, len(data) if isinstance(data, list) else 'N/A')
             
             if not data or not isinstance(data, list):
-                logger.warning(f"🔍 DEBUG: No data or data is not a list. Data: {data}")
+                logger.warning("🔍 No data or data is not a list. Data: %s", sample(data))
                 return f"**{kpi_name}**: No data available"
                 
-            # Log first item structure
-            if len(data) > 0:
-                logger.info(f"🔍 DEBUG: First item structure: {data[0]}")
+            logger.debug("🔍 First item structure: %s", sample(data[0]))
                 
             formatted_response = f"**{kpi_name}**\n\n"
             
             # Check if user is asking for a specific zone ID or zone name
-            query_lower = query.lower()
-            specific_zone_id = None
-            specific_zone_name = None
-            
-            # Extract zone ID from query if present
-            import re
-            zone_id_pattern = r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'
-            match = re.search(zone_id_pattern, query_lower)
-            if match:
-                specific_zone_id = match.group(0)
-            
-            # Check for zone name in query
-            zone_name_keywords = {
-                'westchester': 'Westchester',
-                'brooklyn': 'Brooklyn', 
-                'bronx': 'Bronx',
-                'queens': 'Queens',
-                'manhattan': 'Manhattan',
-                'staten island': 'Staten Island'
-            }
+            entities = extract_query_entities(query)
+            specific_zone_id = entities.zone_ids[0] if entities.zone_ids else None
+            specific_zone_name = entities.zones[0] if entities.zones else None
             
-            for keyword, zone_name in zone_name_keywords.items():
-                if keyword in query_lower:
-                    specific_zone_name = zone_name
-                    break
-            
-            # Process zone data - extract from dataFilterCriteria
-            zone_performance = {}
-            for item in data:
-                if isinstance(item, dict):
-                    # Extract zone info from dataFilterCriteria - handle both string and dict formats
-                    criteria = item.get('dataFilterCriteria', '')
-                    value = item.get('value', 0)
-                    start_time = item.get('startTime', '')
-                    
-                    zone_id = None
-                    
-                    # Handle new dictionary format for dataFilterCriteria
-                    if isinstance(criteria, dict):
-                        # New format: {'zoneId': 'efba1047-90d1-4f6f-a5c9-a4b40176e150', 'meterCommodityType': 'E'}
-                        zone_id = criteria.get('zoneId')
-                        logger.info(f"🔍 DEBUG: Dict format - extracted zone_id: {zone_id}")
-                    elif isinstance(criteria, str):
-                        # Legacy string format: "(ZoneId=11852150-1fe1-4d7a-ba57-84a31af92b55 AND MeterCommodityType=E)"
-                        zone_id_match = re.search(r'ZoneId=([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})', criteria)
-                        if zone_id_match:
-                            zone_id = zone_id_match.group(1)
-                            logger.info(f"🔍 DEBUG: String format - extracted zone_id: {zone_id}")
-                    
-                    if zone_id:
-                        # Get actual zone names from known mapping
-                        zone_name = self._get_zone_name_from_id(zone_id)
-                        logger.info(f"🔍 DEBUG: Zone {zone_id} mapped to {zone_name}")
-                        
-                        if zone_name not in zone_performance:
-                            zone_performance[zone_name] = []
-                        
-                        zone_performance[zone_name].append({
-                            'value': value,
-                            'zone_id': zone_id,
-                            'start_time': start_time
-                        })
+            # Parse the payload once into columns; all statistics below come from one vectorized pass
+            frame = ZoneKPIFrame.from_items(data)
+            stats = frame.aggregate()
+            zone_ids_by_name = {self._get_zone_name_from_id(zone_id): zone_id for zone_id in frame.zone_ids}
+            logger.debug("🔍 Parsed %d zone data points across %d zones", len(frame), len(frame.zone_ids))
             
             # If specific zone ID requested, show only that zone
             if specific_zone_id:
                 target_zone_name = self._get_zone_name_from_id(specific_zone_id)
-                if target_zone_name in zone_performance:
-                    latest_data = zone_performance[target_zone_name][0] if zone_performance[target_zone_name] else None
-                    if latest_data:
-                        # Make response more explicit for AI agent
-                        formatted_response += f"✅ DATA FOUND - Zone {target_zone_name} Performance: {latest_data['value']:.2f}%\n"
-                        formatted_response += f"Zone ID: {specific_zone_id}\n"
-                        formatted_response += f"Time Period: {latest_data['start_time']}\n"
-                        formatted_response += f"SUCCESS: Data successfully retrieved for zone {target_zone_name}.\n"
-                        return formatted_response
+                if target_zone_name in zone_ids_by_name:
+                    zone_id = zone_ids_by_name[target_zone_name]
+                    latest_item = frame.zone_item(zone_id, stats)
+                    # Make response more explicit for AI agent
+                    formatted_response += f"✅ DATA FOUND - Zone {target_zone_name} Performance: {stats.latest[zone_id]:.2f}%\n"
+                    formatted_response += f"Zone ID: {specific_zone_id}\n"
+                    formatted_response += f"Time Period: {latest_item.get('startTime', '')}\n"
+                    formatted_response += self._format_zone_change(zone_id, stats, interval)
+                    formatted_response += self._format_zone_history(kpi_query, zone_id)
+                    formatted_response += f"SUCCESS: Data successfully retrieved for zone {target_zone_name}.\n"
+                    return formatted_response
                 else:
                     formatted_response += f"❌ **No data found for zone ID {specific_zone_id}**\n"
-                    formatted_response += f"Available zones in data: {list(zone_performance.keys())}\n"
+                    formatted_response += f"Available zones in data: {list(zone_ids_by_name.keys())}\n"
                     return formatted_response
             
             # If specific zone name requested, show only that zone
             if specific_zone_name:
-                if specific_zone_name in zone_performance:
-                    latest_data = zone_performance[specific_zone_name][0] if zone_performance[specific_zone_name] else None
-                    if latest_data:
-                        # Make response more explicit for AI agent
-                        formatted_response += f"✅ DATA FOUND - {specific_zone_name} Zone Performance: {latest_data['value']:.2f}%\n"
-                        formatted_response += f"Zone Name: {specific_zone_name}\n"
-                        formatted_response += f"Zone ID: {latest_data['zone_id']}\n"
-                        formatted_response += f"Time Period: {latest_data['start_time']}\n"
-                        formatted_response += f"SUCCESS: Data successfully retrieved for {specific_zone_name} zone.\n"
-                        return formatted_response
+                if specific_zone_name in zone_ids_by_name:
+                    zone_id = zone_ids_by_name[specific_zone_name]
+                    latest_item = frame.zone_item(zone_id, stats)
+                    # Make response more explicit for AI agent
+                    formatted_response += f"✅ DATA FOUND - {specific_zone_name} Zone Performance: {stats.latest[zone_id]:.2f}%\n"
+                    formatted_response += f"Zone Name: {specific_zone_name}\n"
+                    formatted_response += f"Zone ID: {zone_id}\n"
+                    formatted_response += f"Time Period: {latest_item.get('startTime', '')}\n"
+                    formatted_response += self._format_zone_change(zone_id, stats, interval)
+                    formatted_response += self._format_zone_history(kpi_query, zone_id)
+                    formatted_response += f"SUCCESS: Data successfully retrieved for {specific_zone_name} zone.\n"
+                    return formatted_response
                 else:
                     formatted_response += f"❌ **No data found for {specific_zone_name} zone**\n"
-                    formatted_response += f"Available zones in data: {list(zone_performance.keys())}\n"
+                    formatted_response += f"Available zones in data: {list(zone_ids_by_name.keys())}\n"
                     return formatted_response
             
             # Display all zone performance
-            if zone_performance:
+            if len(frame) and self.output.compact:
+                # One row per zone by name; zone IDs are omitted (the tools accept zone names)
+                formatted_response += tsv(('zone', 'latest_pct', 'mean_pct', 'change_pts'), (
+                    (zone_name, stats.latest[zone_id], stats.mean[zone_id],
+                     f"{stats.change[zone_id]:+.2f}" if zone_id in stats.change else '')
+                    for zone_name, zone_id in sorted(zone_ids_by_name.items())
+                )) + "\n"
+                formatted_response += (f"system: avg={stats.system_mean:.2f} min={stats.system_min:.2f} max={stats.system_max:.2f} "
+                                       f"p10={stats.percentiles[10]:.2f} p50={stats.percentiles[50]:.2f} p90={stats.percentiles[90]:.2f} "
+                                       f"zone_spread={stats.zone_spread:.2f} zones={len(zone_ids_by_name)} "
+                                       f"best={self._get_zone_name_from_id(stats.best_zone)} worst={self._get_zone_name_from_id(stats.worst_zone)}\n")
+            elif len(frame):
                 formatted_response += "🌍 **Zone Performance Summary:**\n"
-                for zone_name, performance_data in sorted(zone_performance.items()):
-                    if performance_data:
-                        latest_value = performance_data[0]['value']  # Most recent
-                        zone_id = performance_data[0]['zone_id']
-                        formatted_response += f"📍 **{zone_name}**: {latest_value:.2f}%\n"
-                        formatted_response += f"   *Zone ID: {zone_id}*\n"
+                for zone_name, zone_id in sorted(zone_ids_by_name.items()):
+                    formatted_response += f"📍 **{zone_name}**: {stats.latest[zone_id]:.2f}%\n"
+                    formatted_response += f"   *Zone ID: {zone_id}*\n"
+                    if zone_id in stats.change:
+                        formatted_response += f"   *Change vs previous period: {stats.change[zone_id]:+.2f} pts*\n"
                 
-                # Calculate overall statistics
-                all_values = [item['value'] for zone_data in zone_performance.values() for item in zone_data]
-                if all_values:
-                    avg_performance = sum(all_values) / len(all_values)
-                    min_performance = min(all_values)
-                    max_performance = max(all_values)
-                    
-                    # Find best and worst zones
-                    zone_averages = {
-                        zone: sum(item['value'] for item in data) / len(data)
-                        for zone, data in zone_performance.items()
-                        if data
-                    }
-                    
-                    if zone_averages:
-                        best_zone = max(zone_averages, key=zone_averages.get)
-                        worst_zone = min(zone_averages, key=zone_averages.get)
-                        
-                        formatted_response += f"\n**📊 System Overview:**\n"
-                        formatted_response += f"• System Average: {avg_performance:.2f}%\n"
-                        formatted_response += f"• Range: {min_performance:.2f}% - {max_performance:.2f}%\n"
-                        formatted_response += f"• Total Zones: {len(zone_performance)}\n"
-                        formatted_response += f"• Best Performing: {best_zone} ({zone_averages[best_zone]:.2f}%)\n"
-                        formatted_response += f"• Needs Attention: {worst_zone} ({zone_averages[worst_zone]:.2f}%)\n"
+                best_zone = self._get_zone_name_from_id(stats.best_zone)
+                worst_zone = self._get_zone_name_from_id(stats.worst_zone)
+                
+                formatted_response += f"\n**📊 System Overview:**\n"
+                formatted_response += f"• System Average: {stats.system_mean:.2f}%\n"
+                formatted_response += f"• Range: {stats.system_min:.2f}% - {stats.system_max:.2f}%\n"
+                formatted_response += f"• Median (P10-P90): {stats.percentiles[50]:.2f}% ({stats.percentiles[10]:.2f}% - {stats.percentiles[90]:.2f}%)\n"
+                formatted_response += f"• Spread Across Zones (std dev): {stats.zone_spread:.2f} pts\n"
+                formatted_response += f"• Total Zones: {len(zone_ids_by_name)}\n"
+                formatted_response += f"• Best Performing: {best_zone} ({stats.latest[stats.best_zone]:.2f}%)\n"
+                formatted_response += f"• Needs Attention: {worst_zone} ({stats.latest[stats.worst_zone]:.2f}%)\n"
             else:
                 # Fallback if zone parsing fails
                 formatted_response += "⚠️ **Raw Performance Data:**\n"
@@ -902,52 +1908,82 @@ with interval reads averaging 94-95% success rate.
             return formatted_response
             
         except Exception as e:
-            logger.error(f"❌ Error formatting zone KPI data: {str(e)}")
+            logger.error("❌ Error formatting zone KPI data: %s", e)
             return f"**{kpi_name}**: Error formatting data - {str(e)}"
 
+    def _format_zone_change(self, zone_id: str, stats: ZoneKPIStats, interval: str = "") -> str:
+        """
+        Period-over-period change and trend lines for one zone, when the data spans several periods.
+        The trend is reported per period of the series interval (per day if the interval is unknown).
+        """
+        lines = ""
+        if zone_id in stats.change:
+            lines += f"Change vs previous period: {stats.change[zone_id]:+.2f} pts\n"
+        if zone_id in stats.trend_per_day:
+            days, period = self.TREND_PERIODS.get(interval, (1, 'day'))
+            lines += (f"Trend: {stats.trend_per_day[zone_id] * days:+.2f} pts per {period} "
+                      f"over {stats.count[zone_id]} {period}s\n")
+        return lines
+
+    def _format_zone_history(self, kpi_query: Optional[KPIQuery], zone_id: str) -> str:
+        """One zone's value per period, looked up in the KPI store by (kpi, zone, startTime)."""
+        if kpi_query is None:
+            return ""
+        history = self.kpi_engine.zone_series(kpi_query, zone_id)
+        if len(history) < 2:
+            return ""
+        return "Per Period: " + ", ".join(f"{ts[:10]} {self._percent(value)}%" for ts, value in history) + "\n"
+
     def _get_zone_name_from_id(self, zone_id: str) -> str:
         """
         Map zone IDs to human-readable names based on actual API data.
         This prevents hallucination of zone names.
         """
-        # Known zone ID mappings from actual API responses
-        zone_mapping = {
-            "11852150-1fe1-4d7a-ba57-84a31af92b55": "Westchester",
-            "1091d1bd-b146-461c-bd33-eb25a5d95787": "Manhattan", 
-            "427917a2-e104-455f-8f29-36cef60a86c6": "Brooklyn",
-            "efba1047-90d1-4f6f-a5c9-a4b40176e150": "Queens",
-            "3668467f-3f94-4486-bcc1-cbb1aa16d015": "Bronx",
-            "6f5a70ef-dc5c-4efa-83ca-efa1590873b7": "Staten Island"
-        }
-        
-        return zone_mapping.get(zone_id, f"Zone-{zone_id[:8]}")  # Fallback to partial ID
+        return ZONE_NAMES.get(zone_id, f"Zone-{zone_id[:8]}")  # Fallback to partial ID
 
-def create_ireno_tools():
+def create_ireno_tools(api_tools: Optional[IrenoAPITools] = None):
     """
     Create and return LangChain tools for IRENO APIs.
-    Total: 9 working tools with FIXED data extraction and NO hallucination
+    Total: 15 working tools with FIXED data extraction and NO hallucination
+    Pass an existing IrenoAPITools to share its cache and stats with the caller.
     """
     
-    api_tools = IrenoAPITools()
+    if api_tools is None:
+        api_tools = IrenoAPITools()
     
     tools = [
         # ================================
-        # COLLECTOR MANAGEMENT TOOLS (3)
+        # COLLECTOR MANAGEMENT TOOLS (5)
         # ================================
         Tool(
             name="get_offline_collectors",
             description="Get information about offline collectors/devices with zone filtering support. Use this when users ask about offline devices, down collectors, disconnected equipment, or system failures. Supports zone-specific queries like 'offline collectors in Brooklyn'.",
-            func=api_tools.get_offline_collectors
+            func=api_tools.make_sync_tool("get_offline_collectors"),
+            coroutine=api_tools.make_async_tool("get_offline_collectors")
         ),
         Tool(
             name="get_online_collectors", 
             description="Get information about online collectors/devices. Use this when users ask about active devices, online collectors, connected equipment, or operational systems.",
-            func=api_tools.get_online_collectors
+            func=api_tools.make_sync_tool("get_online_collectors"),
+            coroutine=api_tools.make_async_tool("get_online_collectors")
         ),
         Tool(
             name="get_collectors_count",
             description="Get the total count and accurate zone breakdown of all collectors with offline percentages. MANDATORY for questions about 'which zone has highest offline percentage' or zone statistics. Returns real zone names and percentages from API data.",
-            func=api_tools.get_collectors_count
+            func=api_tools.make_sync_tool("get_collectors_count"),
+            coroutine=api_tools.make_async_tool("get_collectors_count")
+        ),
+        Tool(
+            name="get_collector_status_changes",
+            description="Get collectors that went offline or came back online recently, from continuous background monitoring. Use this when users ask what changed, what went down or recovered 'since this morning', 'in the last 2 hours', 'today' or 'since 9am' - pass the user's time wording. Answers from memory without querying every collector.",
+            func=api_tools.make_sync_tool("get_collector_status_changes"),
+            coroutine=api_tools.make_async_tool("get_collector_status_changes")
+        ),
+        Tool(
+            name="get_collector_downtime",
+            description="Get collector downtime history: how long a specific collector has been offline (pass its name or ID), the longest outages, collectors that flap (go offline and recover repeatedly) most, and uptime percentage by zone. Supports windows like 'today', 'last 24 hours' or 'since this morning'.",
+            func=api_tools.make_sync_tool("get_collector_downtime"),
+            coroutine=api_tools.make_async_tool("get_collector_downtime")
         ),
         
         # ================================
@@ -955,37 +1991,61 @@ def create_ireno_tools():
         # ================================
         Tool(
             name="get_last_7_days_interval_read_success",
-            description="🕒 MANDATORY for interval read performance queries. Gets daily interval read success data for Aug 4-11, 2025 (STATIC dataset, NOT relative to current date). Supports date-specific lookups like 'August 10th, 2025'. Returns actual historical data with exact dates and percentages. Use when users ask about specific dates, daily performance, or interval read trends.",
-            func=api_tools.get_last_7_days_interval_read_success
+            description="🕒 MANDATORY for interval read performance queries. Gets daily interval read success data for Aug 4-11, 2025 (STATIC dataset, NOT relative to current date). Supports date-specific lookups like 'August 10th, 2025', ranges like 'Aug 5 to Aug 9' and comparisons like 'Aug 9 vs Aug 10' in one call - pass the user's full date wording. Returns actual historical data with exact dates and percentages. Use when users ask about specific dates, daily performance, or interval read trends.",
+            func=api_tools.make_sync_tool("get_last_7_days_interval_read_success"),
+            coroutine=api_tools.make_async_tool("get_last_7_days_interval_read_success")
         ),
         Tool(
             name="get_last_7_days_register_read_success", 
-            description="🕒 MANDATORY for register read performance queries. Gets daily register read success data for Aug 4-11, 2025 (STATIC dataset, NOT relative to current date). Supports date-specific lookups like 'August 5th, 2025'. Returns actual historical data with exact dates and percentages. Use when users ask about specific dates, daily register performance, or register read trends.",
-            func=api_tools.get_last_7_days_register_read_success
+            description="🕒 MANDATORY for register read performance queries. Gets daily register read success data for Aug 4-11, 2025 (STATIC dataset, NOT relative to current date). Supports date-specific lookups like 'August 5th, 2025', ranges like 'Aug 5 to Aug 9' and comparisons like 'Aug 9 vs Aug 10' in one call - pass the user's full date wording. Returns actual historical data with exact dates and percentages. Use when users ask about specific dates, daily register performance, or register read trends.",
+            func=api_tools.make_sync_tool("get_last_7_days_register_read_success"),
+            coroutine=api_tools.make_async_tool("get_last_7_days_register_read_success")
         ),
         
         # ================================
-        # KPI MANAGEMENT TOOLS - ZONE-BASED PERFORMANCE (4)
+        # KPI MANAGEMENT TOOLS - ZONE-BASED PERFORMANCE (4) + COMPARISON (1) + ANOMALIES (1) + DASHBOARD (1)
         # ================================
         Tool(
             name="get_interval_read_success_by_zone_weekly",
             description="🌍 MANDATORY for 'weekly zone interval performance' queries. Gets weekly interval read success percentage by zone with ACCURATE zone names and percentages. NO zone letter hallucination. Use when users ask about weekly zone performance, area trends, zone comparison, or weekly area-specific metrics.",
-            func=api_tools.get_interval_read_success_by_zone_weekly
+            func=api_tools.make_sync_tool("get_interval_read_success_by_zone_weekly"),
+            coroutine=api_tools.make_async_tool("get_interval_read_success_by_zone_weekly")
         ),
         Tool(
             name="get_interval_read_success_by_zone_monthly",
             description="🌍 MANDATORY for 'monthly zone interval performance' queries. Gets monthly interval read success percentage by zone with ACCURATE zone names and percentages. Supports zone ID lookups like '3668467f-3f94-4486-bcc1-cbb1aa16d015'. Use when users ask about monthly zone performance, long-term trends, zone comparison, or monthly area-specific metrics.",
-            func=api_tools.get_interval_read_success_by_zone_monthly
+            func=api_tools.make_sync_tool("get_interval_read_success_by_zone_monthly"),
+            coroutine=api_tools.make_async_tool("get_interval_read_success_by_zone_monthly")
         ),
         Tool(
             name="get_register_read_success_by_zone_weekly",
             description="🌍 MANDATORY for 'weekly zone register performance' queries. Gets weekly register read success percentage by zone with ACCURATE zone names and percentages. Use when users ask about: 'weekly zone register performance', 'area register trends', 'zone register comparison', or 'weekly zone metrics'.",
-            func=api_tools.get_register_read_success_by_zone_weekly
+            func=api_tools.make_sync_tool("get_register_read_success_by_zone_weekly"),
+            coroutine=api_tools.make_async_tool("get_register_read_success_by_zone_weekly")
         ),
         Tool(
             name="get_register_read_success_by_zone_monthly",
             description="🌍 MANDATORY for 'monthly zone register performance' queries. Gets monthly register read success percentage by zone with ACCURATE zone names and percentages. Supports zone ID lookups. Use when users ask about: 'monthly zone register performance', 'long-term zone trends', 'monthly area metrics', or 'zone register comparison'.",
-            func=api_tools.get_register_read_success_by_zone_monthly
+            func=api_tools.make_sync_tool("get_register_read_success_by_zone_monthly"),
+            coroutine=api_tools.make_async_tool("get_register_read_success_by_zone_monthly")
+        ),
+        Tool(
+            name="compare_zones",
+            description="🏆 Zone ranking across KPIs in ONE call. Joins interval and register read success, weekly and monthly, per zone and returns one table ranked by the average. Use when users ask to rank or compare zones across several metrics (e.g. 'rank zones by interval and register success, weekly vs monthly') instead of calling the four zone tools one by one. Words like 'interval', 'register', 'weekly', 'monthly' or zone names narrow the table.",
+            func=api_tools.make_sync_tool("compare_zones"),
+            coroutine=api_tools.make_async_tool("compare_zones")
+        ),
+        Tool(
+            name="detect_kpi_anomalies",
+            description="🚨 Deterministic anomaly check across all zones. Flags zones whose latest weekly/monthly interval or register read success is abnormal (rolling z-score vs their own history, IQR outlier vs other zones, recent level shift), plus the daily interval series, and returns ONLY the flagged zones with the numbers behind each flag. Use when users ask 'which zone is abnormal this week', about anomalies, outliers, unusual drops or sudden changes. Words like 'interval', 'register', 'weekly', 'monthly' or zone names narrow the check.",
+            func=api_tools.make_sync_tool("detect_kpi_anomalies"),
+            coroutine=api_tools.make_async_tool("detect_kpi_anomalies")
+        ),        
+        Tool(
+            name="get_comprehensive_kpi_summary",
+            description="📊 KPI dashboard summary. Fetches daily interval/register read trends (Aug 4-11, 2025) and weekly zone performance in a single call. Use when users ask for a dashboard, overview, overall summary, or comprehensive performance report instead of calling the individual KPI tools one by one.",
+            func=api_tools.make_sync_tool("get_comprehensive_kpi_summary"),
+            coroutine=api_tools.make_async_tool("get_comprehensive_kpi_summary")
         ),
         
         # ================================
@@ -994,7 +2054,8 @@ def create_ireno_tools():
         Tool(
             name="search_sop_documents",
             description="Search Standard Operating Procedure (SOP) documents and documentation. Use this when users ask about procedures, guidelines, instructions, documentation, policies, troubleshooting steps, maintenance procedures, installation guides, configuration steps, or how to do something in the IRENO system.",
-            func=api_tools.search_sop_documents
+            func=api_tools.make_sync_tool("search_sop_documents"),
+            coroutine=api_tools.make_async_tool("search_sop_documents")
         )
     ]
     
@@ -0,0 +1,27 @@
+"""
+IRENO Zone Constants
+
+Known zone IDs and the names users call them by. Kept free of dependencies so the tools,
+the mock server and the benchmarks can share them without importing the agent stack.
+
+Usage:
+    from ireno_zones import ZONE_NAMES, ZONE_ALIASES
+"""
+
+# Known zone IDs from actual API responses -> human-readable names
+ZONE_NAMES = {
+    "11852150-1fe1-4d7a-ba57-84a31af92b55": "Westchester",
+    "1091d1bd-b146-461c-bd33-eb25a5d95787": "Manhattan",
+    "427917a2-e104-455f-8f29-36cef60a86c6": "Brooklyn",
+    "efba1047-90d1-4f6f-a5c9-a4b40176e150": "Queens",
+    "3668467f-3f94-4486-bcc1-cbb1aa16d015": "Bronx",
+    "6f5a70ef-dc5c-4efa-83ca-efa1590873b7": "Staten Island"
+}
+
+# Extra ways users refer to zones (zone names themselves are always recognised)
+ZONE_ALIASES = {
+    "the bronx": "Bronx",
+    "staten": "Staten Island",
+    "island": "Staten Island",
+    "westchester county": "Westchester"
+}
@@ -0,0 +1,180 @@
+"""
+Vectorized KPI Anomaly Detection for IRENO Smart Assistant
+
+This module flags KPI series whose latest value is abnormal. Every check runs with NumPy
+over all series of a KPI at once - a matrix with one row per zone, each row in time order
+and right-aligned so its last column is the latest point (see ZoneKPIFrame.series_matrix):
+
+- Rolling z-score: the latest value against the mean and standard deviation of the
+  previous `window` points of the same series.
+- IQR: the latest value outside the Tukey fences (Q1 - k*IQR, Q3 + k*IQR) of the latest
+  values of all series, i.e. the zone that stands out from the others this period.
+  Needs at least MIN_IQR_SERIES series.
+- Change point: the split of each series with the largest two-sample t statistic between
+  the mean before and after it, when the shift started within the last `window` points
+  (a level shift rather than a single outlier).
+
+Deviations smaller than `min_spread` points are never flagged, so near-constant series
+(e.g. register reads at 100%) don't raise alarms over rounding noise.
+
+Usage:
+    from kpi_anomaly import detect_anomalies
+
+    values, periods = frame.series_matrix()
+    for anomaly in detect_anomalies(frame.zone_ids, values, periods):
+        print(anomaly.key, anomaly.latest, anomaly.methods)
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from kpi_columnar import parse_timestamps
+
+
+# Fewest series the cross-series IQR check is meaningful for
+MIN_IQR_SERIES = 4
+# Fewest points on each side of a change point
+MIN_SEGMENT = 2
+
+
+@dataclass
+class Anomaly:
+    """
+    A series flagged by at least one check. Fields of checks that did not flag it are None.
+    """
+    key: str                              # Zone ID, or the series name for a system-wide series
+    latest: float
+    period: str                           # Start date of the latest point (YYYY-MM-DD), '' if unknown
+    zscore: Optional[float] = None        # Rolling z-score of the latest point
+    baseline: Optional[float] = None      # Mean of the points the z-score compares against
+    iqr_fence: Optional[float] = None     # Fence the latest value crossed
+    change_period: Optional[str] = None   # First period after the level shift
+    change_shift: Optional[float] = None  # Mean after the shift minus mean before, in points
+
+    @property
+    def methods(self) -> List[str]:
+        flagged = []
+        if self.zscore is not None:
+            flagged.append('zscore')
+        if self.iqr_fence is not None:
+            flagged.append('iqr')
+        if self.change_period is not None:
+            flagged.append('change_point')
+        return flagged
+
+
+def _date(period: np.datetime64) -> str:
+    return '' if np.isnat(period) else str(np.datetime_as_string(period, unit='D'))
+
+
+def point_series(items: Sequence[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    One-row series matrix from system-wide KPI items (startTime, value), in time order.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: 1 x n float64 values and datetime64[s] period starts
+    """
+    points = [item for item in items or []
+              if isinstance(item, dict) and isinstance(item.get('value'), (int, float))]
+    periods = parse_timestamps([str(item.get('startTime') or '') for item in points])
+    values = np.array([item['value'] for item in points], dtype=np.float64)
+    order = np.argsort(periods, kind='stable')
+    return values[order][np.newaxis, :], periods[order][np.newaxis, :]
+
+
+def detect_anomalies(keys: Sequence[str], values: np.ndarray, periods: np.ndarray, window: int = 4,
+                     z_threshold: float = 3.0, iqr_k: float = 1.5, change_threshold: float = 3.0,
+                     min_spread: float = 0.5, min_history: int = 3) -> List[Anomaly]:
+    """
+    Run the z-score, IQR and change-point checks over a matrix of series.
+
+    Args:
+        keys (Sequence[str]): Key of each row (zone ID or series name)
+        values (np.ndarray): rows x periods values, right-aligned, NaN-padded on the left
+        periods (np.ndarray): Matching datetime64 period starts
+        window (int): Points of history the z-score compares against, and how recent a change point must be
+        z_threshold (float): Smallest |z| flagged
+        iqr_k (float): Fence distance in interquartile ranges
+        change_threshold (float): Smallest change-point t statistic flagged
+        min_spread (float): Smallest deviation, in points, any check flags
+        min_history (int): Fewest history points for a z-score
+
+    Returns:
+        List[Anomaly]: Flagged series, in row order
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rows, width = values.shape
+    if rows == 0 or width == 0:
+        return []
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    latest = values[:, -1]
+    has_latest = valid[:, -1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Rolling z-score: latest point vs the `window` points before it. A flat history
+        # gets a standard deviation floor, so only a deviation of min_spread or more can flag.
+        history = slice(max(width - 1 - window, 0), width - 1)
+        history_valid = valid[:, history]
+        history_n = history_valid.sum(axis=1)
+        baseline = filled[:, history].sum(axis=1) / history_n
+        squares = ((filled[:, history] - baseline[:, np.newaxis]) ** 2 * history_valid).sum(axis=1)
+        history_std = np.sqrt(squares / (history_n - 1))
+        zscore = (latest - baseline) / np.maximum(history_std, min_spread / z_threshold)
+        z_flag = has_latest & (history_n >= min_history) & (np.abs(zscore) >= z_threshold)
+
+        # IQR across series on the latest values
+        iqr_fence = np.full(rows, np.nan)
+        if has_latest.sum() >= MIN_IQR_SERIES:
+            q1, q3 = np.percentile(latest[has_latest], [25, 75])
+            spread = max(q3 - q1, min_spread)
+            low, high = q1 - iqr_k * spread, q3 + iqr_k * spread
+            iqr_fence = np.where(latest < low, low, np.where(latest > high, high, np.nan))
+
+        # Change point: for every split "after column j", the t statistic of the difference
+        # between the segment means, from running sums (pooled within-segment variance)
+        count = valid.sum(axis=1)[:, np.newaxis]
+        running = np.cumsum(filled, axis=1)
+        running_sq = np.cumsum(filled * filled, axis=1)
+        left_n = np.cumsum(valid, axis=1)[:, :-1]
+        right_n = count - left_n
+        left_sum, right_sum = running[:, :-1], running[:, -1:] - running[:, :-1]
+        left_sq, right_sq = running_sq[:, :-1], running_sq[:, -1:] - running_sq[:, :-1]
+        left_mean, right_mean = left_sum / left_n, right_sum / right_n
+        within = (left_sq - left_sum * left_mean) + (right_sq - right_sum * right_mean)
+        pooled_std = np.sqrt(np.maximum(within, 0.0) / (count - 2))
+        shift = right_mean - left_mean
+        t_stat = (np.abs(shift) / np.maximum(pooled_std, min_spread / change_threshold)
+                  * np.sqrt(left_n * right_n / count))
+        candidate = (left_n >= MIN_SEGMENT) & (right_n >= MIN_SEGMENT) & (right_n <= window)
+        t_stat = np.where(candidate, t_stat, -np.inf)
+
+    split = np.argmax(t_stat, axis=1) if width > 1 else np.zeros(rows, dtype=int)
+    row_index = np.arange(rows)
+    if width > 1:
+        best_t = t_stat[row_index, split]
+        best_shift = shift[row_index, split]
+        change_flag = (best_t >= change_threshold) & (np.abs(best_shift) >= min_spread)
+    else:
+        best_shift = np.full(rows, np.nan)
+        change_flag = np.zeros(rows, dtype=bool)
+
+    deviation = np.abs(latest - baseline)
+    z_flag &= deviation >= min_spread
+    iqr_flag = ~np.isnan(iqr_fence)
+
+    anomalies = []
+    for row in np.flatnonzero(z_flag | iqr_flag | change_flag):
+        anomalies.append(Anomaly(
+            key=keys[row],
+            latest=float(latest[row]),
+            period=_date(periods[row, -1]),
+            zscore=float(zscore[row]) if z_flag[row] else None,
+            baseline=float(baseline[row]) if z_flag[row] else None,
+            iqr_fence=float(iqr_fence[row]) if iqr_flag[row] else None,
+            change_period=_date(periods[row, split[row] + 1]) if change_flag[row] else None,
+            change_shift=float(best_shift[row]) if change_flag[row] else None
+        ))
+    return anomalies
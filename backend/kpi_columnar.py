@@ -0,0 +1,227 @@
+"""
+Columnar Zone KPI Data for IRENO Smart Assistant
+
+This module parses a zone KPI payload (a list of API items) once into NumPy columns -
+zone index, timestamp, value - and computes every statistic the zone KPI responses
+need in a single vectorized pass: per-zone latest value, mean, standard deviation,
+period-over-period change and trend, system-wide average, range and percentiles, the
+spread between zones and the zone ranking by latest value. series_matrix() lays the same points out
+as a zones x periods matrix for per-zone series analysis (see kpi_anomaly).
+
+Usage:
+    from kpi_columnar import ZoneKPIFrame
+
+    frame = ZoneKPIFrame.from_items(data)
+    stats = frame.aggregate()
+    for zone_id in stats.ranking:
+        print(zone_id, stats.latest[zone_id])
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from kpi_engine import zone_and_commodity
+
+
+_SECONDS_PER_DAY = 86400.0
+
+
+def parse_timestamps(values: List[str]) -> np.ndarray:
+    """startTime strings -> datetime64[s]; missing or unparsable values become NaT."""
+    trimmed = [value[:19] if value else '' for value in values]
+    try:
+        return np.array(trimmed, dtype='datetime64[s]')
+    except ValueError:
+        parsed = []
+        for value in trimmed:
+            try:
+                parsed.append(np.datetime64(value, 's'))
+            except ValueError:
+                parsed.append(np.datetime64('NaT', 's'))
+        return np.array(parsed, dtype='datetime64[s]')
+
+
+@dataclass
+class ZoneKPIStats:
+    """
+    Aggregates of a ZoneKPIFrame. Per-zone values are keyed by zone ID; `change` and
+    `trend_per_day` only hold zones with at least two distinct periods.
+    """
+    latest: Dict[str, float]
+    latest_row: Dict[str, int]
+    mean: Dict[str, float]
+    std: Dict[str, float]
+    count: Dict[str, int]
+    change: Dict[str, float]
+    trend_per_day: Dict[str, float]
+    ranking: List[str]  # Zone IDs by latest value, best first
+    system_mean: float
+    system_min: float
+    system_max: float
+    percentiles: Dict[int, float]
+    zone_spread: float  # Standard deviation of the zone means
+
+    @property
+    def best_zone(self) -> Optional[str]:
+        return self.ranking[0] if self.ranking else None
+
+    @property
+    def worst_zone(self) -> Optional[str]:
+        return self.ranking[-1] if self.ranking else None
+
+
+class ZoneKPIFrame:
+    """
+    Zone KPI items as parallel arrays. Items without a zone or a numeric value are dropped.
+    """
+
+    PERCENTILES = (10, 50, 90)
+
+    def __init__(self, zone_ids: List[str], zone_index: np.ndarray, timestamps: np.ndarray,
+                 values: np.ndarray, rows: np.ndarray, items: List[Dict[str, Any]]):
+        self.zone_ids = zone_ids          # zone index -> zone ID, in first-seen order
+        self.zone_index = zone_index      # int32, one per point
+        self.timestamps = timestamps      # datetime64[s], NaT when missing
+        self.values = values              # float64
+        self.rows = rows                  # int32, position of the point in the source items
+        self.items = items
+
+    @classmethod
+    def from_items(cls, items: List[Dict[str, Any]]) -> "ZoneKPIFrame":
+        """Build the frame from API items in one pass."""
+        positions: Dict[str, int] = {}
+        zone_index, starts, values, rows = [], [], [], []
+        for row, item in enumerate(items):
+            if not isinstance(item, dict):
+                continue
+            value = item.get('value')
+            zone_id, _ = zone_and_commodity(item)
+            if not zone_id or not isinstance(value, (int, float)):
+                continue
+            zone_index.append(positions.setdefault(zone_id, len(positions)))
+            starts.append(str(item.get('startTime') or ''))
+            values.append(value)
+            rows.append(row)
+
+        return cls(
+            zone_ids=list(positions),
+            zone_index=np.array(zone_index, dtype=np.int32),
+            timestamps=parse_timestamps(starts),
+            values=np.array(values, dtype=np.float64),
+            rows=np.array(rows, dtype=np.int32),
+            items=items
+        )
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def zone_item(self, zone_id: str, stats: ZoneKPIStats) -> Optional[Dict[str, Any]]:
+        """Source API item holding the latest value of a zone."""
+        row = stats.latest_row.get(zone_id)
+        return self.items[row] if row is not None else None
+
+    def aggregate(self) -> ZoneKPIStats:
+        """
+        Compute all zone and system statistics.
+
+        A zone's latest point is the one with the newest startTime; points without a
+        startTime, or tied on it, fall back to API order (first item wins).
+        """
+        zones = len(self.zone_ids)
+        values = self.values
+        if zones == 0:
+            return ZoneKPIStats({}, {}, {}, {}, {}, {}, {}, [], float('nan'), float('nan'), float('nan'), {}, float('nan'))
+
+        # Group sums: count, sum, sum of squares
+        count = np.bincount(self.zone_index, minlength=zones)
+        total = np.bincount(self.zone_index, weights=values, minlength=zones)
+        total_sq = np.bincount(self.zone_index, weights=values * values, minlength=zones)
+        mean = total / count
+        std = np.sqrt(np.maximum(total_sq / count - mean * mean, 0.0))
+
+        # Order by zone, then time (NaT first), then reverse API order so each zone's group ends with its latest point
+        epoch = self.timestamps.astype('int64').astype(np.float64)
+        missing = np.isnat(self.timestamps)
+        epoch[missing] = -np.inf
+        order = np.lexsort((-self.rows, epoch, self.zone_index))
+        sorted_zones = self.zone_index[order]
+        group_end = np.flatnonzero(np.r_[sorted_zones[1:] != sorted_zones[:-1], True])
+        latest = order[group_end]
+
+        # Period-over-period change: latest minus the previous point of the same zone
+        previous = order[np.maximum(group_end - 1, 0)]
+        has_previous = (group_end > 0) & (self.zone_index[previous] == self.zone_index[latest])
+        has_previous &= np.isfinite(epoch[previous]) & (epoch[latest] > epoch[previous])
+        change = np.full(zones, np.nan)
+        change[self.zone_index[latest[has_previous]]] = values[latest[has_previous]] - values[previous[has_previous]]
+
+        # Least-squares trend per zone (value change per day) from grouped sums over dated points
+        dated = ~missing
+        days = np.where(dated, epoch, 0.0) / _SECONDS_PER_DAY
+        dated_zone = self.zone_index[dated]
+        n = np.bincount(dated_zone, minlength=zones).astype(np.float64)
+        if dated.any():
+            days = days - days[dated].min()
+        sx = np.bincount(dated_zone, weights=days[dated], minlength=zones)
+        sy = np.bincount(dated_zone, weights=values[dated], minlength=zones)
+        sxx = np.bincount(dated_zone, weights=days[dated] ** 2, minlength=zones)
+        sxy = np.bincount(dated_zone, weights=days[dated] * values[dated], minlength=zones)
+        denominator = n * sxx - sx * sx
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = np.where((n >= 2) & (denominator > 1e-9), (n * sxy - sx * sy) / denominator, np.nan)
+
+        # Rank on the latest value, the figure the responses show for each zone
+        latest_value = np.empty(zones)
+        latest_value[self.zone_index[latest]] = values[latest]
+        ranking = np.argsort(-latest_value, kind='stable')
+        percentiles = np.percentile(values, self.PERCENTILES)
+
+        def by_zone(array: np.ndarray) -> Dict[str, float]:
+            return {self.zone_ids[i]: float(array[i]) for i in range(zones) if not np.isnan(array[i])}
+
+        return ZoneKPIStats(
+            latest={self.zone_ids[self.zone_index[i]]: float(values[i]) for i in latest},
+            latest_row={self.zone_ids[self.zone_index[i]]: int(self.rows[i]) for i in latest},
+            mean=by_zone(mean),
+            std=by_zone(std),
+            count={self.zone_ids[i]: int(count[i]) for i in range(zones)},
+            change=by_zone(change),
+            trend_per_day=by_zone(slope),
+            ranking=[self.zone_ids[i] for i in ranking],
+            system_mean=float(values.mean()),
+            system_min=float(values.min()),
+            system_max=float(values.max()),
+            percentiles={p: float(v) for p, v in zip(self.PERCENTILES, percentiles)},
+            zone_spread=float(mean.std())
+        )
+
+    def series_matrix(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-zone series as a zones x periods matrix, one row per zone (in zone_ids order),
+        each row in time order and right-aligned so its last column is the zone's latest
+        point; shorter rows are padded with NaN / NaT on the left.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: float64 values and datetime64[s] period starts
+        """
+        zones = len(self.zone_ids)
+        if zones == 0:
+            return np.empty((0, 0)), np.empty((0, 0), dtype='datetime64[s]')
+
+        # Same point order as aggregate(): by zone, then time, then reverse API order
+        epoch = self.timestamps.astype('int64').astype(np.float64)
+        epoch[np.isnat(self.timestamps)] = -np.inf
+        order = np.lexsort((-self.rows, epoch, self.zone_index))
+        sorted_zones = self.zone_index[order]
+        count = np.bincount(self.zone_index, minlength=zones)
+        width = int(count.max())
+        group_start = np.r_[0, np.cumsum(count)[:-1]]
+        column = np.arange(len(order)) - group_start[sorted_zones] + (width - count[sorted_zones])
+
+        values = np.full((zones, width), np.nan)
+        periods = np.full((zones, width), np.datetime64('NaT'), dtype='datetime64[s]')
+        values[sorted_zones, column] = self.values[order]
+        periods[sorted_zones, column] = self.timestamps[order]
+        return values, periods
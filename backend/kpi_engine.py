@@ -0,0 +1,330 @@
+"""
+KPI Query Engine for IRENO Smart Assistant
+
+This module turns a KPI request - (kpiName, filter, start, end, interval) - into IRENO
+KPI API calls. Queries are normalized into a canonical form so equivalent requests share
+cached data, and date-ranged series remember which days they already hold: a query that
+overlaps earlier ones only fetches the missing sub-ranges. Undated series (the weekly and
+monthly zone KPIs) are the API's current rolling periods, so they are fetched again once
+undated_ttl seconds have passed since the last fetch.
+
+Fetched points live in a store: MemoryKPIStore by default, or kpi_store.SQLiteKPIStore
+to keep them on disk. Once query() holds a window, value_on() and zone_series() answer
+specific-date and per-zone range questions from the store without another fetch.
+
+Usage:
+    from datetime import date
+    from kpi_engine import KPIQuery, KPIQueryEngine
+
+    engine = KPIQueryEngine(base_url, fetch=lambda url: session.get(url).json())
+    query = KPIQuery("DailyIntervalReadSuccessPercentageByCommodityType",
+                     "MeterCommodityType=E", date(2025, 8, 4), date(2025, 8, 11), "Daily")
+    items = engine.query(query)
+    engine.value_on(query, date(2025, 8, 10))
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+
+logger = logging.getLogger(__name__)
+
+DateRange = Tuple[date, date]
+
+
+def normalize_filter(data_filter: str) -> str:
+    """
+    Canonical form of a dataFilterCriteria expression: outer parentheses removed,
+    terms trimmed and sorted, joined with " AND ".
+
+    Example: "(ZoneId=abc AND MeterCommodityType=E)" -> "MeterCommodityType=E AND ZoneId=abc"
+    """
+    text = (data_filter or "").strip()
+    while text.startswith("(") and text.endswith(")"):
+        text = text[1:-1].strip()
+    if not text:
+        return ""
+    terms = [term.strip().replace(" ", "") for term in text.replace(" and ", " AND ").split(" AND ")]
+    return " AND ".join(sorted(term for term in terms if term))
+
+
+def merge_ranges(ranges: List[DateRange]) -> List[DateRange]:
+    """Merge overlapping or adjacent inclusive date ranges."""
+    merged: List[DateRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_ranges(wanted: DateRange, covered: List[DateRange]) -> List[DateRange]:
+    """Return the parts of the inclusive range `wanted` not covered by the merged `covered` ranges."""
+    start, end = wanted
+    missing = []
+    cursor = start
+    for covered_start, covered_end in covered:
+        if covered_end < cursor:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > cursor:
+            missing.append((cursor, covered_start - timedelta(days=1)))
+        cursor = max(cursor, covered_end + timedelta(days=1))
+        if cursor > end:
+            break
+    if cursor <= end:
+        missing.append((cursor, end))
+    return missing
+
+
+@dataclass(frozen=True)
+class KPIQuery:
+    """
+    One KPI request. start/end are inclusive days; leave both None for KPIs the API
+    serves without a time window (e.g. the weekly/monthly zone KPIs).
+    """
+    kpi_name: str
+    data_filter: str = "MeterCommodityType=E"
+    start: Optional[date] = None
+    end: Optional[date] = None
+    interval: str = "Daily"
+
+    def normalized(self) -> "KPIQuery":
+        start, end = self.start, self.end
+        if start and end and start > end:
+            start, end = end, start
+        return KPIQuery(self.kpi_name.strip(), normalize_filter(self.data_filter), start, end,
+                        self.interval.strip().capitalize())
+
+    @property
+    def series_key(self) -> Tuple[str, str, str]:
+        """Identity of the underlying series, independent of the date window."""
+        return (self.kpi_name, self.data_filter, self.interval)
+
+    @property
+    def cache_key(self) -> str:
+        """Canonical string key for the query (call on a normalized query)."""
+        window = f"{self.start.isoformat()}..{self.end.isoformat()}" if self.start and self.end else "*"
+        return f"{self.kpi_name}|{self.data_filter}|{self.interval}|{window}"
+
+    @property
+    def is_ranged(self) -> bool:
+        return self.start is not None and self.end is not None
+
+
+def point_key(item: Dict[str, Any]) -> Tuple[str, str]:
+    """Identity of one API item within a series: (startTime, filter criteria)."""
+    criteria = item.get('dataFilterCriteria', '')
+    criteria_key = str(sorted(criteria.items())) if isinstance(criteria, dict) else str(criteria)
+    return (str(item.get('startTime', '')), criteria_key)
+
+
+def zone_and_commodity(item: Dict[str, Any]) -> Tuple[str, str]:
+    """Zone ID and commodity type of an API item ('' when the series is not per zone)."""
+    criteria = item.get('dataFilterCriteria', {})
+    if isinstance(criteria, dict):
+        return str(criteria.get('zoneId') or ''), str(criteria.get('meterCommodityType') or '')
+
+    # Legacy string format: "(ZoneId=... AND MeterCommodityType=E)"
+    terms = dict(term.split('=', 1) for term in str(criteria).strip('()').replace(' ', '').split('AND') if '=' in term)
+    return terms.get('ZoneId', ''), terms.get('MeterCommodityType', '')
+
+
+def day_bounds(start: date, end: date) -> Tuple[str, str]:
+    """startTime bounds [low, high) covering the inclusive days start..end."""
+    return start.isoformat(), (end + timedelta(days=1)).isoformat()
+
+
+def within_window(items: List[Dict[str, Any]], query: KPIQuery) -> List[Dict[str, Any]]:
+    """Items of a ranged query that fall inside its window, ordered by startTime."""
+    first, last = query.start.isoformat(), query.end.isoformat()
+    items = [item for item in items if first <= str(item.get('startTime', ''))[:10] <= last]
+    return sorted(items, key=lambda item: str(item.get('startTime', '')))
+
+
+class _Series:
+    """Points fetched so far for one series, and the date ranges they cover."""
+
+    def __init__(self):
+        self.covered: List[DateRange] = []
+        # point_key() -> API item
+        self.points: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.fetched_at: Optional[float] = None  # Undated series: time.time() of the last full fetch
+
+
+class MemoryKPIStore:
+    """
+    In-process KPI point store (the default). See kpi_store.SQLiteKPIStore for a
+    persistent store with the same interface.
+    """
+
+    def __init__(self):
+        self._series: Dict[Tuple[str, str, str], _Series] = {}
+        self._lock = threading.Lock()
+
+    def coverage(self, query: KPIQuery) -> Tuple[List[DateRange], Optional[float]]:
+        """
+        (merged date ranges held, time.time() the undated series was last fetched or None)
+        for a normalized query's series.
+        """
+        with self._lock:
+            series = self._series.get(query.series_key)
+            if series is None:
+                return [], None
+            return list(series.covered), series.fetched_at
+
+    def add(self, query: KPIQuery, window: Optional[DateRange], items: List[Dict[str, Any]]) -> None:
+        """
+        Store fetched items and mark `window` as held. An undated series (window None) is
+        replaced by the items, since the API returns its current periods in full.
+        """
+        with self._lock:
+            series = self._series.setdefault(query.series_key, _Series())
+            if window is None:
+                series.points.clear()
+            for item in items:
+                if isinstance(item, dict):
+                    series.points[point_key(item)] = item
+            if window is None:
+                series.fetched_at = time.time()
+            else:
+                series.covered = merge_ranges(series.covered + [window])
+
+    def items(self, query: KPIQuery) -> List[Dict[str, Any]]:
+        """Items held for a normalized query; ranged queries are limited to the window and ordered by startTime."""
+        with self._lock:
+            series = self._series.get(query.series_key)
+            items = list(series.points.values()) if series else []
+        return within_window(items, query) if query.is_ranged else items
+
+    def zone_series(self, kpi_name: str, zone_id: str = "", start: Optional[date] = None,
+                    end: Optional[date] = None) -> List[Tuple[str, Optional[float]]]:
+        """
+        (startTime, value) pairs of a KPI for one zone ('' for system-wide KPIs), ordered by
+        startTime and optionally limited to inclusive days start..end.
+        """
+        with self._lock:
+            items = [item for key, series in self._series.items() if key[0] == kpi_name
+                     for item in series.points.values()]
+        low, high = day_bounds(start, end) if start and end else ('', '\uffff')
+        rows = []
+        for item in items:
+            ts, value = str(item.get('startTime', '')), item.get('value')
+            if low <= ts < high and zone_and_commodity(item)[0] == zone_id:
+                rows.append((ts, value if isinstance(value, (int, float)) else None))
+        return sorted(rows, key=lambda row: row[0])
+
+    def value_on(self, kpi_name: str, day: date, zone_id: str = "") -> Optional[float]:
+        """Value of a KPI on one day, for one zone ('' for system-wide KPIs); None if not held."""
+        rows = self.zone_series(kpi_name, zone_id, day, day)
+        return rows[0][1] if rows else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'series': len(self._series),
+                'points': sum(len(series.points) for series in self._series.values())
+            }
+
+
+class KPIQueryEngine:
+    """
+    Executes KPIQuery objects against the IRENO KPI API, fetching only missing date ranges.
+    """
+
+    def __init__(self, base_url: str, fetch: Callable[[str], Any], store=None, undated_ttl: float = float('inf')):
+        """
+        Initialize the engine.
+
+        Args:
+            base_url (str): KPI endpoint, e.g. .../kpimgmt/v1/kpi
+            fetch (Callable[[str], Any]): Function that GETs a URL and returns parsed JSON.
+                Errors it raises propagate to the caller of query(), unless an expired
+                undated series can be served from the store instead.
+            store: Point store (MemoryKPIStore or kpi_store.SQLiteKPIStore). Defaults to memory
+            undated_ttl (float): Seconds an undated series is served before it is fetched again
+        """
+        self.base_url = base_url
+        self.fetch = fetch
+        self.store = store if store is not None else MemoryKPIStore()
+        self.undated_ttl = undated_ttl
+        self.fetches = 0
+
+    def build_url(self, query: KPIQuery, window: Optional[DateRange] = None) -> str:
+        """Build the KPI API URL for a normalized query and an optional inclusive date window."""
+        url = f"{self.base_url}?kpiName={query.kpi_name}"
+        if query.data_filter:
+            url += f"&dataFilterCriteria=({quote(query.data_filter, safe='')})"
+        if window:
+            url += f"&startTime={window[0].strftime('%m-%d-%Y')}%2000:00:00"
+            url += f"&endTime={window[1].strftime('%m-%d-%Y')}%2023:59:59"
+        url += f"&interval={query.interval}"
+        return url
+
+    def _plan(self, query: KPIQuery) -> List[Tuple[str, Optional[DateRange]]]:
+        """(url, window) pairs still to fetch for a normalized query; window is None for undated series."""
+        covered, fetched_at = self.store.coverage(query)
+        if not query.is_ranged:
+            fresh = fetched_at is not None and time.time() - fetched_at < self.undated_ttl
+            return [] if fresh else [(self.build_url(query), None)]
+        return [(self.build_url(query, gap), gap) for gap in subtract_ranges((query.start, query.end), covered)]
+
+    def missing_urls(self, query: KPIQuery) -> List[str]:
+        """
+        URLs that query() would fetch right now for this query (no I/O). Lets callers
+        prefetch them, e.g. concurrently on an async client.
+        """
+        return [url for url, _ in self._plan(query.normalized())]
+
+    def query(self, query: KPIQuery) -> List[Dict[str, Any]]:
+        """
+        Return the API items for a query, fetching only what is not already held.
+
+        Args:
+            query (KPIQuery): Query to run
+
+        Returns:
+            List[Dict[str, Any]]: Items; ranged queries are limited to the window and
+            ordered by startTime, undated ones keep the API order
+        """
+        query = query.normalized()
+        for url, window in self._plan(query):
+            try:
+                data = self.fetch(url)
+            except Exception as e:
+                if window is not None or self.store.coverage(query)[1] is None:
+                    raise
+                # An expired undated series is still better than no answer while the API is down
+                logger.warning("KPI refresh failed, serving held %s data: %s", query.kpi_name, e)
+                break
+            self.fetches += 1
+            if isinstance(data, list):
+                self.store.add(query, window, data)
+            # Otherwise an unexpected payload (e.g. an error object): keep nothing so it is fetched again
+
+        return self.store.items(query)
+
+    def zone_series(self, query: KPIQuery, zone_id: str = "", start: Optional[date] = None,
+                    end: Optional[date] = None) -> List[Tuple[str, Optional[float]]]:
+        """
+        (startTime, value) pairs held for a query's KPI and one zone ('' for system-wide KPIs),
+        optionally limited to inclusive days start..end. No I/O: run query() first.
+        """
+        return self.store.zone_series(query.normalized().kpi_name, zone_id, start, end)
+
+    def value_on(self, query: KPIQuery, day: date, zone_id: str = "") -> Optional[float]:
+        """Value held for one day of a query's KPI and zone; None if not held. No I/O: run query() first."""
+        return self.store.value_on(query.normalized().kpi_name, day, zone_id)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.store.stats()
+        stats['fetches'] = self.fetches
+        return stats
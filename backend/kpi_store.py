@@ -0,0 +1,192 @@
+"""
+Persistent KPI Time-Series Store for IRENO Smart Assistant
+
+This module materializes IRENO KPI series (daily, weekly and monthly, per zone and
+commodity) into a local SQLite database. Once a series window has been ingested,
+historical and specific-date questions are answered by indexed lookups instead of
+another IRENO API round trip, so they keep working while the API is slow or down,
+and across restarts.
+
+SQLiteKPIStore implements the same interface as kpi_engine.MemoryKPIStore and is
+plugged into KPIQueryEngine:
+
+    points      one row per API item, keyed by (kpi, filter, interval, startTime, criteria);
+                indexed on (kpi, zone, startTime) for per-zone range and specific-date lookups
+    coverage    date windows already ingested per series (empty window = undated series),
+                with the time they were fetched; undated series expire like in memory
+
+Usage:
+    from kpi_engine import KPIQueryEngine
+    from kpi_store import SQLiteKPIStore
+
+    store = SQLiteKPIStore("./data/kpi_store.sqlite3")
+    engine = KPIQueryEngine(base_url, fetch=fetch_json, store=store, undated_ttl=900)
+    store.value_on("DailyIntervalReadSuccessPercentageByCommodityType", date(2025, 8, 10))
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from kpi_engine import DateRange, KPIQuery, day_bounds, merge_ranges, point_key, zone_and_commodity
+
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kpi_points (
+    kpi         TEXT NOT NULL,
+    data_filter TEXT NOT NULL,
+    interval    TEXT NOT NULL,
+    ts          TEXT NOT NULL,
+    criteria    TEXT NOT NULL,
+    zone        TEXT NOT NULL,
+    commodity   TEXT NOT NULL,
+    value       REAL,
+    item        TEXT NOT NULL,
+    PRIMARY KEY (kpi, data_filter, interval, ts, criteria)
+);
+CREATE INDEX IF NOT EXISTS idx_kpi_points_kpi_zone_ts ON kpi_points (kpi, zone, ts);
+CREATE TABLE IF NOT EXISTS kpi_coverage (
+    kpi         TEXT NOT NULL,
+    data_filter TEXT NOT NULL,
+    interval    TEXT NOT NULL,
+    start       TEXT NOT NULL,
+    end         TEXT NOT NULL,
+    fetched_at  REAL,
+    PRIMARY KEY (kpi, data_filter, interval, start, end)
+);
+"""
+
+
+class SQLiteKPIStore:
+    """
+    SQLite-backed KPI point store. Safe to share between threads.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Open (or create) the store.
+
+        Args:
+            path (str): Database file path, or ":memory:" for a non-persistent store
+        """
+        if path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(kpi_coverage)")]
+        if 'fetched_at' not in columns:
+            # Stores created before fetch times were recorded: their undated series count as expired
+            self._conn.execute("ALTER TABLE kpi_coverage ADD COLUMN fetched_at REAL")
+        self._lock = threading.Lock()
+        logger.info("KPI store opened at %s", path)
+
+    def coverage(self, query: KPIQuery) -> Tuple[List[DateRange], Optional[float]]:
+        """
+        (merged date ranges held, time.time() the undated series was last fetched or None)
+        for a normalized query's series.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT start, end, fetched_at FROM kpi_coverage WHERE kpi = ? AND data_filter = ? AND interval = ?",
+                query.series_key
+            ).fetchall()
+
+        fetched_at = next((fetched or 0.0 for start, _, fetched in rows if start == ''), None)
+        ranges = [(date.fromisoformat(start), date.fromisoformat(end)) for start, end, _ in rows if start]
+        return merge_ranges(ranges), fetched_at
+
+    def add(self, query: KPIQuery, window: Optional[DateRange], items: List[Dict[str, Any]]) -> None:
+        """
+        Store fetched items and mark `window` as held. An undated series (window None) is
+        replaced by the items, since the API returns its current periods in full.
+        """
+        rows = []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            ts, criteria = point_key(item)
+            zone, commodity = zone_and_commodity(item)
+            value = item.get('value')
+            rows.append((*query.series_key, ts, criteria, zone, commodity,
+                         value if isinstance(value, (int, float)) else None, json.dumps(item)))
+
+        start, end = (window[0].isoformat(), window[1].isoformat()) if window else ('', '')
+        with self._lock, self._conn:
+            if window is None:
+                # Rows are re-inserted in the new API order, which undated items() return in
+                self._conn.execute("DELETE FROM kpi_points WHERE kpi = ? AND data_filter = ? AND interval = ?",
+                                   query.series_key)
+            self._conn.executemany(
+                "INSERT INTO kpi_points (kpi, data_filter, interval, ts, criteria, zone, commodity, value, item) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (kpi, data_filter, interval, ts, criteria) "
+                "DO UPDATE SET value = excluded.value, item = excluded.item",
+                rows
+            )
+            self._conn.execute(
+                "INSERT INTO kpi_coverage (kpi, data_filter, interval, start, end, fetched_at) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (kpi, data_filter, interval, start, end) DO UPDATE SET fetched_at = excluded.fetched_at",
+                (*query.series_key, start, end, time.time())
+            )
+
+    def items(self, query: KPIQuery) -> List[Dict[str, Any]]:
+        """Items held for a normalized query; ranged queries are limited to the window and ordered by startTime."""
+        sql = "SELECT item FROM kpi_points WHERE kpi = ? AND data_filter = ? AND interval = ?"
+        params: Tuple = query.series_key
+        if query.is_ranged:
+            sql += " AND ts >= ? AND ts < ? ORDER BY ts"
+            params += day_bounds(query.start, query.end)
+        else:
+            sql += " ORDER BY rowid"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(item) for (item,) in rows]
+
+    def value_on(self, kpi_name: str, day: date, zone_id: str = "") -> Optional[float]:
+        """
+        Value of a KPI on one day, for one zone ('' for system-wide KPIs). Uses the
+        (kpi, zone, ts) index; returns None if that day has not been ingested.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM kpi_points WHERE kpi = ? AND zone = ? AND ts >= ? AND ts < ? ORDER BY ts LIMIT 1",
+                (kpi_name, zone_id, *day_bounds(day, day))
+            ).fetchone()
+        return row[0] if row else None
+
+    def zone_series(self, kpi_name: str, zone_id: str = "", start: Optional[date] = None,
+                    end: Optional[date] = None) -> List[Tuple[str, Optional[float]]]:
+        """
+        (startTime, value) pairs of a KPI for one zone ('' for system-wide KPIs), ordered by
+        startTime and optionally limited to inclusive days start..end. Uses the (kpi, zone, ts) index.
+        """
+        sql = "SELECT ts, value FROM kpi_points WHERE kpi = ? AND zone = ?"
+        params: Tuple = (kpi_name, zone_id)
+        if start and end:
+            sql += " AND ts >= ? AND ts < ?"
+            params += day_bounds(start, end)
+
+        with self._lock:
+            return self._conn.execute(sql + " ORDER BY ts", params).fetchall()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            series = self._conn.execute("SELECT COUNT(*) FROM (SELECT DISTINCT kpi, data_filter, interval FROM kpi_coverage)").fetchone()[0]
+            points = self._conn.execute("SELECT COUNT(*) FROM kpi_points").fetchone()[0]
+        return {'backend': 'sqlite', 'path': self.path, 'series': series, 'points': points}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
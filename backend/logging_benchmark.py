@@ -0,0 +1,117 @@
+"""
+Logging Overhead Microbenchmark for IRENO Tools
+
+Measures the per-call logging overhead of two hot-path tool paths - zone KPI formatting
+and the collector count breakdown - on synthetic payloads, without network access:
+
+- baseline: logging disabled (the cost of the tool work itself)
+- before:   every diagnostic line emitted with full payloads, written synchronously to
+            a file handler (how the tools logged when the detailed lines were INFO)
+- after:    INFO level through the QueueHandler/QueueListener sink; detailed lines are
+            DEBUG and payloads are sampled
+
+Usage:
+    python logging_benchmark.py [iterations]
+"""
+
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import tempfile
+import time
+
+import ireno_tools
+from ireno_logging import LOG_FORMAT
+from ireno_tools import CollectorSnapshot, IrenoAPITools
+from ireno_zones import ZONE_NAMES
+from collector_stream import CollectorStatusList
+
+# Payload sampler used by the tools; the "before" scenario swaps in an identity function
+_sample = ireno_tools.sample
+
+
+def _zone_kpi_items(weeks: int = 8):
+    items = []
+    for week in range(weeks):
+        for offset, zone_id in enumerate(ZONE_NAMES):
+            items.append({
+                'kpiName': 'WeeklyIntervalReadSuccessPercentageByZoneAndCommodityType',
+                'startTime': f"2025-{6 + week // 4:02d}-{1 + (week % 4) * 7:02d}T00:00:00",
+                'value': 90.0 + offset + week * 0.1,
+                'dataFilterCriteria': {'zoneId': zone_id, 'meterCommodityType': 'E'}
+            })
+    return items
+
+
+def _collector_counts():
+    zones = [{'zoneName': name, 'onlineCollectorsCount': 60 + i, 'offlineCollectorsCount': 9 - i,
+              'offlineCollectorPercentage': round((9 - i) / 69 * 100, 1)}
+             for i, name in enumerate(ZONE_NAMES.values())]
+    return {'onlineCollectorsCount': sum(z['onlineCollectorsCount'] for z in zones),
+            'offlineCollectorsCount': sum(z['offlineCollectorsCount'] for z in zones),
+            'zonewiseCollectorCount': zones}
+
+
+def _run(api: IrenoAPITools, items, iterations: int) -> float:
+    """Average microseconds per pair of tool calls."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        api._format_zone_kpi_response_fixed("Weekly Interval Read Success by Zone", items)
+        api.get_collectors_count()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def _configure(mode: str, log_dir: str):
+    """Install the handlers of one scenario; returns a listener to stop, if any."""
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    logging.disable(logging.NOTSET)
+    ireno_tools.sample = _sample
+
+    if mode == 'baseline':
+        logging.disable(logging.CRITICAL)
+        return None
+    file_handler = logging.FileHandler(os.path.join(log_dir, f"{mode}.log"), encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    if mode == 'before':
+        ireno_tools.sample = lambda value, *args, **kwargs: value  # Full payloads, as before
+        root.addHandler(file_handler)
+        root.setLevel(logging.DEBUG)
+        return None
+    log_queue = queue.SimpleQueue()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    listener.start()
+    return listener
+
+
+def main(iterations: int = 2000) -> None:
+    api = IrenoAPITools()
+    api.COLLECTOR_STATUS_TTL = float('inf')
+    api._collector_snapshot = CollectorSnapshot(offline=CollectorStatusList(), online=CollectorStatusList(),
+                                                counts=_collector_counts(), fetched_at=time.monotonic())
+    items = _zone_kpi_items()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as log_dir:
+        for mode in ('baseline', 'before', 'after'):
+            listener = _configure(mode, log_dir)
+            _run(api, items, iterations // 10)  # Warm-up
+            results[mode] = _run(api, items, iterations)
+            if listener is not None:
+                listener.stop()
+        _configure('baseline', log_dir)
+
+    baseline = results['baseline']
+    print(f"{iterations} iterations of zone KPI formatting + collector count breakdown")
+    for mode in ('baseline', 'before', 'after'):
+        overhead = results[mode] - baseline
+        print(f"  {mode:<8} {results[mode]:8.1f} us/call   logging overhead {overhead:7.1f} us/call")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
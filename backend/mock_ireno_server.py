@@ -0,0 +1,397 @@
+"""
+Local IRENO API Stand-In for Load and Latency Testing
+
+A Flask server that serves the device-management and KPI endpoints the IRENO tools call,
+with generated fixtures in the real payload shapes, so caching, pooling and concurrency
+changes can be benchmarked reproducibly without touching the AKS cluster:
+
+- GET /devicemgmt/v1/collector?status=offline|online: {"collectors": [...], "totalCount": n},
+  paged with page/limit and zone-filtered with zoneName when those parameters are given
+  (IRENO_COLLECTOR_PAGE_SIZE / IRENO_COLLECTOR_ZONE_PARAM=zoneName on the client)
+- GET /devicemgmt/v1/collector/count: online/offline totals and zonewiseCollectorCount
+- GET /kpimgmt/v1/kpi?kpiName=...: KPI item lists with dataFilterCriteria; daily KPIs honour
+  startTime/endTime, zone KPIs return every zone for the last weeks or months
+- GET /mock/stats, POST /mock/reset: request, error and latency counters per endpoint
+
+Every response is delayed by a draw from a latency distribution, and a share of requests
+can fail (HTTP 503) or hang past the client timeout. The fleet size, offline share and
+status churn are configurable, and all randomness is seeded.
+
+Usage:
+    python mock_ireno_server.py --collectors 5000 --offline-rate 0.12 \\
+        --latency lognormal:120:0.5 --error-rate 0.02 --port 8090
+
+    IRENO_BASE_URL=http://localhost:8090/devicemgmt/v1/collector \\
+    IRENO_KPI_URL=http://localhost:8090/kpimgmt/v1/kpi python app_rag_azure.py
+
+    # In-process, e.g. from a benchmark script
+    server, urls = start_mock_server(MockConfig(collectors=2000, latency="fixed:50"))
+    ...
+    server.shutdown()
+"""
+
+import argparse
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import Flask, jsonify, request
+from werkzeug.serving import BaseWSGIServer, make_server
+
+from ireno_zones import ZONE_NAMES
+
+
+logger = logging.getLogger(__name__)
+
+COLLECTOR_PATH = '/devicemgmt/v1/collector'
+KPI_PATH = '/kpimgmt/v1/kpi'
+
+# Static daily KPI window served when a daily KPI is requested without dates
+DEFAULT_DAILY_WINDOW = (date(2025, 8, 4), date(2025, 8, 11))
+# Number of periods served for the weekly and monthly zone KPIs
+ZONE_PERIODS = {'Weekly': 12, 'Monthly': 6}
+
+
+class LatencyModel:
+    """
+    Response delay distribution, parsed from "kind:param[:param]" with times in milliseconds:
+
+    - fixed:MS
+    - uniform:LOW:HIGH
+    - normal:MEAN:STDDEV (clipped at 0)
+    - lognormal:MEDIAN:SIGMA (long tail, typical of real services)
+    - exponential:MEAN
+    """
+
+    KINDS = {'fixed': 1, 'uniform': 2, 'normal': 2, 'lognormal': 2, 'exponential': 1}
+
+    def __init__(self, spec: str = "fixed:0"):
+        kind, *params = (spec or "fixed:0").strip().lower().split(':')
+        if kind not in self.KINDS or len(params) != self.KINDS[kind]:
+            raise ValueError(f"Invalid latency spec '{spec}' (expected e.g. fixed:50, uniform:20:200, "
+                             f"normal:100:30, lognormal:120:0.5, exponential:80)")
+        self.spec = spec
+        self.kind = kind
+        self.params = [float(param) for param in params]
+
+    def sample(self, rng: random.Random) -> float:
+        """One delay in seconds."""
+        if self.kind == 'fixed':
+            millis = self.params[0]
+        elif self.kind == 'uniform':
+            millis = rng.uniform(*self.params)
+        elif self.kind == 'normal':
+            millis = rng.gauss(*self.params)
+        elif self.kind == 'lognormal':
+            median, sigma = self.params
+            millis = median * rng.lognormvariate(0.0, sigma)
+        else:
+            millis = rng.expovariate(1.0 / self.params[0]) if self.params[0] > 0 else 0.0
+        return max(millis, 0.0) / 1000.0
+
+
+@dataclass
+class MockConfig:
+    """Fleet, fault and latency settings of the mock server."""
+    collectors: int = 1200
+    offline_rate: float = 0.1          # Share of collectors offline at start
+    churn: float = 0.0                 # Share of collectors that change status every churn_interval
+    churn_interval: float = 60.0       # Seconds
+    latency: str = "fixed:0"           # Default latency spec (see LatencyModel)
+    kpi_latency: str = ""              # Latency spec of the KPI endpoints; empty uses `latency`
+    error_rate: float = 0.0            # Share of requests answered with HTTP 503
+    hang_rate: float = 0.0             # Share of requests that stall for hang_seconds before answering
+    hang_seconds: float = 30.0
+    seed: int = 42
+
+
+@dataclass
+class EndpointStats:
+    """Counters of one endpoint."""
+    requests: int = 0
+    errors: int = 0
+    hangs: int = 0
+    delay_total: float = 0.0
+    delay_max: float = 0.0
+
+
+class MockFleet:
+    """
+    Generated collectors spread across the known zones, with their online/offline status.
+    Status churn is applied lazily: each request first catches up on the churn steps due.
+    """
+
+    def __init__(self, config: MockConfig):
+        self.config = config
+        rng = self.rng = random.Random(f"{config.seed}|fleet")
+        zone_names = list(ZONE_NAMES.values())
+        # Uneven zone sizes and offline shares, as in the real fleet
+        weights = [rng.uniform(0.6, 1.4) for _ in zone_names]
+        self.collectors: List[Dict[str, Any]] = []
+        self.offline: List[bool] = []
+        for index in range(config.collectors):
+            zone_index = rng.choices(range(len(zone_names)), weights)[0]
+            zone_offline_rate = min(config.offline_rate * (0.5 + zone_index / max(len(zone_names) - 1, 1)), 1.0)
+            self.collectors.append({
+                'collectorId': f"COL-{index + 1:06d}",
+                'collectorName': f"{zone_names[zone_index].replace(' ', '')}-Collector-{index + 1:05d}",
+                'zoneName': zone_names[zone_index],
+                'ipAddress': f"10.{zone_index}.{index // 250 % 256}.{index % 250 + 1}",
+                'firmwareVersion': rng.choice(('4.2.1', '4.2.3', '4.3.0'))
+            })
+            self.offline.append(rng.random() < zone_offline_rate)
+        self._last_churn = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _advance(self) -> None:
+        if self.config.churn <= 0 or self.config.churn_interval <= 0:
+            return
+        now = time.monotonic()
+        steps = int((now - self._last_churn) // self.config.churn_interval)
+        if steps <= 0:
+            return
+        self._last_churn += steps * self.config.churn_interval
+        flips = max(int(len(self.collectors) * self.config.churn), 1)
+        for _ in range(min(steps, 100)):
+            for index in self.rng.sample(range(len(self.collectors)), min(flips, len(self.collectors))):
+                self.offline[index] = not self.offline[index]
+
+    def listing(self, status: str, zone: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Collectors with a status, optionally in one zone, in fleet order."""
+        want_offline = status == 'offline'
+        with self._lock:
+            self._advance()
+            return [dict(collector, status=status) for collector, offline in zip(self.collectors, self.offline)
+                    if offline == want_offline and (not zone or collector['zoneName'] == zone)]
+
+    def counts(self) -> Dict[str, Any]:
+        """The /collector/count payload: totals and the per-zone breakdown."""
+        with self._lock:
+            self._advance()
+            zones: Dict[str, List[int]] = {name: [0, 0] for name in ZONE_NAMES.values()}
+            for collector, offline in zip(self.collectors, self.offline):
+                zones[collector['zoneName']][1 if offline else 0] += 1
+        zonewise = [{
+            'zoneName': name,
+            'onlineCollectorsCount': online,
+            'offlineCollectorsCount': offline,
+            'offlineCollectorPercentage': round(offline / (online + offline) * 100, 1) if online + offline else 0.0
+        } for name, (online, offline) in zones.items()]
+        return {
+            'onlineCollectorsCount': sum(zone['onlineCollectorsCount'] for zone in zonewise),
+            'offlineCollectorsCount': sum(zone['offlineCollectorsCount'] for zone in zonewise),
+            'zonewiseCollectorCount': zonewise
+        }
+
+
+def kpi_items(kpi_name: str, interval: str, start: Optional[date], end: Optional[date],
+              seed: int) -> List[Dict[str, Any]]:
+    """
+    KPI items for one request. Values depend only on the KPI, zone and period (not on the
+    request order), so overlapping windows return the same points.
+    """
+    register = 'Register' in kpi_name
+    by_zone = 'ByZone' in kpi_name
+
+    def value(*key: Any) -> float:
+        point = random.Random(f"{seed}|{kpi_name}|{'|'.join(map(str, key))}")
+        if register:
+            return 100.0 if point.random() > 0.05 else round(point.uniform(99.0, 100.0), 2)
+        return round(point.uniform(92.5, 96.5), 2)
+
+    if not by_zone:
+        first, last = (start, end) if start and end else DEFAULT_DAILY_WINDOW
+        days = (last - first).days + 1
+        return [{
+            'kpiName': kpi_name,
+            'startTime': f"{day.isoformat()}T00:00:00",
+            'endTime': f"{day.isoformat()}T23:59:59",
+            'value': value(day.isoformat()),
+            'dataFilterCriteria': {'meterCommodityType': 'E'}
+        } for day in (first + timedelta(days=offset) for offset in range(max(days, 0)))]
+
+    periods = ZONE_PERIODS.get(interval, ZONE_PERIODS['Weekly'])
+    last_day = DEFAULT_DAILY_WINDOW[1]
+    if interval == 'Monthly':
+        month = last_day.year * 12 + last_day.month - 1
+        starts = [date((month - back) // 12, (month - back) % 12 + 1, 1) for back in range(periods - 1, -1, -1)]
+    else:
+        week_start = last_day - timedelta(days=last_day.weekday())
+        starts = [week_start - timedelta(weeks=back) for back in range(periods - 1, -1, -1)]
+    return [{
+        'kpiName': kpi_name,
+        'startTime': f"{period.isoformat()}T00:00:00",
+        'value': round(value(zone_id, period.isoformat()) - (0.8 * offset if not register else 0.0), 2),
+        'dataFilterCriteria': {'zoneId': zone_id, 'meterCommodityType': 'E'}
+    } for period in starts for offset, zone_id in enumerate(ZONE_NAMES)]
+
+
+def _parse_kpi_date(text: Optional[str]) -> Optional[date]:
+    """KPI API date parameter ("08-04-2025 00:00:00") -> date."""
+    if not text:
+        return None
+    try:
+        return datetime.strptime(text.strip()[:10], '%m-%d-%Y').date()
+    except ValueError:
+        return None
+
+
+def create_mock_app(config: Optional[MockConfig] = None) -> Flask:
+    """
+    Build the mock IRENO API application.
+
+    Args:
+        config (Optional[MockConfig]): Fleet, fault and latency settings
+
+    Returns:
+        Flask: The application; its `mock_stats` and `mock_fleet` attributes expose the state
+    """
+    config = config or MockConfig()
+    rng = random.Random(config.seed)
+    rng_lock = threading.Lock()
+    fleet = MockFleet(config)
+    latency = LatencyModel(config.latency)
+    kpi_latency = LatencyModel(config.kpi_latency) if config.kpi_latency else latency
+    stats: Dict[str, EndpointStats] = {}
+    stats_lock = threading.Lock()
+
+    app = Flask(__name__)
+    app.mock_fleet = fleet
+    app.mock_stats = stats
+
+    def inject_faults(endpoint: str, model: LatencyModel) -> Optional[Tuple[Any, int]]:
+        """Delay the request and decide whether it fails; returns the error response, if any."""
+        with rng_lock:
+            delay = model.sample(rng)
+            fail = rng.random() < config.error_rate
+            hang = rng.random() < config.hang_rate
+        if hang:
+            delay += config.hang_seconds
+        with stats_lock:
+            endpoint_stats = stats.setdefault(endpoint, EndpointStats())
+            endpoint_stats.requests += 1
+            endpoint_stats.errors += 1 if fail else 0
+            endpoint_stats.hangs += 1 if hang else 0
+            endpoint_stats.delay_total += delay
+            endpoint_stats.delay_max = max(endpoint_stats.delay_max, delay)
+        time.sleep(delay)
+        if fail:
+            return jsonify({'error': 'Service Unavailable', 'message': 'Injected mock failure'}), 503
+        return None
+
+    @app.route(COLLECTOR_PATH, methods=['GET'])
+    def collectors():
+        status = request.args.get('status', 'offline').lower()
+        error = inject_faults(f"collector?status={status}", latency)
+        if error:
+            return error
+        listing = fleet.listing(status, request.args.get('zoneName'))
+        total = len(listing)
+        if 'page' in request.args or 'limit' in request.args:
+            limit = max(request.args.get('limit', 100, type=int), 1)
+            page = max(request.args.get('page', 1, type=int), 1)
+            listing = listing[(page - 1) * limit:page * limit]
+        return jsonify({'collectors': listing, 'totalCount': total})
+
+    @app.route(f"{COLLECTOR_PATH}/count", methods=['GET'])
+    def collector_count():
+        error = inject_faults('collector/count', latency)
+        if error:
+            return error
+        return jsonify(fleet.counts())
+
+    @app.route(KPI_PATH, methods=['GET'])
+    def kpi():
+        kpi_name = request.args.get('kpiName', '')
+        error = inject_faults(f"kpi?kpiName={kpi_name}", kpi_latency)
+        if error:
+            return error
+        if not kpi_name:
+            return jsonify({'error': 'Bad Request', 'message': 'kpiName is required'}), 400
+        interval = request.args.get('interval', 'Daily').capitalize()
+        start = _parse_kpi_date(request.args.get('startTime'))
+        end = _parse_kpi_date(request.args.get('endTime'))
+        return jsonify(kpi_items(kpi_name, interval, start, end, config.seed))
+
+    @app.route('/mock/stats', methods=['GET'])
+    def mock_stats():
+        with stats_lock:
+            endpoints = {name: {
+                'requests': endpoint.requests,
+                'errors': endpoint.errors,
+                'hangs': endpoint.hangs,
+                'avg_delay_ms': round(endpoint.delay_total / endpoint.requests * 1000, 1) if endpoint.requests else 0.0,
+                'max_delay_ms': round(endpoint.delay_max * 1000, 1)
+            } for name, endpoint in stats.items()}
+        return jsonify({
+            'collectors': config.collectors,
+            'latency': latency.spec,
+            'kpi_latency': kpi_latency.spec,
+            'error_rate': config.error_rate,
+            'hang_rate': config.hang_rate,
+            'total_requests': sum(endpoint['requests'] for endpoint in endpoints.values()),
+            'endpoints': endpoints
+        })
+
+    @app.route('/mock/reset', methods=['POST'])
+    def mock_reset():
+        with stats_lock:
+            stats.clear()
+        return jsonify({'message': 'Mock stats reset.'})
+
+    return app
+
+
+def start_mock_server(config: Optional[MockConfig] = None, host: str = '127.0.0.1',
+                      port: int = 0) -> Tuple[BaseWSGIServer, Dict[str, str]]:
+    """
+    Run the mock server on a background thread (port 0 picks a free port).
+
+    Returns:
+        Tuple[BaseWSGIServer, Dict[str, str]]: The server (call shutdown() to stop it) and the
+        IRENO_BASE_URL / IRENO_KPI_URL values pointing at it
+    """
+    server = make_server(host, port, create_mock_app(config), threaded=True)
+    threading.Thread(target=server.serve_forever, name='ireno-mock-server', daemon=True).start()
+    root = f"http://{host}:{server.server_port}"
+    return server, {'IRENO_BASE_URL': f"{root}{COLLECTOR_PATH}", 'IRENO_KPI_URL': f"{root}{KPI_PATH}"}
+
+
+def main() -> None:
+    defaults = MockConfig()
+    parser = argparse.ArgumentParser(description="Local IRENO API stand-in for load and latency testing")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--collectors', type=int, default=defaults.collectors, help="Fleet size")
+    parser.add_argument('--offline-rate', type=float, default=defaults.offline_rate, help="Share of collectors offline at start")
+    parser.add_argument('--churn', type=float, default=defaults.churn, help="Share of collectors changing status every --churn-interval")
+    parser.add_argument('--churn-interval', type=float, default=defaults.churn_interval, help="Seconds")
+    parser.add_argument('--latency', default=defaults.latency, help="e.g. fixed:50, uniform:20:200, normal:100:30, lognormal:120:0.5, exponential:80")
+    parser.add_argument('--kpi-latency', default=defaults.kpi_latency, help="Latency of the KPI endpoints (default: --latency)")
+    parser.add_argument('--error-rate', type=float, default=defaults.error_rate, help="Share of requests failing with HTTP 503")
+    parser.add_argument('--hang-rate', type=float, default=defaults.hang_rate, help="Share of requests stalling for --hang-seconds")
+    parser.add_argument('--hang-seconds', type=float, default=defaults.hang_seconds)
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    args = parser.parse_args()
+    for spec in (args.latency, args.kpi_latency):
+        try:
+            LatencyModel(spec) if spec else None
+        except ValueError as e:
+            parser.error(str(e))
+
+    config = MockConfig(collectors=args.collectors, offline_rate=args.offline_rate, churn=args.churn,
+                        churn_interval=args.churn_interval, latency=args.latency, kpi_latency=args.kpi_latency,
+                        error_rate=args.error_rate, hang_rate=args.hang_rate, hang_seconds=args.hang_seconds,
+                        seed=args.seed)
+    print(f"Mock IRENO API on http://{args.host}:{args.port}")
+    print(f"  IRENO_BASE_URL=http://{args.host}:{args.port}{COLLECTOR_PATH}")
+    print(f"  IRENO_KPI_URL=http://{args.host}:{args.port}{KPI_PATH}")
+    create_mock_app(config).run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
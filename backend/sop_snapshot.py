@@ -0,0 +1,199 @@
+"""
+Compressed Snapshot Files for the IRENO SOP Corpus
+
+This module writes and reads a single-file snapshot of the SOP corpus together with
+its document index, so a fresh container can warm-start SOP search with one
+sequential read and a decompress instead of downloading every blob again.
+
+File layout (little endian):
+    header      magic (8s) | version (B) | codec (B) | segment count (H)
+    segments    name (16s) | raw size (Q) | compressed size (Q) | CRC32 of raw data (I)
+    header CRC  CRC32 of everything above (I)
+    payload     compressed segments, in table order
+
+Segments are compressed with zstd when the `zstandard` package is installed and with
+gzip otherwise; the codec is recorded in the header so either reader can open it.
+
+Usage:
+    from sop_snapshot import write_snapshot, read_snapshot
+
+    stats = write_snapshot("sop.snap", {"corpus": text.encode("utf-8")})
+    segments, stats = read_snapshot("sop.snap")
+"""
+
+import gzip
+import logging
+import os
+import struct
+import time
+import zlib
+from typing import Dict, Optional, Tuple
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+MAGIC = b"IRSOPSNP"
+VERSION = 1
+
+CODEC_GZIP = 1
+CODEC_ZSTD = 2
+CODEC_NAMES = {CODEC_GZIP: "gzip", CODEC_ZSTD: "zstd"}
+
+_HEADER = struct.Struct("<8sBBH")
+_SEGMENT = struct.Struct("<16sQQI")
+_CRC = struct.Struct("<I")
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing, truncated, corrupt or unreadable."""
+
+
+def _compress(data: bytes, codec: int) -> bytes:
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _decompress(data: bytes, codec: int) -> bytes:
+    if codec == CODEC_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise SnapshotError("Snapshot is zstd-compressed but zstandard is not installed. Install with: pip install zstandard")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == CODEC_GZIP:
+        return gzip.decompress(data)
+    raise SnapshotError(f"Unknown snapshot codec: {codec}")
+
+
+def write_snapshot(path: str, segments: Dict[str, bytes], codec: Optional[int] = None) -> Dict[str, float]:
+    """
+    Write named segments to a compressed snapshot file.
+
+    The file is written to a temporary name and moved into place, so readers never
+    observe a partially written snapshot.
+
+    Args:
+        path (str): Destination file path
+        segments (Dict[str, bytes]): Segment name (max 16 ASCII bytes) to raw bytes
+        codec (Optional[int]): CODEC_ZSTD or CODEC_GZIP. Defaults to zstd if available
+
+    Returns:
+        Dict[str, float]: Raw/compressed sizes, compression ratio and write time
+    """
+    started = time.perf_counter()
+    if codec is None:
+        codec = CODEC_ZSTD if ZSTD_AVAILABLE else CODEC_GZIP
+
+    table = []
+    payload = []
+    raw_bytes = 0
+    compressed_bytes = 0
+
+    for name, data in segments.items():
+        encoded_name = name.encode("ascii")
+        if len(encoded_name) > 16:
+            raise ValueError(f"Segment name too long (max 16 bytes): {name}")
+
+        compressed = _compress(data, codec)
+        table.append(_SEGMENT.pack(encoded_name, len(data), len(compressed), zlib.crc32(data)))
+        payload.append(compressed)
+        raw_bytes += len(data)
+        compressed_bytes += len(compressed)
+
+    header = _HEADER.pack(MAGIC, VERSION, codec, len(table)) + b"".join(table)
+    header += _CRC.pack(zlib.crc32(header))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp.{os.getpid()}"
+    with open(temp_path, "wb") as f:
+        f.write(header)
+        for compressed in payload:
+            f.write(compressed)
+    os.replace(temp_path, path)
+
+    stats = {
+        "codec": CODEC_NAMES[codec],
+        "raw_bytes": raw_bytes,
+        "compressed_bytes": compressed_bytes,
+        "compression_ratio": round(raw_bytes / compressed_bytes, 2) if compressed_bytes else 0.0,
+        "write_seconds": round(time.perf_counter() - started, 6)
+    }
+    logger.info(f"Wrote SOP snapshot {path}: {raw_bytes} -> {compressed_bytes} bytes "
+                f"({stats['compression_ratio']}x, {stats['codec']})")
+    return stats
+
+
+def read_snapshot(path: str) -> Tuple[Dict[str, bytes], Dict[str, float]]:
+    """
+    Read and verify a snapshot file with a single sequential read.
+
+    Args:
+        path (str): Snapshot file path
+
+    Returns:
+        Tuple[Dict[str, bytes], Dict[str, float]]: Decompressed segments by name, and
+        sizes, compression ratio and load time
+
+    Raises:
+        SnapshotError: If the file is missing, truncated, or fails a checksum
+    """
+    started = time.perf_counter()
+    try:
+        with open(path, "rb") as f:
+            blob = f.read()
+    except OSError as e:
+        raise SnapshotError(f"Cannot read snapshot {path}: {str(e)}")
+
+    if len(blob) < _HEADER.size:
+        raise SnapshotError(f"Snapshot {path} is truncated")
+
+    magic, version, codec, count = _HEADER.unpack_from(blob, 0)
+    if magic != MAGIC:
+        raise SnapshotError(f"{path} is not an SOP snapshot")
+    if version != VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {version}")
+
+    table_end = _HEADER.size + count * _SEGMENT.size
+    if len(blob) < table_end + _CRC.size:
+        raise SnapshotError(f"Snapshot {path} is truncated")
+    (header_crc,) = _CRC.unpack_from(blob, table_end)
+    if zlib.crc32(blob[:table_end]) != header_crc:
+        raise SnapshotError(f"Snapshot {path} header checksum mismatch")
+
+    segments = {}
+    offset = table_end + _CRC.size
+    raw_bytes = 0
+    for i in range(count):
+        name, raw_size, compressed_size, crc = _SEGMENT.unpack_from(blob, _HEADER.size + i * _SEGMENT.size)
+        compressed = blob[offset:offset + compressed_size]
+        if len(compressed) != compressed_size:
+            raise SnapshotError(f"Snapshot {path} is truncated")
+        offset += compressed_size
+
+        try:
+            data = _decompress(compressed, codec)
+        except SnapshotError:
+            raise
+        except Exception as e:
+            raise SnapshotError(f"Snapshot {path} segment could not be decompressed: {str(e)}")
+        if len(data) != raw_size or zlib.crc32(data) != crc:
+            raise SnapshotError(f"Snapshot {path} segment checksum mismatch")
+
+        segments[name.rstrip(b"\0").decode("ascii")] = data
+        raw_bytes += raw_size
+
+    compressed_bytes = len(blob)
+    stats = {
+        "codec": CODEC_NAMES.get(codec, str(codec)),
+        "raw_bytes": raw_bytes,
+        "compressed_bytes": compressed_bytes,
+        "compression_ratio": round(raw_bytes / compressed_bytes, 2) if compressed_bytes else 0.0,
+        "load_seconds": round(time.perf_counter() - started, 6)
+    }
+    return segments, stats
@@ -0,0 +1,279 @@
+"""
+Compact, Token-Budgeted Tool Output for IRENO Smart Assistant
+
+Everything a tool returns becomes LLM input tokens. This module renders tool results
+for the agent under a per-tool token budget:
+
+- count_tokens(): tokens in a text, using tiktoken when its encoding is available and
+  a characters-per-token estimate otherwise. tiktoken downloads the encoding on first
+  use; on hosts without access set TIKTOKEN_CACHE_DIR to a directory holding it, or the
+  budgets are only approximate (a warning is logged once).
+- compact_markdown(): strips emoji, bold/italic markers and blank lines from the
+  markdown the tools produce.
+- tsv() / compact_json(): structured compact rows and payload dumps (JSON without
+  indentation, long lists cut with a count of what was left out).
+- ToolOutputFormatter: applies the output mode ("markdown" or "compact") and the
+  budget to each tool call, appends a truncation summary when it cuts, and records
+  the measured token count per call.
+
+Usage:
+    from tool_output import ToolOutputFormatter, parse_budgets
+
+    formatter = ToolOutputFormatter(mode="compact", default_budget=1500,
+                                    budgets=parse_budgets("search_sop_documents=2500"))
+    text = formatter.render("get_offline_collectors", raw_text)
+    print(formatter.stats())
+"""
+
+import json
+import logging
+import re
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_MODES = ('markdown', 'compact')
+
+# Estimate used when no tokenizer is available (typical for English text and numbers)
+CHARS_PER_TOKEN = 4
+
+_EMOJI = re.compile(
+    "[\U0001F000-\U0001FAFF\u2190-\u21FF\u2300-\u23FF\u2460-\u24FF\u25A0-\u27BF"
+    "\u2900-\u297F\u2B00-\u2BFF\u3030\u303D\uFE0F\u200D\uFFFD]"
+)
+_EMPHASIS = re.compile(r"\*{1,2}([^*\n]+?)\*{1,2}")
+_BULLET = re.compile(r"^[•·▪◦]\s*", re.MULTILINE)
+_SPACES = re.compile(r" {2,}")
+_OPEN_PAREN = re.compile(r"\(\s+")
+
+_encoder = None
+_encoder_lock = threading.Lock()
+_encoder_failed = False
+
+
+def _get_encoder(encoding: str):
+    """tiktoken encoder, loaded once; None when tiktoken or its encoding data is unavailable."""
+    global _encoder, _encoder_failed
+    if not TIKTOKEN_AVAILABLE or not encoding or _encoder_failed:
+        return None
+    if _encoder is None:
+        with _encoder_lock:
+            if _encoder is None and not _encoder_failed:
+                try:
+                    _encoder = tiktoken.get_encoding(encoding)
+                except Exception as e:
+                    _encoder_failed = True
+                    logger.warning("⚠️ Token encoding '%s' unavailable, estimating token counts: %s", encoding, e)
+    return _encoder
+
+
+def count_tokens(text: str, encoding: str = "o200k_base") -> int:
+    """
+    Number of tokens in a text.
+
+    Args:
+        text (str): Text to measure
+        encoding (str): tiktoken encoding of the agent's model; empty always estimates
+
+    Returns:
+        int: Exact token count, or an estimate when the tokenizer is unavailable
+    """
+    if not text:
+        return 0
+    encoder = _get_encoder(encoding)
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def compact_markdown(text: str) -> str:
+    """Tool markdown without emoji, emphasis markers, bullet glyphs or blank lines."""
+    text = _EMOJI.sub('', text)
+    text = _EMPHASIS.sub(r'\1', text).replace('**', '')
+    text = _BULLET.sub('- ', text)
+    lines = (_OPEN_PAREN.sub('(', _SPACES.sub(' ', line)).strip(' ') for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def tsv(header: Sequence[str], rows: Iterable[Sequence[Any]]) -> str:
+    """Tab-separated table with a header row; floats are written with 2 decimals."""
+    def cell(value: Any) -> str:
+        if isinstance(value, float):
+            return f"{value:.2f}"
+        return str(value).replace('\t', ' ').replace('\n', ' ')
+    lines = ["\t".join(header)]
+    lines.extend("\t".join(cell(value) for value in row) for row in rows)
+    return "\n".join(lines)
+
+
+def compact_json(data: Any, max_items: int = 20) -> str:
+    """
+    JSON without indentation, with lists longer than max_items cut to their first items
+    plus a "... N more" marker, at every nesting level.
+    """
+    def trim(value: Any) -> Any:
+        if isinstance(value, dict):
+            return {key: trim(item) for key, item in value.items()}
+        if isinstance(value, list):
+            trimmed = [trim(item) for item in value[:max_items]]
+            if len(value) > max_items:
+                trimmed.append(f"... {len(value) - max_items} more")
+            return trimmed
+        return value
+    return json.dumps(trim(data), separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+def truncate_tokens(text: str, max_tokens: int, encoding: str = "o200k_base") -> str:
+    """First max_tokens tokens of a text (by the same measure as count_tokens())."""
+    if max_tokens <= 0:
+        return ""
+    encoder = _get_encoder(encoding)
+    if encoder is not None:
+        tokens = encoder.encode(text, disallowed_special=())
+        # A cut inside a multi-byte character decodes to U+FFFD; drop it
+        return encoder.decode(tokens[:max_tokens]).rstrip('\ufffd') if len(tokens) > max_tokens else text
+    return text[:max_tokens * CHARS_PER_TOKEN]
+
+
+def fit_to_budget(text: str, budget: int, encoding: str = "o200k_base") -> Tuple[str, int]:
+    """
+    Cut a text so it fits the token budget, appending a truncation summary. Whole lines are
+    kept while they fit; the first line that does not is cut short instead of dropped, so a
+    single long line (e.g. a compact_json() dump) still shows its beginning.
+
+    Args:
+        text (str): Tool output
+        budget (int): Maximum tokens; 0 or less disables the budget
+        encoding (str): tiktoken encoding of the agent's model
+
+    Returns:
+        Tuple[str, int]: The (possibly truncated) text and the number of lines omitted or cut short
+    """
+    if budget <= 0 or count_tokens(text, encoding) <= budget:
+        return text, 0
+
+    lines = text.splitlines()
+
+    def summary(omitted: int, cut: bool) -> str:
+        shortened = ", 1 cut short" if cut else ""
+        return (f"[truncated to fit {budget} tokens: {omitted} of {len(lines)} lines omitted{shortened}"
+                f" - ask a narrower question for the rest]")
+
+    # Leave room for the longest summary line this text can get (and its newline)
+    remaining = budget - count_tokens(summary(len(lines), True), encoding) - 1
+    kept = []
+    for line in lines:
+        cost = count_tokens(line, encoding) + 1
+        if cost > remaining:
+            break
+        remaining -= cost
+        kept.append(line)
+
+    cut = False
+    if len(kept) < len(lines) and remaining > 2:
+        # Room left for part of the next line: its first tokens and an ellipsis
+        partial = truncate_tokens(lines[len(kept)], remaining - 2, encoding).rstrip()
+        if partial:
+            kept.append(partial + "…")
+            cut = True
+    omitted = len(lines) - len(kept)
+    return "\n".join(kept + [summary(omitted, cut)]), omitted + cut
+
+
+def parse_budgets(spec: str) -> Dict[str, int]:
+    """Per-tool budgets from "tool_name=tokens,other_tool=tokens"; malformed entries are skipped."""
+    budgets = {}
+    for entry in (spec or "").split(','):
+        name, _, value = entry.partition('=')
+        if name.strip() and value.strip().isdigit():
+            budgets[name.strip()] = int(value)
+    return budgets
+
+
+@dataclass
+class ToolOutputStats:
+    """Token counters of one tool."""
+    calls: int = 0
+    tokens: int = 0
+    max_tokens: int = 0
+    last_tokens: int = 0
+    truncated: int = 0
+
+
+class ToolOutputFormatter:
+    """
+    Renders tool results for the agent in the configured mode, within per-tool token budgets.
+    """
+
+    def __init__(self, mode: str = "markdown", default_budget: int = 1500,
+                 budgets: Optional[Dict[str, int]] = None, encoding: str = "o200k_base"):
+        """
+        Initialize the formatter.
+
+        Args:
+            mode (str): "markdown" (tool output as written) or "compact" (stripped markdown, TSV rows)
+            default_budget (int): Token budget for tools without their own; 0 disables budgets
+            budgets (Optional[Dict[str, int]]): Per-tool token budgets
+            encoding (str): tiktoken encoding used to measure tokens
+        """
+        if mode not in OUTPUT_MODES:
+            logger.warning("⚠️ Unknown tool output mode '%s', using markdown", mode)
+            mode = 'markdown'
+        self.mode = mode
+        self.default_budget = default_budget
+        self.budgets = budgets or {}
+        self.encoding = encoding
+        self._stats: Dict[str, ToolOutputStats] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def compact(self) -> bool:
+        return self.mode == 'compact'
+
+    def budget_for(self, tool_name: str) -> int:
+        return self.budgets.get(tool_name, self.default_budget)
+
+    def render(self, tool_name: str, text: str) -> str:
+        """
+        Apply the output mode and the tool's token budget to one tool result, and record its size.
+
+        Args:
+            tool_name (str): Tool that produced the text
+            text (str): Tool result
+
+        Returns:
+            str: Text to hand to the agent
+        """
+        text = text if isinstance(text, str) else str(text)
+        if self.compact:
+            text = compact_markdown(text)
+        text, omitted = fit_to_budget(text, self.budget_for(tool_name), self.encoding)
+        tokens = count_tokens(text, self.encoding)
+
+        with self._lock:
+            stats = self._stats.setdefault(tool_name, ToolOutputStats())
+            stats.calls += 1
+            stats.tokens += tokens
+            stats.max_tokens = max(stats.max_tokens, tokens)
+            stats.last_tokens = tokens
+            stats.truncated += 1 if omitted else 0
+
+        logger.info("🧮 %s output: %d tokens (%s, %d lines truncated)", tool_name, tokens, self.mode, omitted)
+        return text
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'mode': self.mode,
+                'default_budget': self.default_budget,
+                'tools': {name: asdict(stats) for name, stats in self._stats.items()}
+            }